@@ -0,0 +1,171 @@
+""" Benchmark suite measuring the main operations of the software over synthetic catalogs of different scales.
+
+Execute from the project's root folder:
+python -m benchmarks.benchmark_runner [--scales small medium] [--baseline file.json] [--save_baseline file.json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.catalog_generator import SyntheticCatalogSettings, generate_synthetic_catalog
+from modules.tools.data_quality.data_quality import execute_feature_verification
+from modules.tools.data_quality.model_index import OntoUMLModelIndex
+from modules.tools.release_file import generate_release_file
+from modules.tools.validate_ttl_syntax import validate_ttl_syntax
+from modules.utils.utils_general import get_computer_specifications, get_date_time
+from modules.utils.utils_rdf import load_all_graph_safely
+
+FEATURES_LIST = ["char", "ends", "gens", "ster"]
+
+BENCHMARK_SCALES = {
+    "small": SyntheticCatalogSettings(num_datasets=10, num_classes=100, num_relations=50, num_generalizations=50,
+                                      num_generalization_sets=10),
+    "medium": SyntheticCatalogSettings(num_datasets=50, num_classes=500, num_relations=250,
+                                       num_generalizations=250, num_generalization_sets=50),
+    "large": SyntheticCatalogSettings(num_datasets=100, num_classes=2000, num_relations=1000,
+                                      num_generalizations=1000, num_generalization_sets=200)
+}
+
+# Relative slowdown above which a measurement is reported as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+
+
+def benchmark_catalog(catalog_path: str) -> dict[str, float]:
+    """ Returns the time in seconds spent by each measured operation over the catalog.
+
+    :param catalog_path: Path of the catalog to be measured.
+    :type catalog_path: str
+    :return: Dictionary mapping each operation to its time in seconds.
+    :rtype: dict[str, float]
+    """
+
+    measurements = {"load_all_graph_safely": 0.0, "model_index": 0.0}
+    measurements.update({f"feature_{feature_code}": 0.0 for feature_code in FEATURES_LIST})
+
+    models_path = os.path.join(catalog_path, "models")
+    for dataset_name in sorted(os.listdir(models_path)):
+        start_time = time.perf_counter()
+        ontology_graph = load_all_graph_safely(os.path.join(models_path, dataset_name, "ontology.ttl"))
+        measurements["load_all_graph_safely"] += time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        model_index = OntoUMLModelIndex(ontology_graph)
+        measurements["model_index"] += time.perf_counter() - start_time
+
+        for feature_code in FEATURES_LIST:
+            start_time = time.perf_counter()
+            execute_feature_verification(feature_code, model_index)
+            measurements[f"feature_{feature_code}"] += time.perf_counter() - start_time
+
+    # Both tools below are executed from the catalog's parent directory, where their results folder is created
+    current_directory = os.getcwd()
+    os.chdir(os.path.dirname(catalog_path))
+    try:
+        start_time = time.perf_counter()
+        generate_release_file(catalog_path)
+        measurements["generate_release_file"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        validate_ttl_syntax(catalog_path)
+        measurements["validate_ttl_syntax"] = time.perf_counter() - start_time
+    finally:
+        os.chdir(current_directory)
+
+    return measurements
+
+
+def run_benchmarks(scales: list[str]) -> dict:
+    """ Generates a synthetic catalog for each scale and measures it.
+
+    :param scales: Names of the scales to be measured, as defined in BENCHMARK_SCALES.
+    :type scales: list[str]
+    :return: Machine-readable benchmark results, including the machine specifications.
+    :rtype: dict
+    """
+
+    benchmark_results = {"date_time": get_date_time(), "machine": get_computer_specifications(), "scales": {}}
+
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            catalog_path = os.path.join(temporary_directory, "ontouml-models")
+            generate_synthetic_catalog(catalog_path, BENCHMARK_SCALES[scale])
+            benchmark_results["scales"][scale] = benchmark_catalog(catalog_path)
+
+    return benchmark_results
+
+
+def compare_with_baseline(benchmark_results: dict, baseline_results: dict, threshold: float) -> list[str]:
+    """ Returns the descriptions of all measurements that are slower than the baseline by more than the threshold.
+
+    :param benchmark_results: Results returned by run_benchmarks.
+    :type benchmark_results: dict
+    :param baseline_results: Results of a previous execution, used as reference.
+    :type baseline_results: dict
+    :param threshold: Relative slowdown above which a measurement is considered a regression (e.g., 0.2 for 20%).
+    :type threshold: float
+    :return: List of regression descriptions.
+    :rtype: list[str]
+    """
+
+    regressions = []
+
+    for scale, measurements in benchmark_results["scales"].items():
+        baseline_measurements = baseline_results["scales"].get(scale, {})
+        for operation, elapsed_time in measurements.items():
+            baseline_time = baseline_measurements.get(operation)
+            if baseline_time and elapsed_time > baseline_time * (1 + threshold):
+                regressions.append(f"{scale}/{operation}: {elapsed_time:.4f}s (baseline {baseline_time:.4f}s, "
+                                   f"+{(elapsed_time / baseline_time - 1) * 100:.1f}%)")
+
+    return regressions
+
+
+def save_json(content: dict, file_path: str) -> None:
+    """ Saves the content as a json file, creating its directory if necessary. """
+
+    if os.path.dirname(file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    with open(file_path, "w", encoding="utf-8") as json_file:
+        json.dump(content, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    arguments_parser = argparse.ArgumentParser(description="Benchmark suite for the ontouml-models-tools.")
+    arguments_parser.add_argument("--scales", nargs="+", choices=list(BENCHMARK_SCALES), default=["small", "medium"],
+                                  help="Scales of the synthetic catalogs to be measured (default: small medium).")
+    arguments_parser.add_argument("--output", type=str, default=None,
+                                  help="Path of the json results file (default: results/benchmark_<date>.json).")
+    arguments_parser.add_argument("--baseline", type=str, default=None,
+                                  help="Json results file of a previous execution to be compared against.")
+    arguments_parser.add_argument("--save_baseline", type=str, default=None,
+                                  help="Also save the results as a baseline json file in the given path.")
+    arguments_parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                                  help="Relative slowdown reported as regression (default: 0.2).")
+    arguments = arguments_parser.parse_args()
+
+    results = run_benchmarks(arguments.scales)
+
+    output_path = arguments.output or os.path.join("results", f"benchmark_{results['date_time']}.json")
+    save_json(results, output_path)
+    print(f"Benchmark results saved in {output_path}.")
+
+    if arguments.save_baseline:
+        save_json(results, arguments.save_baseline)
+        print(f"Benchmark baseline saved in {arguments.save_baseline}.")
+
+    for scale_name, scale_measurements in results["scales"].items():
+        for operation_name, operation_time in scale_measurements.items():
+            print(f"{scale_name:>8} {operation_name:<25} {operation_time:.4f}s")
+
+    if arguments.baseline:
+        with open(arguments.baseline, encoding="utf-8") as baseline_file:
+            found_regressions = compare_with_baseline(results, json.load(baseline_file), arguments.threshold)
+        if found_regressions:
+            print("Regressions found in comparison with the baseline:")
+            for regression in found_regressions:
+                print(f"  {regression}")
+            exit(1)
+        print("No regressions found in comparison with the baseline.")
@@ -0,0 +1,126 @@
+""" Microbenchmark comparing the single-pass unwanted characters verification with the previous implementation.
+
+Execute from the project's root folder: python -m benchmarks.benchmark_unwanted_characters [num_classes]
+"""
+import random
+import sys
+import time
+
+from rdflib import Graph, Literal, RDF, URIRef
+
+from modules.tools.data_quality.catalog_verifications import verify_unwanted_characters, NAMESPACE_ONTOUML
+from modules.tools.data_quality.model_index import OntoUMLModelIndex
+from modules.tools.data_quality.problem_classes import ProblemChar
+
+SAMPLE_NAMES = ["Person", "Legal Person", "  Double Space", " Starts With Space", "Ends With Space ",
+                "Has\tTab", "<<kind>> Organization", "/derived relation", "package::Imported", "Line\nBreak",
+                "Regular Class Name", "Another Regular Name"]
+
+
+def legacy_verify_unwanted_characters(graph: Graph) -> list[ProblemChar]:
+    """ Previous implementation of verify_unwanted_characters, kept as reference for comparison. """
+
+    problems_list_char = []
+
+    entity_name = URIRef(NAMESPACE_ONTOUML + "name")
+
+    for subj, pred, obj in graph.triples((None, RDF.type, None)):
+        for name in graph.objects(subj, entity_name):
+            name_before = name.value
+            type_clean = (obj.toPython()).replace(NAMESPACE_ONTOUML, "")
+
+            if "\n" in name_before:
+                name_before = name_before.replace("\n", "")
+                problems_list_char.append(ProblemChar(name_before, type_clean, "has line break"))
+
+            try:
+                name_before.encode("utf-8", errors='strict')
+            except UnicodeEncodeError:
+                name_before = name_before.encode("utf-8", errors='ignore')
+                problems_list_char.append(ProblemChar(name_before, type_clean, "non utf-8 characters"))
+
+            if name_before.startswith(" "):
+                problems_list_char.append(ProblemChar(name_before, type_clean, "starts with space"))
+
+            if name_before.endswith(" "):
+                problems_list_char.append(ProblemChar(name_before, type_clean, "ends with space"))
+
+            if "  " in name_before:
+                problems_list_char.append(ProblemChar(name_before, type_clean, "has double space"))
+
+            if "\t" in name_before:
+                problems_list_char.append(ProblemChar(name_before, type_clean, "has indentation"))
+
+            if ("<<" in name_before) or (">>" in name_before):
+                problems_list_char.append(ProblemChar(name_before, type_clean, "stereotype in name"))
+
+            if name_before.startswith("/"):
+                problems_list_char.append(ProblemChar(name_before, type_clean, "derivation in name"))
+
+            if "::" in name_before:
+                problems_list_char.append(ProblemChar(name_before, type_clean, "imported class in name"))
+
+    return problems_list_char
+
+
+def create_synthetic_graph(num_classes: int) -> Graph:
+    """ Creates a graph with the received number of named classes. Each fifth class also has a second type. """
+
+    rnd = random.Random(num_classes)
+    graph = Graph()
+
+    for class_number in range(num_classes):
+        class_uri = URIRef(f"https://example.org/model/class_{class_number}")
+        graph.add((class_uri, RDF.type, URIRef(NAMESPACE_ONTOUML + "Class")))
+        if class_number % 5 == 0:
+            graph.add((class_uri, RDF.type, URIRef(NAMESPACE_ONTOUML + "Classifier")))
+        name = rnd.choice(SAMPLE_NAMES) if rnd.random() < 0.3 else f"Class Name {class_number}"
+        graph.add((class_uri, URIRef(NAMESPACE_ONTOUML + "name"), Literal(name)))
+
+    return graph
+
+
+def get_rows(problems_list: list[ProblemChar]) -> list[tuple]:
+    """ Returns the problems as tuples, so that the results of both implementations can be compared. """
+
+    return [(problem.instance, problem.type, problem.description) for problem in problems_list]
+
+
+def measure(function, argument, repetitions: int) -> float:
+    """ Returns the best execution time in seconds of the function over the argument. """
+
+    best_time = float("inf")
+
+    for _ in range(repetitions):
+        start_time = time.perf_counter()
+        function(argument)
+        best_time = min(best_time, time.perf_counter() - start_time)
+
+    return best_time
+
+
+def run_benchmark(scales: list[int], repetitions: int = 5) -> None:
+    """ Prints the execution times of both implementations for each scale and checks that their results are equal.
+    The model index is shared by all verifications, so its building time is reported separately.
+    """
+
+    for num_classes in scales:
+        graph = create_synthetic_graph(num_classes)
+        model_index = OntoUMLModelIndex(graph)
+
+        if get_rows(legacy_verify_unwanted_characters(graph)) != list(verify_unwanted_characters(model_index)):
+            raise AssertionError(f"Implementations returned different problems for {num_classes} classes.")
+
+        legacy_time = measure(legacy_verify_unwanted_characters, graph, repetitions)
+        index_time = measure(OntoUMLModelIndex, graph, repetitions)
+        current_time = measure(verify_unwanted_characters, model_index, repetitions)
+
+        print(f"{num_classes:>8} classes: legacy {legacy_time:.4f}s, single-pass {current_time:.4f}s "
+              f"(shared index built in {index_time:.4f}s), speedup {legacy_time / current_time:.2f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_benchmark([int(sys.argv[1])])
+    else:
+        run_benchmark([1000, 10000, 100000])
@@ -0,0 +1,136 @@
+""" Generator of synthetic catalogs following the ontouml-models structure, used for benchmarking.
+
+Execute from the project's root folder:
+python -m benchmarks.catalog_generator output_path [num_datasets] [num_classes]
+"""
+import os
+import random
+import sys
+
+PREFIXES = """@prefix ontouml: <https://w3id.org/ontouml#> .
+@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+@prefix dct: <http://purl.org/dc/terms/> .
+@prefix dcat: <http://www.w3.org/ns/dcat#> .
+
+"""
+
+VALID_STEREOTYPES = ["kind", "subkind", "role", "phase", "category", "mixin", "relator", "mode", "quality"]
+OLD_STEREOTYPES = ["powertype", "relatorKind", "modeKind", "quality_kind", "collective-kind", "HOU"]
+UNWANTED_CHARACTERS_NAMES = ["  Double Space", " Starts With Space", "Ends With Space ", "Has\\tTab",
+                             "<<kind>> Stereotyped", "/derived", "package::Imported", "Line\\nBreak"]
+MULTIPLICITY_END_NAMES = ["0..*", "1", "*", "1..2"]
+METAPROPERTY_GENERALIZATION_NAMES = ["{disjoint, complete}", "overlapping", "covering", "disjoint"]
+
+
+class SyntheticCatalogSettings(object):
+    """ Class that contains the settings of a synthetic catalog. Element quantities are per dataset. """
+
+    def __init__(self, num_datasets=10, num_classes=100, num_relations=50, num_generalizations=50,
+                 num_generalization_sets=10, problem_rate=0.05, seed=0):
+        self.num_datasets = num_datasets
+        self.num_classes = num_classes
+        self.num_relations = num_relations
+        self.num_generalizations = num_generalizations
+        self.num_generalization_sets = num_generalization_sets
+        self.problem_rate = problem_rate
+        self.seed = seed
+
+
+def get_dataset_ontology(dataset_name: str, settings: SyntheticCatalogSettings, rnd: random.Random) -> str:
+    """ Returns the content of a synthetic ontology.ttl file with problems injected according to the problem rate. """
+
+    base = f"https://w3id.org/ontouml-models/model/{dataset_name}/"
+    lines = [PREFIXES]
+
+    def has_problem() -> bool:
+        return rnd.random() < settings.problem_rate
+
+    for class_number in range(settings.num_classes):
+        class_name = rnd.choice(UNWANTED_CHARACTERS_NAMES) if has_problem() else f"Class {class_number}"
+        stereotype = rnd.choice(OLD_STEREOTYPES) if has_problem() else rnd.choice(VALID_STEREOTYPES)
+        lines.append(f'<{base}class_{class_number}> rdf:type ontouml:Class ; ontouml:name "{class_name}" ; '
+                     f'ontouml:stereotype ontouml:{stereotype} .')
+
+    for relation_number in range(settings.num_relations):
+        relation = f"{base}relation_{relation_number}"
+        end_name = rnd.choice(MULTIPLICITY_END_NAMES) if has_problem() else "source"
+        lines.append(f'<{relation}> rdf:type ontouml:Relation ; ontouml:name "relation {relation_number}" ; '
+                     f'ontouml:relationEnd <{relation}_end_0>, <{relation}_end_1> .')
+        for end_number, end_value in enumerate([end_name, "target"]):
+            class_number = rnd.randrange(settings.num_classes)
+            lines.append(f'<{relation}_end_{end_number}> rdf:type ontouml:Property ; ontouml:name "{end_value}" ; '
+                         f'ontouml:propertyType <{base}class_{class_number}> .')
+
+    for generalization_number in range(settings.num_generalizations):
+        generalization_name = rnd.choice(METAPROPERTY_GENERALIZATION_NAMES) if has_problem() \
+            else f"generalization {generalization_number}"
+        general, specific = rnd.randrange(settings.num_classes), rnd.randrange(settings.num_classes)
+        lines.append(f'<{base}generalization_{generalization_number}> rdf:type ontouml:Generalization ; '
+                     f'ontouml:name "{generalization_name}" ; ontouml:general <{base}class_{general}> ; '
+                     f'ontouml:specific <{base}class_{specific}> .')
+
+    for genset_number in range(settings.num_generalization_sets):
+        num_generalizations = 1 if has_problem() else 2
+        generalizations = ", ".join(f"<{base}generalization_{rnd.randrange(max(settings.num_generalizations, 1))}>"
+                                    for _ in range(num_generalizations))
+        is_complete = "false" if has_problem() else "true"
+        lines.append(f'<{base}generalization_set_{genset_number}> rdf:type ontouml:GeneralizationSet ; '
+                     f'ontouml:name "generalization set {genset_number}" ; ontouml:isComplete {is_complete} ; '
+                     f'ontouml:isDisjoint false ; ontouml:generalization {generalizations} .')
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_synthetic_catalog(catalog_path: str, settings: SyntheticCatalogSettings) -> None:
+    """ Writes a synthetic catalog with the structure of the ontouml-models catalog: a catalog.ttl file, a
+    vocabulary.ttl file, a shapes folder, and a models folder with one folder per dataset, each one containing an
+    ontology.ttl and a metadata.ttl file.
+
+    :param catalog_path: Path of the directory in which the catalog is created.
+    :type catalog_path: str
+    :param settings: Settings of the catalog to be generated.
+    :type settings: SyntheticCatalogSettings
+    """
+
+    rnd = random.Random(settings.seed)
+
+    os.makedirs(os.path.join(catalog_path, "models"), exist_ok=True)
+    os.makedirs(os.path.join(catalog_path, "shapes"), exist_ok=True)
+
+    with open(os.path.join(catalog_path, "catalog.ttl"), "w", encoding="utf-8") as catalog_file:
+        catalog_file.write(PREFIXES + '<https://w3id.org/ontouml-models> rdf:type dcat:Catalog ; '
+                                      'dct:title "Synthetic OntoUML/UFO Catalog" .\n')
+
+    with open(os.path.join(catalog_path, "vocabulary.ttl"), "w", encoding="utf-8") as vocabulary_file:
+        vocabulary_file.write(PREFIXES + '<https://w3id.org/ontouml-models/vocabulary> dct:title "Vocabulary" .\n')
+
+    with open(os.path.join(catalog_path, "shapes", "dataset-shape.ttl"), "w", encoding="utf-8") as shape_file:
+        shape_file.write('<https://w3id.org/ontouml-models/shapes/DatasetShape> '
+                         '<http://www.w3.org/1999/02/22-rdf-syntax-ns#type> '
+                         '<http://www.w3.org/ns/shacl#NodeShape> .\n')
+
+    for dataset_number in range(settings.num_datasets):
+        dataset_name = f"dataset-{dataset_number:04d}"
+        dataset_path = os.path.join(catalog_path, "models", dataset_name)
+        os.makedirs(dataset_path, exist_ok=True)
+
+        with open(os.path.join(dataset_path, "ontology.ttl"), "w", encoding="utf-8") as ontology_file:
+            ontology_file.write(get_dataset_ontology(dataset_name, settings, rnd))
+
+        with open(os.path.join(dataset_path, "metadata.ttl"), "w", encoding="utf-8") as metadata_file:
+            metadata_file.write(PREFIXES + f'<https://w3id.org/ontouml-models/model/{dataset_name}/> '
+                                           f'rdf:type dcat:Dataset ; dct:title "{dataset_name}" .\n')
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m benchmarks.catalog_generator output_path [num_datasets] [num_classes]")
+        exit(1)
+
+    num_classes_argument = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    generate_synthetic_catalog(sys.argv[1], SyntheticCatalogSettings(
+        num_datasets=int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+        num_classes=num_classes_argument,
+        num_relations=num_classes_argument // 2,
+        num_generalizations=num_classes_argument // 2,
+        num_generalization_sets=num_classes_argument // 10))
@@ -2,9 +2,14 @@
 
 from modules.initialization_arguments import treat_arguments
 from modules.logger_config import initialize_logger
+from modules.tools.all_tools import run_all_tools
 from modules.tools.data_quality.data_quality import run_data_quality_verifications
+from modules.tools.data_quality.watch_mode import run_watch_mode
+from modules.tools.release_diff import diff_release_files
 from modules.tools.release_file import generate_release_file
 from modules.tools.validate_ttl_syntax import validate_ttl_syntax
+from modules.utils.catalog_store import CatalogStore, save_catalog_statistics
+from modules.utils.graph_cache import configure_graph_cache, GRAPH_CACHE_DIRECTORY
 
 SOFTWARE_ACRONYM = "OntoUML/UFO Catalog Tools"
 SOFTWARE_NAME = "ontouml-models-tools"
@@ -17,16 +22,41 @@ if __name__ == "__main__":
     logger = initialize_logger()
 
     # Treating user argument catalog_path (it always must have a '/' by the end)
-    if arguments["catalog_path"][-1] != "/":
+    if arguments["catalog_path"] is not None and arguments["catalog_path"][-1] != "/":
         arguments["catalog_path"] += "/"
 
+    if arguments["cache"]:
+        configure_graph_cache(GRAPH_CACHE_DIRECTORY, arguments["cache_size"])
+
+    catalog_store = None
+    if arguments["catalog_store"] and ((arguments["verify_data_quality"] and not arguments["watch"])
+                                       or arguments["generate_release"]):
+        catalog_store = CatalogStore(arguments["catalog_path"])
+        catalog_store.load_catalog(arguments["jobs"])
+        save_catalog_statistics(catalog_store)
+
     # Switching tool according to received arguments
-    if arguments["verify_data_quality"]:
-        run_data_quality_verifications(arguments["catalog_path"])
+    if arguments["verify_data_quality"] and arguments["watch"]:
+        run_watch_mode(arguments["catalog_path"], arguments["features"], arguments["output_format"],
+                       arguments["compact"], arguments["port"], arguments["poll_interval"])
+    elif arguments["verify_data_quality"]:
+        run_data_quality_verifications(arguments["catalog_path"], arguments["jobs"], arguments["incremental"],
+                                       arguments["output_format"], arguments["profile"], catalog_store,
+                                       arguments["queue_depth"] if arguments["pipeline"] else 0, arguments["compact"],
+                                       arguments["features"])
     elif arguments["generate_release"]:
-        generate_release_file(arguments["catalog_path"])
+        generate_release_file(arguments["catalog_path"], arguments["streaming"], arguments["jobs"],
+                              arguments["profile"], catalog_store, arguments["fragment_cache"])
     elif arguments["validate_ttl"]:
-        validate_ttl_syntax(arguments["catalog_path"])
+        if not validate_ttl_syntax(arguments["catalog_path"], arguments["jobs"], arguments["fail_fast"]):
+            exit(1)
+    elif arguments["run_all"]:
+        if not run_all_tools(arguments["catalog_path"], arguments["jobs"], arguments["fail_fast"],
+                             arguments["incremental"], arguments["output_format"], arguments["streaming"],
+                             arguments["profile"], arguments["features"], arguments["fragment_cache"]):
+            exit(1)
+    elif arguments["release_diff"]:
+        diff_release_files(*arguments["release_diff"])
     else:
         logger.error("No feature selected. Please provide at least one valid argument. Use argument '-h' for help.")
         exit(1)
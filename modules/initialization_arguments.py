@@ -2,14 +2,47 @@
 
 import argparse
 
-from modules.logger_config import initialize_logger
+from modules.logger_config import initialize_logger, set_logging_verbosity
+from modules.tools.data_quality.results_sink import OUTPUT_FORMATS
+from modules.tools.data_quality.verification_registry import get_verification_codes
+
+LOGGER = initialize_logger()
+
+
+def parse_features_list(features_argument: str) -> list[str]:
+    """ Converts the comma-separated data quality feature codes received as argument to a list in execution order. """
+
+    verification_codes = get_verification_codes()
+    selected_codes = {feature_code.strip() for feature_code in features_argument.split(",") if feature_code.strip()}
+    invalid_codes = selected_codes - set(verification_codes)
+
+    if invalid_codes:
+        raise argparse.ArgumentTypeError(f"invalid feature(s) {', '.join(sorted(invalid_codes))}. "
+                                         f"Valid features are: {', '.join(verification_codes)}.")
+    if not selected_codes:
+        raise argparse.ArgumentTypeError(f"no feature informed. Valid features are: {', '.join(verification_codes)}.")
+
+    return [feature_code for feature_code in verification_codes if feature_code in selected_codes]
+
+
+def parse_positive_int(integer_argument: str) -> int:
+    """ Converts an argument that must be an integer greater than or equal to 1. """
+
+    try:
+        integer_value = int(integer_argument)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{integer_argument}'.")
+
+    if integer_value < 1:
+        raise argparse.ArgumentTypeError(f"value must be greater than or equal to 1, not {integer_value}.")
+
+    return integer_value
 
 
 def treat_arguments(software_acronym, software_name, software_version, software_url):
     """ Treats user ontologies arguments. """
 
-    logger = initialize_logger()
-    logger.debug("Parsing arguments...")
+    LOGGER.debug("Parsing arguments...")
 
     about_message = software_acronym + " - version " + software_version
 
@@ -24,9 +57,20 @@ def treat_arguments(software_acronym, software_name, software_version, software_
     # AUTOMATIC ARGUMENT
     arguments_parser.add_argument("-v", "--version", action="version", help="Prints the software version and exit.")
 
+    # VERBOSITY ARGUMENTS
+    verbosity_group = arguments_parser.add_mutually_exclusive_group()
+
+    verbosity_group.add_argument("-q", "--quiet", action="store_const", dest="verbosity", const="quiet",
+                                 help="Show only warnings and errors in the console.")
+
+    verbosity_group.add_argument("--verbose", action="store_const", dest="verbosity", const="verbose",
+                                 help="Show debug messages in the console, including each processed file and dataset.")
+
+    arguments_parser.set_defaults(verbosity="normal")
+
     # POSITIONAL ARGUMENT
-    arguments_parser.add_argument("catalog_path", type=str, action="store",
-                                  help="The path of the OntoUML/UFO Catalog directory.")
+    arguments_parser.add_argument("catalog_path", type=str, action="store", nargs="?",
+                                  help="The path of the OntoUML/UFO Catalog directory (not used by --diff).")
 
     # OPTIONAL ARGUMENTS
 
@@ -41,16 +85,112 @@ def treat_arguments(software_acronym, software_name, software_version, software_
     automation_group.add_argument("-t", "--validate_ttl", action='store_true',
                                   help="Validate the syntax of all ttl files.")
 
+    automation_group.add_argument("-a", "--all", action='store_true',
+                                  help="Validate the syntax of all ttl files, execute data quality verifications, and "
+                                       "generate the release file, parsing each file only once.")
+
+    automation_group.add_argument("--diff", type=str, action="store", nargs=2, default=None,
+                                  metavar=("OLD_RELEASE", "NEW_RELEASE"),
+                                  help="Compare two release files, reporting the triples added and removed in each "
+                                       "dataset.")
+
+    arguments_parser.add_argument("-j", "--jobs", type=parse_positive_int, action="store", default=1,
+                                  help="Number of worker processes used for evaluating datasets, parsing release "
+                                       "files, or validating ttl files (default: 1).")
+
+    arguments_parser.add_argument("-f", "--features", type=parse_features_list, action="store", default=None,
+                                  help="Comma-separated codes of the data quality verifications to be performed "
+                                       f"(default: all, i.e., {','.join(get_verification_codes())}).")
+
+    arguments_parser.add_argument("-i", "--incremental", action='store_true',
+                                  help="Evaluate only the datasets that changed since the previous incremental "
+                                       "data quality execution.")
+
+    arguments_parser.add_argument("-o", "--output_format", type=str, action="store", default="csv",
+                                  choices=OUTPUT_FORMATS,
+                                  help="Format of the data quality output files (default: csv).")
+
+    arguments_parser.add_argument("-s", "--streaming", action='store_true',
+                                  help="Write the release file one ttl file at a time, keeping memory usage flat.")
+
+    arguments_parser.add_argument("-u", "--fragment_cache", action='store_true',
+                                  help="Reuse the cached release fragments of the ttl files that did not change since "
+                                       "the previous release, serializing only new or changed files.")
+
+    arguments_parser.add_argument("--fail_fast", action='store_true',
+                                  help="Stop the ttl syntax validation at the first invalid file.")
+
+    arguments_parser.add_argument("-c", "--cache", action='store_true',
+                                  help="Cache parsed graphs on disk, so that unchanged files are not parsed again.")
+
+    arguments_parser.add_argument("--cache_size", type=int, action="store", default=1024,
+                                  help="Maximum size in MB of the graph cache (default: 1024).")
+
+    arguments_parser.add_argument("-m", "--catalog_store", action='store_true',
+                                  help="Load all catalog files once into a single store shared by the selected tool, "
+                                       "saving the catalog statistics.")
+
+    arguments_parser.add_argument("-p", "--pipeline", action='store_true',
+                                  help="Overlap the reading, evaluation, and writing of the datasets' data quality "
+                                       "results in a pipeline.")
+
+    arguments_parser.add_argument("--queue_depth", type=parse_positive_int, action="store", default=4,
+                                  help="Maximum number of datasets waiting in each pipeline queue (default: 4).")
+
+    arguments_parser.add_argument("--compact", action='store_true',
+                                  help="Load the datasets' ontologies into compact triple tables during the data "
+                                       "quality verifications, reducing memory usage.")
+
+    arguments_parser.add_argument("-w", "--watch", action='store_true',
+                                  help="Keep the data quality verifications running, re-verifying the datasets whose "
+                                       "ontologies change and serving the results through a local HTTP endpoint.")
+
+    arguments_parser.add_argument("--port", type=int, action="store", default=8765,
+                                  help="Port of the watch mode's local HTTP endpoint, or 0 for not serving the results "
+                                       "(default: 8765).")
+
+    arguments_parser.add_argument("--poll_interval", type=float, action="store", default=0.5,
+                                  help="Interval in seconds between scans of the catalog in the watch mode, when "
+                                       "inotify is not available (default: 0.5).")
+
+    arguments_parser.add_argument("--profile", type=int, action="store", default=0, metavar="N",
+                                  help="Profile with cProfile and tracemalloc the N slowest datasets or release files "
+                                       "(default: 0).")
+
     # Execute arguments parser
     arguments = arguments_parser.parse_args()
+    set_logging_verbosity(arguments.verbosity)
+
+    if arguments.catalog_path is None and arguments.diff is None:
+        arguments_parser.error("the following arguments are required: catalog_path")
 
     received_arguments = {
         "catalog_path": arguments.catalog_path,
+        "verbosity": arguments.verbosity,
         "verify_data_quality": arguments.data_quality,
         "generate_release": arguments.release,
-        "validate_ttl": arguments.validate_ttl
+        "validate_ttl": arguments.validate_ttl,
+        "run_all": arguments.all,
+        "release_diff": arguments.diff,
+        "jobs": arguments.jobs,
+        "features": arguments.features,
+        "incremental": arguments.incremental,
+        "output_format": arguments.output_format,
+        "streaming": arguments.streaming,
+        "fragment_cache": arguments.fragment_cache,
+        "fail_fast": arguments.fail_fast,
+        "cache": arguments.cache,
+        "cache_size": arguments.cache_size,
+        "profile": arguments.profile,
+        "catalog_store": arguments.catalog_store,
+        "pipeline": arguments.pipeline,
+        "queue_depth": arguments.queue_depth,
+        "compact": arguments.compact,
+        "watch": arguments.watch,
+        "port": arguments.port,
+        "poll_interval": arguments.poll_interval
     }
 
-    logger.debug(f"Arguments Parsed. Obtained values are: {received_arguments}")
+    LOGGER.debug(f"Arguments Parsed. Obtained values are: {received_arguments}")
 
     return received_arguments
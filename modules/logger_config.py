@@ -1,58 +1,161 @@
-""" Logging configurations. """
+""" Logging configurations.
 
+Log records are not written by the threads that create them. The logger only puts them in a queue, and a listener
+thread formats them and writes them to the console and to the log file. Worker processes put their records in a
+multiprocessing queue, which is consumed by another listener thread of the main process using the same handlers.
+"""
+
+import atexit
 import logging
+import multiprocessing
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from modules.utils.utils_general import get_date_time
 
+LOGGER_NAME = "logger"
+
+# Console levels of the verbosity options. The log file always receives all records.
+VERBOSITY_LEVELS = {"quiet": logging.WARNING, "normal": logging.INFO, "verbose": logging.DEBUG}
+
+# Logging state of the main process, created by the first call to initialize_logger
+logger_initialized = False
+console_handler = None
+log_handlers = []
+log_listeners = []
+workers_queue = None
+
+
+class LocalQueueHandler(QueueHandler):
+    """ Queue handler for a queue consumed by a listener of the same process. Records are enqueued without being
+    prepared (i.e., formatted and copied), as they are not pickled nor shared with other handlers, so that all
+    formatting happens in the listener's thread. """
+
+    def emit(self, record):
+        try:
+            self.enqueue(record)
+        except Exception:
+            self.handleError(record)
+
 
 def initialize_logger(source="default"):
-    """ Initialize Logger. """
+    """ Initialize Logger. The handlers and the listener are created only in the first call, so the following calls
+    just return the logger. """
+
+    global logger_initialized, console_handler
 
     # Create a custom logger
-    new_logger = logging.getLogger("logger")
+    new_logger = logging.getLogger(LOGGER_NAME)
+
+    if logger_initialized:
+        return new_logger
 
     if source == "default":
         new_logger.setLevel(logging.DEBUG)
     else:
         print(f"Logger parameter unknown ({source}). Aborting execution.")
 
-    # Creates a new logger only if logger does not exist yet
-    if not logging.getLogger("logger").hasHandlers():
+    logger_initialized = True
 
-        # Creating CONSOLE handler
-        console_handler = logging.StreamHandler()
-        if source == "default":
-            console_handler.setLevel(logging.INFO)
-        else:
-            print(f"Logger parameter unknown ({source}). Aborting execution.")
+    # Worker processes that import the modules receive their queue from configure_worker_logging
+    if multiprocessing.parent_process() is not None:
+        return new_logger
 
-        # If directory "/log" does not exist, create it
-        log_dir = "logs/"
-        try:
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-        except OSError as error:
-            print(f"Could not create {log_dir} directory. Exiting program."
-                  f"System error reported: {error}")
-            exit(1)
-
-        # Creating FILE handler
-        file_handler = logging.FileHandler(f"{log_dir}{get_date_time()}.log")
-        if source == "default":
-            file_handler.setLevel(logging.DEBUG)
-        else:
-            print(f"Logger parameter unknown ({source}). Aborting execution.")
-
-        # Create formatters and add it to handlers
-        console_format = logging.Formatter('%(levelname)s - %(message)s')
-        file_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s [func: %(funcName)s '
-                                        'in %(filename)s]')
-        console_handler.setFormatter(console_format)
-        file_handler.setFormatter(file_format)
-
-        # Add handlers to the logger
-        new_logger.addHandler(console_handler)
-        new_logger.addHandler(file_handler)
+    # The thread name is not obtained for each record, as it is not logged
+    logging.logThreads = False
+
+    # Creating CONSOLE handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(VERBOSITY_LEVELS["normal"])
+
+    # If directory "/log" does not exist, create it
+    log_dir = "logs/"
+    try:
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+    except OSError as error:
+        print(f"Could not create {log_dir} directory. Exiting program."
+              f"System error reported: {error}")
+        exit(1)
+
+    # Creating FILE handler
+    file_handler = logging.FileHandler(f"{log_dir}{get_date_time()}.log")
+    file_handler.setLevel(logging.DEBUG)
+
+    # Create formatters and add it to handlers
+    console_format = logging.Formatter('%(levelname)s - %(message)s')
+    file_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s [%(processName)s]')
+    console_handler.setFormatter(console_format)
+    file_handler.setFormatter(file_format)
+    log_handlers.extend((console_handler, file_handler))
+
+    # Records are formatted and written by the listener's thread
+    records_queue = queue.SimpleQueue()
+    start_log_listener(records_queue)
+    new_logger.addHandler(LocalQueueHandler(records_queue))
+
+    atexit.register(stop_log_listeners)
 
     return new_logger
+
+
+def start_log_listener(records_queue) -> None:
+    """ Starts a listener thread that sends the records put in the queue to the log handlers. """
+
+    log_listener = QueueListener(records_queue, *log_handlers, respect_handler_level=True)
+    log_listener.start()
+    log_listeners.append(log_listener)
+
+
+def stop_log_listeners() -> None:
+    """ Stops the listeners after they write all pending records. Registered to be executed at exit. """
+
+    for log_listener in log_listeners:
+        log_listener.stop()
+    log_listeners.clear()
+
+    for log_handler in log_handlers:
+        log_handler.close()
+
+
+def set_logging_verbosity(verbosity: str) -> None:
+    """ Sets the level of the records shown in the console.
+
+    :param verbosity: Key of VERBOSITY_LEVELS (quiet, normal, or verbose).
+    :type verbosity: str
+    """
+
+    initialize_logger()
+    console_handler.setLevel(VERBOSITY_LEVELS[verbosity])
+
+
+def get_workers_logging_queue() -> multiprocessing.Queue:
+    """ Returns the queue in which worker processes put their records, creating it and its listener in the first call.
+    Must be called in the main process before the workers are started, so that they inherit the queue. """
+
+    global workers_queue
+
+    initialize_logger()
+
+    if workers_queue is None:
+        workers_queue = multiprocessing.Queue()
+        start_log_listener(workers_queue)
+
+    return workers_queue
+
+
+def configure_worker_logging(logging_queue: multiprocessing.Queue) -> None:
+    """ Makes the logger of a worker process put its records in the queue received from the main process, replacing
+    any handler inherited from it.
+
+    :param logging_queue: Queue obtained in the main process with get_workers_logging_queue.
+    :type logging_queue: multiprocessing.Queue
+    """
+
+    worker_logger = initialize_logger()
+
+    for log_handler in list(worker_logger.handlers):
+        worker_logger.removeHandler(log_handler)
+
+    worker_logger.addHandler(QueueHandler(logging_queue))
@@ -0,0 +1,139 @@
+""" Combined execution of the ttl syntax validation, the data quality verifications, and the release file generation,
+in which each catalog file is parsed only once. """
+from concurrent.futures import ProcessPoolExecutor
+
+from modules.logger_config import initialize_logger
+from modules.tools.data_quality.data_quality import run_data_quality_verifications
+from modules.tools.release_file import generate_release_file
+from modules.tools.validate_ttl_syntax import TtlSyntaxError, get_syntax_error, register_validation_result, \
+    report_validation_results
+from modules.utils.catalog_store import CatalogStore, read_file_triples, save_catalog_statistics
+from modules.utils.progress_reporter import ProgressReporter
+from modules.utils.utils_catalog import list_all_files_with_filetype
+from modules.utils.worker_processes import initialize_worker_process, get_worker_settings, map_with_bounded_window, \
+    TASKS_PER_WORKER
+
+LOGGER = initialize_logger()
+
+
+def read_and_validate_file(ttl_file: str) -> tuple[TtlSyntaxError | None, list[tuple], list[tuple]]:
+    """ Parses the ttl file, returning its syntax error, if any, and its namespaces and triples in parse order.
+    Defined at module level so that it can be dispatched to worker processes.
+
+    :param ttl_file: Path of the ttl file to be parsed.
+    :type ttl_file: str
+    :return: Syntax error found in the file (or None if the file is valid), list of (prefix, namespace) pairs, and list
+             of triples. Both lists are empty for invalid files.
+    :rtype: tuple[TtlSyntaxError | None, list[tuple], list[tuple]]
+    """
+
+    try:
+        namespaces, triples = read_file_triples(ttl_file)
+    except Exception as error:
+        return get_syntax_error(ttl_file, error), [], []
+    except SystemExit:
+        # The loaders exit when a file cannot be read (reporting the system error), which must not abort the whole run
+        return TtlSyntaxError(ttl_file, None, None, "File could not be read. See the log for the reported error."), \
+            [], []
+
+    return None, namespaces, triples
+
+
+def load_and_validate_catalog(catalog_path: str, jobs: int = 1,
+                              fail_fast: bool = False) -> tuple[CatalogStore, list[TtlSyntaxError]]:
+    """ Parses all ttl files of the catalog once, validating their syntax and loading the valid ones (except for the
+    shape files, which are only validated) into a catalog store. Files are parsed by worker processes if jobs is
+    greater than 1, and are always added to the store in the same order.
+
+    :param catalog_path: Path to the ontouml-models catalog directory.
+    :type catalog_path: str
+    :param jobs: Number of worker processes used for parsing the files.
+    :type jobs: int
+    :param fail_fast: If True, stops at the first invalid file.
+    :type fail_fast: bool
+    :return: Loaded catalog store and list of syntax errors found.
+    :rtype: tuple[CatalogStore, list[TtlSyntaxError]]
+    """
+
+    list_ttl_files = list_all_files_with_filetype(catalog_path, "ttl")
+    len_list_ttl_files = len(list_ttl_files)
+    LOGGER.info(f"Parsing and validating {len_list_ttl_files} ttl files in {catalog_path} using {jobs} process(es).")
+
+    catalog_store = CatalogStore(catalog_path)
+    problems_list = []
+    num_validated = 0
+    progress_reporter = ProgressReporter("Parsing and validating files", len_list_ttl_files)
+
+    executor = None
+    if jobs > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker_process,
+                                       initargs=get_worker_settings())
+        # Workers only get a few files ahead, so that parsed contents do not pile up when an early file is slow
+        files_contents = map_with_bounded_window(executor, read_and_validate_file, list_ttl_files,
+                                                 window_size=TASKS_PER_WORKER * jobs)
+    else:
+        files_contents = map(read_and_validate_file, list_ttl_files)
+
+    try:
+        for ttl_file, (syntax_error, namespaces, triples) in zip(list_ttl_files, files_contents):
+            num_validated += 1
+            progress_reporter.update(ttl_file, len(triples))
+            register_validation_result(catalog_path, ttl_file, syntax_error, num_validated, len_list_ttl_files,
+                                       problems_list)
+            if syntax_error is None and "-shape.ttl" not in ttl_file:
+                catalog_store.add_file_triples(ttl_file, namespaces, triples)
+            if fail_fast and problems_list:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    progress_reporter.finish()
+    report_validation_results(problems_list, num_validated, len_list_ttl_files)
+
+    return catalog_store, problems_list
+
+
+def run_all_tools(catalog_path: str, jobs: int = 1, fail_fast: bool = False, incremental: bool = False,
+                  output_format: str = "csv", streaming: bool = False, profile: int = 0,
+                  features_list: list[str] = None, fragment_cache: bool = False) -> bool:
+    """ Executes the ttl syntax validation, the data quality verifications, and the release file generation parsing
+    each catalog file only once. The parsed graphs are kept in a catalog store shared by the data quality verifications
+    and the release file generation, which are only executed if all files are valid.
+
+    :param catalog_path: Path to the ontouml-models catalog directory provided by the user as argument.
+    :type catalog_path: str
+    :param jobs: Number of worker processes used for parsing the files.
+    :type jobs: int
+    :param fail_fast: If True, the validation stops at the first invalid file.
+    :type fail_fast: bool
+    :param incremental: If True, only datasets that changed since the previous incremental execution are evaluated.
+    :type incremental: bool
+    :param output_format: Format of the data quality output files (csv, jsonl, or sqlite).
+    :type output_format: str
+    :param streaming: If True, the release file is written one ttl file at a time.
+    :type streaming: bool
+    :param profile: Number of slowest datasets and release files to be processed again under cProfile and tracemalloc.
+    :type profile: int
+    :param features_list: Codes of the data quality sub-features to be performed. If None, all are performed.
+    :type features_list: list[str]
+    :param fragment_cache: If True, the release file reuses the cached fragments of unchanged files.
+    :type fragment_cache: bool
+    :return: True if all files are valid, False otherwise.
+    :rtype: bool
+    """
+
+    catalog_store, problems_list = load_and_validate_catalog(catalog_path, jobs, fail_fast)
+
+    if problems_list:
+        LOGGER.error("Data quality verifications and release file generation not executed, as invalid ttl files "
+                     "were found.")
+        return False
+
+    save_catalog_statistics(catalog_store)
+
+    run_data_quality_verifications(catalog_path, jobs, incremental, output_format, profile, catalog_store,
+                                   features_list=features_list)
+    generate_release_file(catalog_path, streaming, jobs, profile, catalog_store, fragment_cache)
+
+    return True
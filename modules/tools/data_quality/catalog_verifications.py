@@ -1,132 +1,168 @@
 """ Verifications over the catalog.ttl file. """
-from rdflib import RDF, URIRef, Graph
+import re
 
 from modules.tools.data_quality.generalization_verifications import get_gens_properties_in_names, \
     get_gens_without_properties, get_insuficient_gens
+from modules.tools.data_quality.model_index import OntoUMLModelIndex, ONTOUML_CLASS
 from modules.tools.data_quality.problem_classes import ProblemChar, ProblemEnds, ProblemGeneralizations, \
-    ProblemOldStereotypes
+    ProblemOldStereotypes, ProblemTable
 from modules.utils.utils_general import contains_number
 
 NAMESPACE_ONTOUML = "https://w3id.org/ontouml#"
 
+# Matches every name that has at least one possible unwanted character (surrogates are non utf-8 characters)
+UNWANTED_CHARACTERS_PATTERN = re.compile(r"^[ /]| $|  |[\n\t\ud800-\udfff]|<<|>>|::")
 
-def verify_unwanted_characters(graph: Graph) -> list[ProblemChar]:
-    """ For the entity types in the list, verify if their instances have unwanted characters.
 
-    :param graph: Loaded ontology graph.
-    :type graph: Graph
-    :return: List containing all identified problems.
-    :rtype: list[ProblemChar]
+def get_unwanted_characters_problems(name: str) -> list[tuple]:
+    """ Classifies the unwanted characters found in a name.
+
+    :param name: Name to be verified.
+    :type name: str
+    :return: List of tuples containing the reported instance name and the description of each identified problem.
+    :rtype: list[tuple]
     """
 
-    problems_list_char = []
+    # Fast path. Names without any match cannot have any of the problems below.
+    if UNWANTED_CHARACTERS_PATTERN.search(name) is None:
+        return []
+
+    name_problems = []
+    reported_name = name
+
+    if "\n" in name:
+        name = name.replace("\n", "")
+        reported_name = name
+        name_problems.append((reported_name, "has line break"))
+
+    try:
+        name.encode("utf-8", errors='strict')
+    except UnicodeEncodeError:
+        reported_name = name.encode("utf-8", errors='ignore')
+        name = reported_name.decode("utf-8")
+        name_problems.append((reported_name, "non utf-8 characters"))
+
+    if name.startswith(" "):
+        name_problems.append((reported_name, "starts with space"))
 
-    entity_name = URIRef(NAMESPACE_ONTOUML + "name")
+    if name.endswith(" "):
+        name_problems.append((reported_name, "ends with space"))
 
-    for subj, pred, obj in graph.triples((None, RDF.type, None)):
-        for name in graph.objects(subj, entity_name):
-            name_before = name.value
-            type_clean = (obj.toPython()).replace(NAMESPACE_ONTOUML, "")
+    if "  " in name:
+        name_problems.append((reported_name, "has double space"))
 
-            if "\n" in name_before:
-                name_before = name_before.replace("\n", "")
-                problems_list_char.append(ProblemChar(name_before, type_clean, "has line break"))
+    if "\t" in name:
+        name_problems.append((reported_name, "has indentation"))
 
-            try:
-                name_before.encode("utf-8", errors='strict')
-            except:
-                name_before = name_before.encode("utf-8", errors='ignore')
-                problems_list_char.append(ProblemChar(name_before, type_clean, "non utf-8 characters"))
+    if ("<<" in name) or (">>" in name):
+        name_problems.append((reported_name, "stereotype in name"))
 
-            if name_before.startswith(" "):
-                problems_list_char.append(ProblemChar(name_before, type_clean, "starts with space"))
+    if name.startswith("/"):
+        name_problems.append((reported_name, "derivation in name"))
 
-            if name_before.endswith(" "):
-                problems_list_char.append(ProblemChar(name_before, type_clean, "ends with space"))
+    if "::" in name:
+        name_problems.append((reported_name, "imported class in name"))
 
-            if "  " in name_before:
-                problems_list_char.append(ProblemChar(name_before, type_clean, "has double space"))
+    return name_problems
+
+
+def verify_unwanted_characters(model_index: OntoUMLModelIndex) -> ProblemTable:
+    """ For the entity types in the list, verify if their instances have unwanted characters.
+    Each distinct name is classified only once, even if it is shared by many instances or if its instance has
+    multiple types. Problems are reported for every type of the instance, in the order of the graph's type triples.
+
+    :param model_index: Index of the loaded ontology graph.
+    :type model_index: OntoUMLModelIndex
+    :return: Table containing all identified problems.
+    :rtype: ProblemTable
+    """
 
-            if "\t" in name_before:
-                problems_list_char.append(ProblemChar(name_before, type_clean, "has indentation"))
+    problems_list_char = ProblemTable(ProblemChar)
 
-            if ("<<" in name_before) or (">>" in name_before):
-                problems_list_char.append(ProblemChar(name_before, type_clean, "stereotype in name"))
+    subjects_names = {subj: [name.value for name in names_list] for subj, names_list in model_index.names.items()}
 
-            if name_before.startswith("/"):
-                problems_list_char.append(ProblemChar(name_before, type_clean, "derivation in name"))
+    # Classifying all distinct names in a single batch
+    distinct_names = {name for names_list in subjects_names.values() for name in names_list}
+    names_problems = {name: get_unwanted_characters_problems(name) for name in distinct_names}
 
-            if "::" in name_before:
-                problems_list_char.append(ProblemChar(name_before, type_clean, "imported class in name"))
+    for subj, obj in model_index.type_pairs:
+        type_clean = None
+        for name in subjects_names.get(subj, ()):
+            name_problems = names_problems[name]
+            if name_problems:
+                if type_clean is None:
+                    type_clean = (obj.toPython()).replace(NAMESPACE_ONTOUML, "")
+                for reported_name, description in name_problems:
+                    problems_list_char.add(reported_name, type_clean, description)
 
     return problems_list_char
 
 
-def verify_association_ends(graph: Graph) -> list[ProblemEnds]:
+def verify_association_ends(model_index: OntoUMLModelIndex) -> ProblemTable:
     """ Perform verifications in association ends.
 
-    :param graph: Loaded ontology graph.
-    :type graph: Graph
-    :return: List containing all identified problems.
-    :rtype: list[ProblemEnds]
+    :param model_index: Index of the loaded ontology graph.
+    :type model_index: OntoUMLModelIndex
+    :return: Table containing all identified problems.
+    :rtype: ProblemTable
     """
 
-    problems_list_ends = []
+    problems_list_ends = ProblemTable(ProblemEnds)
 
-    knows_query = """
-    PREFIX ontouml: <https://w3id.org/ontouml#>
-    SELECT DISTINCT ?class_name ?relation_name ?prop_value
-    WHERE {
-        ?prop_inst ontouml:propertyType ?class .
-        ?prop_inst ontouml:name ?prop_value .
-        ?class ontouml:name ?class_name .
-        ?relation ontouml:relationEnd ?prop_inst .
-        ?relation ontouml:name ?relation_name .
-    }"""
+    # Distinct (class_name, relation_name, prop_value) combinations, as previously obtained via SPARQL
+    ends_rows = {}
 
-    qres = graph.query(knows_query)
+    for prop_inst, classes_list in model_index.property_types.items():
+        relations_list = model_index.end_relations.get(prop_inst)
+        prop_values_list = model_index.names.get(prop_inst)
+        if not relations_list or not prop_values_list:
+            continue
+        for class_inst in classes_list:
+            for class_name in model_index.names.get(class_inst, ()):
+                for relation in relations_list:
+                    for relation_name in model_index.names.get(relation, ()):
+                        for prop_value in prop_values_list:
+                            ends_rows[(class_name, relation_name, prop_value)] = None
 
-    for row in qres:
+    for class_name, relation_name, prop_value in ends_rows:
         # Get association ends with numbers or asterisks
-        if (contains_number(row.prop_value.value)) or ("*" in row.prop_value.value):
+        if (contains_number(prop_value.value)) or ("*" in prop_value.value):
             # The replace function is necessary to generate a correct csv removing cases of line breaks in names
-            problems_list_ends.append(
-                ProblemEnds(row.class_name.replace("\n", ""), row.relation_name.replace("\n", ""),
-                            row.prop_value.value.replace("\n", ""),
-                            "association end with possible multiplicity"))
+            problems_list_ends.add(class_name.replace("\n", ""), relation_name.replace("\n", ""),
+                                   prop_value.value.replace("\n", ""), "association end with possible multiplicity")
 
     return problems_list_ends
 
 
-def verify_generalizations_properties(graph: Graph) -> list[ProblemGeneralizations]:
+def verify_generalizations_properties(model_index: OntoUMLModelIndex) -> ProblemTable:
     """ Identifies cases in which meta-properties are written as names in generalization sets.
 
-    :param graph: Loaded ontology graph.
-    :type graph: Graph
-    :return: List containing all identified problems.
-    :rtype: list[ProblemGeneralizations]
+    :param model_index: Index of the loaded ontology graph.
+    :type model_index: OntoUMLModelIndex
+    :return: Table containing all identified problems.
+    :rtype: ProblemTable
     """
 
-    problems_list_generalizations = []
-    problems_list_generalizations += get_gens_properties_in_names(graph)
-    problems_list_generalizations += get_gens_without_properties(graph)
-    problems_list_generalizations += get_insuficient_gens(graph)
+    problems_list_generalizations = ProblemTable(ProblemGeneralizations)
+    problems_list_generalizations.extend(get_gens_properties_in_names(model_index))
+    problems_list_generalizations.extend(get_gens_without_properties(model_index))
+    problems_list_generalizations.extend(get_insuficient_gens(model_index))
 
     return problems_list_generalizations
 
 
-def verify_old_stereotypes(graph: Graph) -> list[ProblemOldStereotypes]:
+def verify_old_stereotypes(model_index: OntoUMLModelIndex) -> ProblemTable:
     """ Identifies cases in which the used stereotypes can be substituted by correct ones.
     According to: https://github.com/OntoUML/ontouml-models/wiki/Frequently-Asked-Questions
     #how-do-i-document-stereotypes-that-are-not-part-of-the-current-ontouml-profile
 
-    :param graph: Loaded ontology graph.
-    :type graph: Graph
-    :return: List containing all identified problems.
-    :rtype: list[ProblemOldStereotypes]
+    :param model_index: Index of the loaded ontology graph.
+    :type model_index: OntoUMLModelIndex
+    :return: Table containing all identified problems.
+    :rtype: ProblemTable
     """
 
-    problems_list_old_stereotypes = []
+    problems_list_old_stereotypes = ProblemTable(ProblemOldStereotypes)
 
     # Dictionary with stereotypes that can be substituted (all lowercase) and their substitution
     old_stereotypes_dict = {
@@ -142,31 +178,28 @@ def verify_old_stereotypes(graph: Graph) -> list[ProblemOldStereotypes]:
         "qualitykind": "quality"
     }
 
-    knows_query = """
-    PREFIX ontouml: <https://w3id.org/ontouml#>
-    SELECT DISTINCT ?class_name ?stereotype
-    WHERE {
-        ?class rdf:type ontouml:Class .
-        ?class ontouml:name ?class_name .
-        ?class ontouml:stereotype ?stereotype
-    }"""
+    # Distinct (class_name, stereotype) combinations, as previously obtained via SPARQL
+    stereotypes_rows = {}
 
-    qres = graph.query(knows_query)
+    for class_inst in model_index.get_instances(ONTOUML_CLASS):
+        stereotypes_list = model_index.stereotypes.get(class_inst, ())
+        for class_name in model_index.names.get(class_inst, ()):
+            for stereotype in stereotypes_list:
+                stereotypes_rows[(class_name, stereotype)] = None
 
-    for row in qres:
+    for class_name, stereotype in stereotypes_rows:
         # Remove line breaks in class names
-        class_name = (row.class_name).replace("\n", "")
+        class_name = class_name.replace("\n", "")
 
         # Remove prefix, set to lowercase, and clean hyphens and underscores in stereotypes
-        no_prefix_stereotype_name = (row.stereotype).replace(NAMESPACE_ONTOUML, "")
+        no_prefix_stereotype_name = stereotype.replace(NAMESPACE_ONTOUML, "")
         stereotype_name = no_prefix_stereotype_name.lower()
         stereotype_name = stereotype_name.replace("_", "")
         stereotype_name = stereotype_name.replace("-", "")
 
         # if in list, add to problems_list
         if stereotype_name in old_stereotypes_dict.keys():
-            problems_list_old_stereotypes.append(ProblemOldStereotypes(class_name,
-                                                                       no_prefix_stereotype_name,
-                                                                       old_stereotypes_dict[stereotype_name]))
+            problems_list_old_stereotypes.add(class_name, no_prefix_stereotype_name,
+                                              old_stereotypes_dict[stereotype_name])
 
     return problems_list_old_stereotypes
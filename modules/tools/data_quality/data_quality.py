@@ -1,58 +1,415 @@
 """ Main module for the data quality functionality. """
-import inspect
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator
 
 from rdflib import Graph
 
 from modules.logger_config import initialize_logger
-from modules.tools.data_quality.catalog_verifications import verify_unwanted_characters, verify_association_ends, \
-    verify_generalizations_properties, verify_old_stereotypes
-from modules.tools.data_quality.problem_classes import DataQualityProblemClass
-from modules.tools.data_quality.results_file import create_directory_if_not_exists, create_output_csv_file, \
-    append_problems_output_csv_file
-from modules.utils.error_treatment import report_error_end_of_switch
-from modules.utils.utils_general import get_list_unhidden_directories
+from modules.tools.data_quality.model_index import OntoUMLModelIndex
+from modules.tools.data_quality.problem_classes import ProblemTable
+from modules.tools.data_quality.results_file import create_directory_if_not_exists
+from modules.tools.data_quality.results_manifest import load_results_manifest, save_results_manifest, \
+    get_manifest_rows
+from modules.tools.data_quality.results_sink import ResultsSink, create_results_sink
+from modules.tools.data_quality.verification_registry import get_verification, get_verification_codes, \
+    get_required_index_sections
+from modules.utils.catalog_store import CatalogStore
+from modules.utils.compact_graph import load_compact_table_safely
+from modules.utils.metrics import measure_time, get_memory_metrics, write_metrics_file, get_slowest_items, \
+    profile_execution
+from modules.utils.progress_reporter import ProgressReporter
+from modules.utils.utils_catalog import list_changed_files_with_filetype, save_file_index
+from modules.utils.utils_general import get_list_unhidden_directories, get_file_hash
 from modules.utils.utils_rdf import load_all_graph_safely
+from modules.utils.worker_processes import initialize_worker_process, get_worker_settings
 
 LOGGER = initialize_logger()
 
+METRICS_FILE_PATH = "results/metrics_data_quality.csv"
+FILE_INDEX_NAME = "data_quality"
 
-def execute_feature_verification(feature_code: str, evaluated_ontology: Graph) -> list[DataQualityProblemClass]:
+
+def execute_feature_verification(feature_code: str, evaluated_ontology: OntoUMLModelIndex) -> ProblemTable:
     """ Execute the feature verification for the evaluated_ontology according to the given feature_code.
 
     :param feature_code: Data quality sub-feature being performed.
     :type feature_code: str
-    :param evaluated_ontology: Dataset's ontology that is being evaluated.
-    :type evaluated_ontology: Graph
-    :return: List of problems with the given feature_code type.
-    :rtype: list[DataQualityProblemClass]
+    :param evaluated_ontology: Index of the dataset's ontology that is being evaluated.
+    :type evaluated_ontology: OntoUMLModelIndex
+    :return: Table of problems with the given feature_code type.
+    :rtype: ProblemTable
+    """
+
+    return get_verification(feature_code).function(evaluated_ontology)
+
+
+def evaluate_dataset(dataset_name: str, dataset_ontology_location: str, features_list: list[str],
+                     ontology_graph: Graph = None, ontology_content: bytes = None,
+                     compact: bool = False) -> tuple[dict[str, ProblemTable], dict]:
+    """ Loads the dataset's ontology and executes all features' verifications over it, measuring the time spent by
+    each step and the memory used by the process. Defined at module level so that it can be dispatched to worker
+    processes.
+
+    :param dataset_name: Name of the dataset being evaluated.
+    :type dataset_name: str
+    :param dataset_ontology_location: Path to the dataset's ontology.ttl file.
+    :type dataset_ontology_location: str
+    :param features_list: Codes of the data quality sub-features to be performed.
+    :type features_list: list[str]
+    :param ontology_graph: Already loaded graph of the dataset's ontology. If None, the ontology.ttl file is loaded.
+    :type ontology_graph: Graph
+    :param ontology_content: Already read content of the ontology.ttl file, parsed when ontology_graph is None.
+    :type ontology_content: bytes
+    :param compact: If True, the ontology is parsed into a compact triple table instead of an rdflib graph.
+    :type compact: bool
+    :return: Dictionary mapping each feature code to its table of identified problems, and the dataset's metrics.
+    :rtype: tuple[dict[str, ProblemTable], dict]
+    """
+
+    dataset_metrics = {"dataset": dataset_name, "file_size": os.path.getsize(dataset_ontology_location)}
+
+    with measure_time(dataset_metrics, "total_time"):
+        LOGGER.debug(f"Loading ontology of dataset {dataset_name}.")
+        with measure_time(dataset_metrics, "parse_time"):
+            if ontology_graph is None and compact:
+                ontology_graph = load_compact_table_safely(dataset_ontology_location, ontology_content)
+            elif ontology_graph is None:
+                ontology_graph = load_all_graph_safely(dataset_ontology_location, ontology_content=ontology_content)
+        dataset_metrics["triples"] = len(ontology_graph)
+
+        with measure_time(dataset_metrics, "index_time"):
+            evaluated_ontology = OntoUMLModelIndex(ontology_graph, get_required_index_sections(features_list))
+
+        dataset_results = {}
+        for feature_code in features_list:
+            with measure_time(dataset_metrics, f"{feature_code}_time"):
+                dataset_results[feature_code] = execute_feature_verification(feature_code, evaluated_ontology)
+
+    dataset_metrics.update(get_memory_metrics())
+
+    return dataset_results, dataset_metrics
+
+
+def evaluate_datasets_in_parallel(datasets_locations: dict[str, str], features_list: list[str], jobs: int,
+                                  compact: bool = False, progress_reporter: ProgressReporter = None) \
+        -> dict[str, tuple[dict[str, ProblemTable], dict]]:
+    """ Evaluates all datasets using a pool of worker processes.
+    Datasets with the largest ontology files are scheduled first to reduce the time spent waiting for stragglers.
+
+    :param datasets_locations: Dictionary mapping each dataset name to its ontology.ttl path.
+    :type datasets_locations: dict[str, str]
+    :param features_list: Codes of the data quality sub-features to be performed.
+    :type features_list: list[str]
+    :param jobs: Number of worker processes.
+    :type jobs: int
+    :param compact: If True, ontologies are parsed into compact triple tables.
+    :type compact: bool
+    :param progress_reporter: Reporter updated as each dataset's evaluation is completed, if provided.
+    :type progress_reporter: ProgressReporter
+    :return: Dictionary mapping each dataset name to its evaluation results and metrics.
+    :rtype: dict[str, tuple[dict[str, ProblemTable], dict]]
     """
 
-    problems_list = []
+    scheduling_order = sorted(datasets_locations, key=lambda name: os.path.getsize(datasets_locations[name]),
+                              reverse=True)
+    datasets_results = {}
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker_process,
+                             initargs=get_worker_settings()) as executor:
+        futures = {executor.submit(evaluate_dataset, dataset_name, datasets_locations[dataset_name], features_list,
+                                   compact=compact): dataset_name for dataset_name in scheduling_order}
+
+        for future in as_completed(futures):
+            dataset_name = futures[future]
+            datasets_results[dataset_name] = future.result()
+            if progress_reporter is not None:
+                progress_reporter.update(dataset_name, datasets_results[dataset_name][1]["triples"])
+
+    return datasets_results
+
+
+def evaluate_datasets_pipelined(datasets_locations: dict[str, str], features_list: list[str], jobs: int,
+                                queue_depth: int, compact: bool = False) -> Iterator[tuple[str, dict, dict]]:
+    """ Evaluates all datasets in a bounded producer/consumer pipeline, yielding their results in sorted dataset order.
+    A reader thread prefetches the ontology files' content, verification workers parse and verify them, and the caller
+    consumes (e.g., writes) the results, so that disk reads, processing, and writes overlap.
+
+    With jobs equal to 1, a single worker thread evaluates the datasets in this process. Otherwise, jobs worker threads
+    dispatch the evaluations to a pool of jobs worker processes. At most queue_depth datasets wait in each queue and
+    the number of datasets inside the pipeline (read, being evaluated, or waiting to be yielded in order) is limited
+    to queue_depth plus the number of workers, which limits the memory used.
+
+    :param datasets_locations: Dictionary mapping each dataset name to its ontology.ttl path.
+    :type datasets_locations: dict[str, str]
+    :param features_list: Codes of the data quality sub-features to be performed.
+    :type features_list: list[str]
+    :param jobs: Number of worker processes. When 1, datasets are evaluated by a thread of this process.
+    :type jobs: int
+    :param queue_depth: Maximum number of datasets waiting in each stage's queue.
+    :type queue_depth: int
+    :param compact: If True, ontologies are parsed into compact triple tables.
+    :type compact: bool
+    :return: Iterator of tuples containing each dataset name, its evaluation results (dictionary mapping each feature
+             code to its table of identified problems) and its metrics.
+    :rtype: Iterator[tuple[str, dict[str, ProblemTable], dict]]
+    """
+
+    datasets_list = sorted(datasets_locations)
+    datasets_list_length = len(datasets_list)
+    number_workers = max(jobs, 1)
+
+    read_queue = queue.Queue(maxsize=queue_depth)
+    results_queue = queue.Queue(maxsize=queue_depth)
+    pipeline_slots = threading.Semaphore(queue_depth + number_workers)
+
+    def read_datasets():
+        """ Reader stage: reads the content of each ontology file, in sorted dataset order. """
+
+        try:
+            for position, dataset_name in enumerate(datasets_list):
+                pipeline_slots.acquire()
+                read_metrics = {}
+                with measure_time(read_metrics, "read_time"):
+                    try:
+                        with open(datasets_locations[dataset_name], "rb") as ontology_file:
+                            ontology_content = ontology_file.read()
+                    except OSError:
+                        # The error is reported when the worker tries to load the file
+                        ontology_content = None
+                read_queue.put((position, dataset_name, ontology_content, read_metrics["read_time"]))
+        finally:
+            for _ in range(number_workers):
+                read_queue.put(None)
+
+    def verify_datasets(executor: ProcessPoolExecutor | None):
+        """ Verification stage: parses and verifies the datasets read, in this thread or in a worker process. """
+
+        while (read_item := read_queue.get()) is not None:
+            position, dataset_name, ontology_content, read_time = read_item
+            arguments = (dataset_name, datasets_locations[dataset_name], features_list, None, ontology_content, compact)
+            try:
+                if executor is None:
+                    dataset_results, dataset_metrics = evaluate_dataset(*arguments)
+                else:
+                    dataset_results, dataset_metrics = executor.submit(evaluate_dataset, *arguments).result()
+                dataset_metrics["read_time"] = read_time
+                results_queue.put((position, dataset_name, dataset_results, dataset_metrics, None))
+            except BaseException as error:
+                results_queue.put((position, dataset_name, None, None, error))
+
+    executor = None
+    if jobs > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker_process,
+                                       initargs=get_worker_settings())
+
+    LOGGER.info(f"Evaluating {datasets_list_length} datasets in a pipeline with {number_workers} worker(s) "
+                f"and queue depth {queue_depth}.")
+
+    # Daemon threads do not prevent the program from finishing if an error is raised in the consumer
+    threading.Thread(target=read_datasets, daemon=True).start()
+    for _ in range(number_workers):
+        threading.Thread(target=verify_datasets, args=(executor,), daemon=True).start()
 
-    if feature_code == "char":
-        problems_list = verify_unwanted_characters(evaluated_ontology)
-    elif feature_code == "ends":
-        problems_list = verify_association_ends(evaluated_ontology)
-    elif feature_code == "gens":
-        problems_list = verify_generalizations_properties(evaluated_ontology)
-    elif feature_code == "ster":
-        problems_list = verify_old_stereotypes(evaluated_ontology)
+    waiting_results = {}
+    next_position = 0
+
+    try:
+        while next_position < datasets_list_length:
+            position, dataset_name, dataset_results, dataset_metrics, error = results_queue.get()
+            if error is not None:
+                raise error
+            waiting_results[position] = (dataset_name, dataset_results, dataset_metrics)
+
+            # Results are yielded in the sorted datasets order, so that output files are identical to a serial run
+            while next_position in waiting_results:
+                dataset_name, dataset_results, dataset_metrics = waiting_results.pop(next_position)
+                yield dataset_name, dataset_results, dataset_metrics
+                pipeline_slots.release()
+                next_position += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def evaluate_datasets(datasets_locations: dict[str, str], features_list: list[str], jobs: int,
+                      catalog_store: CatalogStore = None, queue_depth: int = 0,
+                      compact: bool = False) -> Iterator[tuple[str, dict, dict]]:
+    """ Evaluates all received datasets, serially or in parallel, yielding their results in sorted dataset order.
+
+    :param datasets_locations: Dictionary mapping each dataset name to its ontology.ttl path.
+    :type datasets_locations: dict[str, str]
+    :param features_list: Codes of the data quality sub-features to be performed.
+    :type features_list: list[str]
+    :param jobs: Number of worker processes. When 1, datasets are evaluated serially.
+    :type jobs: int
+    :param catalog_store: Store with the already loaded catalog graphs. When provided, datasets are evaluated serially
+                          over its graphs, as their parsing (the costly step) was already performed by the store.
+    :type catalog_store: CatalogStore
+    :param queue_depth: If greater than 0, datasets are evaluated in a pipeline with queues of this depth.
+    :type queue_depth: int
+    :param compact: If True, ontologies are parsed into compact triple tables (not used with a catalog store).
+    :type compact: bool
+    :return: Iterator of tuples containing each dataset name, its evaluation results (dictionary mapping each feature
+             code to its table of identified problems) and its metrics.
+    :rtype: Iterator[tuple[str, dict[str, ProblemTable], dict]]
+    """
+
+    datasets_list = sorted(datasets_locations)
+    datasets_list_length = len(datasets_list)
+    progress_reporter = ProgressReporter("Evaluating datasets", datasets_list_length, "datasets")
+
+    if catalog_store is not None:
+        for dataset_name in datasets_list:
+            dataset_ontology_location = datasets_locations[dataset_name]
+            dataset_results, dataset_metrics = evaluate_dataset(dataset_name, dataset_ontology_location, features_list,
+                                                                catalog_store.get_graph(dataset_ontology_location))
+            progress_reporter.update(dataset_name, dataset_metrics["triples"])
+            yield dataset_name, dataset_results, dataset_metrics
+    elif queue_depth > 0:
+        for dataset_name, dataset_results, dataset_metrics in evaluate_datasets_pipelined(
+                datasets_locations, features_list, jobs, queue_depth, compact):
+            progress_reporter.update(dataset_name, dataset_metrics["triples"])
+            yield dataset_name, dataset_results, dataset_metrics
+    elif jobs > 1:
+        LOGGER.info(f"Evaluating {datasets_list_length} datasets using {jobs} worker processes.")
+        datasets_results = evaluate_datasets_in_parallel(datasets_locations, features_list, jobs, compact,
+                                                         progress_reporter)
+        # Results are yielded in the sorted datasets order, so that output files are identical to a serial run
+        for dataset_name in datasets_list:
+            yield dataset_name, *datasets_results[dataset_name]
     else:
-        current_function = inspect.stack()[0][3]
-        report_error_end_of_switch("feature_code", current_function)
+        for dataset_name in datasets_list:
+            dataset_results, dataset_metrics = evaluate_dataset(dataset_name, datasets_locations[dataset_name],
+                                                                features_list, compact=compact)
+            progress_reporter.update(dataset_name, dataset_metrics["triples"])
+            yield dataset_name, dataset_results, dataset_metrics
+
+    progress_reporter.finish()
+
+
+def report_dataset_problems(dataset_name: str, dataset_results: dict[str, ProblemTable]) -> None:
+    """ Reports the features in which problems were found for the dataset.
+
+    :param dataset_name: Name of the evaluated dataset.
+    :type dataset_name: str
+    :param dataset_results: Dictionary mapping each feature code to its table of identified problems.
+    :type dataset_results: dict[str, ProblemTable]
+    """
+
+    for feature_code, problems_list in dataset_results.items():
+        num_problem = len(problems_list)
+        if num_problem > 0:
+            LOGGER.warning(f"Dataset {dataset_name} has {num_problem} {feature_code.upper()} case(s).")
+
+
+def run_incremental_verifications(catalog_path: str, datasets_locations: dict[str, str], features_list: list[str],
+                                  jobs: int, results_sink: ResultsSink, catalog_store: CatalogStore = None,
+                                  queue_depth: int = 0, compact: bool = False) -> list[dict]:
+    """ Evaluates only the datasets that were added or changed since the previous incremental execution, reusing the
+    results stored in the manifest for all others. The outputs are then rebuilt from the manifest.
 
-    return problems_list
+    :param catalog_path: Path to the ontouml-models catalog directory.
+    :type catalog_path: str
+    :param datasets_locations: Dictionary mapping each dataset name to its ontology.ttl path.
+    :type datasets_locations: dict[str, str]
+    :param features_list: Codes of the data quality sub-features to be performed.
+    :type features_list: list[str]
+    :param jobs: Number of worker processes. When 1, datasets are evaluated serially.
+    :type jobs: int
+    :param results_sink: Sink in which the results of all datasets are written.
+    :type results_sink: ResultsSink
+    :param catalog_store: Store with the already loaded catalog graphs, or None.
+    :type catalog_store: CatalogStore
+    :param queue_depth: If greater than 0, datasets are evaluated in a pipeline with queues of this depth.
+    :type queue_depth: int
+    :param compact: If True, ontologies are parsed into compact triple tables.
+    :type compact: bool
+    :return: List with the metrics of each evaluated dataset.
+    :rtype: list[dict]
+    """
+
+    datasets_manifest = load_results_manifest(features_list)
+
+    # Removing datasets that no longer exist in the catalog
+    removed_datasets = [dataset_name for dataset_name in datasets_manifest if dataset_name not in datasets_locations]
+    for dataset_name in removed_datasets:
+        del datasets_manifest[dataset_name]
+
+    # Files whose size and modification time did not change since the previous execution are not hashed again
+    changed_files, _, file_index = list_changed_files_with_filetype(os.path.join(catalog_path, "models"), "ttl",
+                                                                    FILE_INDEX_NAME)
+    changed_files = set(changed_files)
 
+    datasets_hashes = {}
+    for dataset_name, dataset_ontology_location in datasets_locations.items():
+        if dataset_name in datasets_manifest and os.path.normpath(dataset_ontology_location) not in changed_files:
+            datasets_hashes[dataset_name] = datasets_manifest[dataset_name]["hash"]
+        else:
+            datasets_hashes[dataset_name] = get_file_hash(dataset_ontology_location)
 
-def run_data_quality_verifications(catalog_path: str):
-    """ Calls every data quality verification features for the catalog.
+    changed_datasets = {dataset_name: dataset_ontology_location
+                        for dataset_name, dataset_ontology_location in datasets_locations.items()
+                        if datasets_manifest.get(dataset_name, {}).get("hash") != datasets_hashes[dataset_name]}
+
+    LOGGER.info(f"Incremental evaluation: {len(changed_datasets)} added or changed dataset(s), "
+                f"{len(removed_datasets)} removed dataset(s), "
+                f"{len(datasets_locations) - len(changed_datasets)} unchanged dataset(s).")
+
+    metrics_list = []
+    for dataset_name, dataset_results, dataset_metrics in evaluate_datasets(changed_datasets, features_list, jobs,
+                                                                            catalog_store, queue_depth, compact):
+        metrics_list.append(dataset_metrics)
+        report_dataset_problems(dataset_name, dataset_results)
+        feature_rows = {}
+        for feature_code, problems_list in dataset_results.items():
+            feature_rows[feature_code] = get_manifest_rows(problems_list.get_rows(dataset_name))
+        datasets_manifest[dataset_name] = {"hash": datasets_hashes[dataset_name], "results": feature_rows}
+
+    # Rebuilding outputs from the manifest's rows
+    for dataset_name in sorted(datasets_manifest):
+        for feature_code in features_list:
+            csv_rows = [[dataset_name] + manifest_row
+                        for manifest_row in datasets_manifest[dataset_name]["results"][feature_code]]
+            results_sink.add_rows(feature_code, csv_rows)
+
+    save_results_manifest(features_list, datasets_manifest)
+    save_file_index(FILE_INDEX_NAME, file_index)
+
+    return metrics_list
+
+
+def run_data_quality_verifications(catalog_path: str, jobs: int = 1, incremental: bool = False,
+                                   output_format: str = "csv", profile: int = 0, catalog_store: CatalogStore = None,
+                                   queue_depth: int = 0, compact: bool = False, features_list: list[str] = None):
+    """ Calls the selected data quality verification features for the catalog.
 
     :param catalog_path: Path to the ontouml-models catalog directory provided by the user as argument.
     :type catalog_path: str
+    :param jobs: Number of worker processes used for evaluating the datasets. When 1, datasets are evaluated serially.
+    :type jobs: int
+    :param incremental: If True, only datasets that changed since the previous incremental execution are evaluated.
+    :type incremental: bool
+    :param output_format: Format of the output files (csv, jsonl, or sqlite).
+    :type output_format: str
+    :param profile: Number of slowest datasets to be evaluated again under cProfile and tracemalloc.
+    :type profile: int
+    :param catalog_store: Store with the already loaded catalog graphs. If None, each dataset is loaded when evaluated.
+    :type catalog_store: CatalogStore
+    :param queue_depth: If greater than 0, reading, evaluation, and writing of the datasets' results are performed
+                        concurrently, in a pipeline with queues of this depth.
+    :type queue_depth: int
+    :param compact: If True, ontologies are parsed into compact triple tables, which use a fraction of the memory.
+    :type compact: bool
+    :param features_list: Codes of the data quality sub-features to be performed. If None, all registered
+                          verifications are performed. Only the index sections they require are built.
+    :type features_list: list[str]
     """
 
-    # Available sub-features
-    features_list = ["char", "ends", "gens", "ster"]
+    if features_list is None:
+        features_list = get_verification_codes()
 
     # If directory 'results_directory' not exists, create it
     results_directory = "results"
@@ -63,27 +420,31 @@ def run_data_quality_verifications(catalog_path: str):
     datasets_list.sort()
     datasets_list_length = len(datasets_list)
 
-    # Creating new csv file with header for each feature
-    for feature_code in features_list:
-        create_output_csv_file(feature_code)
+    datasets_locations = {dataset_name: os.path.join(catalog_path, "models", dataset_name, "ontology.ttl")
+                          for dataset_name in datasets_list}
 
-    for dataset_number, dataset_name in enumerate(datasets_list):
+    with create_results_sink(output_format, features_list) as results_sink:
+        if incremental:
+            metrics_list = run_incremental_verifications(catalog_path, datasets_locations, features_list, jobs,
+                                                         results_sink, catalog_store, queue_depth, compact)
+        else:
+            metrics_list = []
+            for dataset_name, dataset_results, dataset_metrics in evaluate_datasets(datasets_locations, features_list,
+                                                                                    jobs, catalog_store, queue_depth,
+                                                                                    compact):
+                metrics_list.append(dataset_metrics)
+                for feature_code, problems_list in dataset_results.items():
+                    results_sink.add_problems(dataset_name, feature_code, problems_list)
+                report_dataset_problems(dataset_name, dataset_results)
 
-        LOGGER.info(f"Evaluating dataset {dataset_number + 1}/{datasets_list_length}: {dataset_name}")
-
-        dataset_location = catalog_path + "models\\" + dataset_name
-        dataset_ontology_location = dataset_location + "\\ontology.ttl"
-        evaluated_ontology = load_all_graph_safely(dataset_ontology_location)
+    LOGGER.info(f"Evaluation of problems concluded for all {datasets_list_length} datasets. "
+                f"The evaluation results are available in the {output_format} output files.")
 
-        for feature_code in features_list:
-            # Executing verifications
-            problems_list = execute_feature_verification(feature_code, evaluated_ontology)
-            # Registering problems
-            append_problems_output_csv_file(dataset_name, feature_code, problems_list)
-            # Printing message if any problem exists
-            num_problem = len(problems_list)
-            if num_problem > 0:
-                LOGGER.warning(f"Dataset {dataset_name} has {num_problem} {feature_code.upper()} case(s).")
+    if metrics_list:
+        write_metrics_file(metrics_list, METRICS_FILE_PATH)
 
-    LOGGER.info(f"Evaluation of problems concluded for all {datasets_list_length} datasets. "
-                f"The evaluation results are available in the csv files.")
+    for dataset_metrics in get_slowest_items(metrics_list, "total_time", profile):
+        dataset_name = dataset_metrics["dataset"]
+        LOGGER.info(f"Profiling dataset {dataset_name} ({dataset_metrics['total_time']} seconds).")
+        profile_execution(dataset_name, evaluate_dataset, dataset_name, datasets_locations[dataset_name],
+                          features_list, None, None, compact)
@@ -1,103 +1,91 @@
 """ Functions to identify problems in generalization sets. """
-from rdflib import Graph, RDF, URIRef
+from modules.tools.data_quality.model_index import OntoUMLModelIndex, ONTOUML_GENERALIZATION, \
+    ONTOUML_GENERALIZATION_SET
+from modules.tools.data_quality.problem_classes import ProblemGeneralizations, ProblemTable
 
-from modules.tools.data_quality.problem_classes import ProblemGeneralizations
 
-NAMESPACE_ONTOUML = "https://w3id.org/ontouml#"
-
-
-def get_gens_properties_in_names(graph: Graph) -> list[ProblemGeneralizations]:
+def get_gens_properties_in_names(model_index: OntoUMLModelIndex) -> ProblemTable:
     """ Identifies generalization sets that have metaproperties (e.g., disjoint or complete) in their names.
 
-    :param graph: Dataset's ontology to be evaluated.
-    :type graph: Graph
-    :return: List of identified problems.
-    :rtype: list[ProblemGeneralizations]
+    :param model_index: Index of the dataset's ontology to be evaluated.
+    :type model_index: OntoUMLModelIndex
+    :return: Table of identified problems.
+    :rtype: ProblemTable
     """
-    problems_list = []
-
-    # Get all generalizations that have a name and that are not in generalization sets
-    knows_query = """
-            PREFIX ontouml: <https://w3id.org/ontouml#>
-            SELECT DISTINCT ?gen_inst_name ?specific_name ?general_name
-            WHERE {
-                ?gen_inst rdf:type ontouml:Generalization .
-                ?gen_inst ontouml:name ?gen_inst_name .
-                ?gen_inst ontouml:general ?general .
-                ?general ontouml:name ?general_name .
-                ?gen_inst ontouml:specific ?specific .
-                ?specific ontouml:name ?specific_name .
-                FILTER NOT EXISTS {?gs_inst ontouml:generalization ?gen_inst}
-            }"""
-
-    query_answer = graph.query(knows_query)
+    problems_list = ProblemTable(ProblemGeneralizations)
+
+    # Get all distinct combinations of names of generalizations that have a name and that are not in generalization sets
+    gens_rows = {}
+
+    for gen_inst in model_index.get_instances(ONTOUML_GENERALIZATION):
+        if gen_inst in model_index.generalizations_in_sets:
+            continue
+        general_names = [general_name for general in model_index.generals.get(gen_inst, ())
+                         for general_name in model_index.names.get(general, ())]
+        specific_names = [specific_name for specific in model_index.specifics.get(gen_inst, ())
+                          for specific_name in model_index.names.get(specific, ())]
+        for gen_inst_name in model_index.names.get(gen_inst, ()):
+            for specific_name in specific_names:
+                for general_name in general_names:
+                    gens_rows[(gen_inst_name, specific_name, general_name)] = None
 
     substring_list = ["{", "}", "over", "disj", "joint", "compl", "cover"]
 
-    for result in query_answer:
-        if any(map(result.gen_inst_name.__contains__, substring_list)):
-            problems_list.append(
-                ProblemGeneralizations(result.gen_inst_name.value, result.specific_name.value,
-                                       result.general_name.value, "metaproperty in generalization name"))
+    for gen_inst_name, specific_name, general_name in gens_rows:
+        if any(map(gen_inst_name.__contains__, substring_list)):
+            problems_list.add(gen_inst_name.value, specific_name.value, general_name.value,
+                              "metaproperty in generalization name")
 
     return problems_list
 
 
-def get_gens_without_properties(graph: Graph) -> list[ProblemGeneralizations]:
+def get_gens_without_properties(model_index: OntoUMLModelIndex) -> ProblemTable:
     """ Identify generalization sets without metaproperties (i.e., not disjoint and not complete).
 
-    :param graph: Dataset's ontology to be evaluated.
-    :type graph: Graph
-    :return: List of identified problems.
-    :rtype: list[ProblemGeneralizations]
+    :param model_index: Index of the dataset's ontology to be evaluated.
+    :type model_index: OntoUMLModelIndex
+    :return: Table of identified problems.
+    :rtype: ProblemTable
     """
 
-    problems_list = []
+    problems_list = ProblemTable(ProblemGeneralizations)
 
-    knows_query = """
-            PREFIX ontouml: <https://w3id.org/ontouml#>
-            SELECT DISTINCT ?genset_name ?complete ?disjoint
-            WHERE {
-                ?genset_inst rdf:type ontouml:GeneralizationSet .
-                ?genset_inst ontouml:name ?genset_name .
-                ?genset_inst ontouml:isComplete ?complete .
-                ?genset_inst ontouml:isDisjoint ?disjoint .
-            }"""
+    # Get all distinct combinations of names and metaproperties of generalization sets
+    gensets_rows = {}
 
-    query_answer = graph.query(knows_query)
+    for genset_inst in model_index.get_instances(ONTOUML_GENERALIZATION_SET):
+        complete_list = model_index.genset_is_complete.get(genset_inst, ())
+        disjoint_list = model_index.genset_is_disjoint.get(genset_inst, ())
+        for genset_name in model_index.names.get(genset_inst, ()):
+            for complete in complete_list:
+                for disjoint in disjoint_list:
+                    gensets_rows[(genset_name, complete, disjoint)] = None
 
-    for result in query_answer:
-        if not result.complete.toPython() and not result.complete.toPython():
-            problems_list.append(ProblemGeneralizations(result.genset_name.toPython(), "", "",
-                                                        "complete and disjoint are false"))
+    for genset_name, complete, disjoint in gensets_rows:
+        if not complete.toPython() and not complete.toPython():
+            problems_list.add(genset_name.toPython(), "", "", "complete and disjoint are false")
 
     return problems_list
 
 
-def get_insuficient_gens(graph: Graph) -> list[ProblemGeneralizations]:
+def get_insuficient_gens(model_index: OntoUMLModelIndex) -> ProblemTable:
     """ Identify generalization sets with zero or one specialization.
 
-    :param graph: Dataset's ontology to be evaluated.
-    :type graph: Graph
-    :return: List of identified problems.
-    :rtype: list[ProblemGeneralizations]
+    :param model_index: Index of the dataset's ontology to be evaluated.
+    :type model_index: OntoUMLModelIndex
+    :return: Table of identified problems.
+    :rtype: ProblemTable
     """
 
-    problems_list = []
-
-    graph.bind("ontouml", NAMESPACE_ONTOUML)
-
-    for genset in graph.subjects(RDF.type, URIRef(NAMESPACE_ONTOUML + "GeneralizationSet")):
+    problems_list = ProblemTable(ProblemGeneralizations)
 
-        num_generalizations = 0
+    for genset in model_index.instances.get(ONTOUML_GENERALIZATION_SET, ()):
 
-        for gen in graph.objects(genset, URIRef(NAMESPACE_ONTOUML + "generalization")):
-            num_generalizations += 1
+        num_generalizations = len(model_index.genset_generalizations.get(genset, ()))
 
         if num_generalizations <= 1:
-            genset_name = graph.value(subject=genset, predicate=URIRef(NAMESPACE_ONTOUML + "name"))
-            problems_list.append(
-                ProblemGeneralizations(genset_name.toPython(), f"has only {num_generalizations} generalizations", "",
-                                       "generalization set with less than two generalizations"))
+            genset_name = model_index.names.get(genset, [None])[0]
+            problems_list.add(genset_name.toPython(), f"has only {num_generalizations} generalizations", "",
+                              "generalization set with less than two generalizations")
 
     return problems_list
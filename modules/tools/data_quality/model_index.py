@@ -0,0 +1,98 @@
+""" In-memory index of the OntoUML elements of a dataset's ontology, shared by all data quality verifications. """
+from rdflib import RDF, URIRef, Graph
+
+NAMESPACE_ONTOUML = "https://w3id.org/ontouml#"
+
+ONTOUML_CLASS = URIRef(NAMESPACE_ONTOUML + "Class")
+ONTOUML_GENERALIZATION = URIRef(NAMESPACE_ONTOUML + "Generalization")
+ONTOUML_GENERALIZATION_SET = URIRef(NAMESPACE_ONTOUML + "GeneralizationSet")
+
+# Sections of the index that can be built independently
+INDEX_SECTIONS = ["types", "names", "stereotypes", "relations", "generalizations"]
+
+
+def get_objects_by_subject(graph: Graph, predicate: URIRef) -> dict:
+    """ Returns a dictionary mapping each subject to the list of objects it has for the received predicate.
+
+    :param graph: Graph from which the triples are read.
+    :type graph: Graph
+    :param predicate: Predicate of the triples to be indexed.
+    :type predicate: URIRef
+    :return: Dictionary mapping subjects to lists of objects, both in the order of the graph's triples.
+    :rtype: dict
+    """
+
+    objects_by_subject = {}
+
+    for subj, _, obj in graph.triples((None, predicate, None)):
+        objects_by_subject.setdefault(subj, []).append(obj)
+
+    return objects_by_subject
+
+
+class OntoUMLModelIndex(object):
+    """ Dictionaries of classes, names, stereotypes, relation ends, generalizations, and generalization sets of a graph.
+    Built once per graph, reading only the triples of the indexed predicates, so that verifications can use direct
+    lookups instead of querying the graph.
+
+    The index is divided into the sections in INDEX_SECTIONS and only the received sections are built, so that
+    verifications that do not need, e.g., relations or generalizations, do not pay for their indexing. The
+    dictionaries of sections that are not built are left empty.
+    """
+
+    def __init__(self, graph: Graph, index_sections: set[str] = None):
+
+        if index_sections is None:
+            index_sections = set(INDEX_SECTIONS)
+
+        self.type_pairs = []
+        self.instances = {}
+        self.names = {}
+        self.stereotypes = {}
+        self.property_types = {}
+        self.relation_ends = {}
+        self.end_relations = {}
+        self.generals = {}
+        self.specifics = {}
+        self.genset_generalizations = {}
+        self.genset_is_complete = {}
+        self.genset_is_disjoint = {}
+        self.generalizations_in_sets = set()
+
+        if "types" in index_sections:
+            # List of (instance, type) pairs, in the order of the graph's rdf:type triples
+            self.type_pairs = [(subj, obj) for subj, _, obj in graph.triples((None, RDF.type, None))]
+
+            # Type to list of instances
+            for subj, obj in self.type_pairs:
+                self.instances.setdefault(obj, []).append(subj)
+
+        # Element to list of values
+        if "names" in index_sections:
+            self.names = get_objects_by_subject(graph, URIRef(NAMESPACE_ONTOUML + "name"))
+        if "stereotypes" in index_sections:
+            self.stereotypes = get_objects_by_subject(graph, URIRef(NAMESPACE_ONTOUML + "stereotype"))
+
+        # Relations and their ends
+        if "relations" in index_sections:
+            self.property_types = get_objects_by_subject(graph, URIRef(NAMESPACE_ONTOUML + "propertyType"))
+            self.relation_ends = get_objects_by_subject(graph, URIRef(NAMESPACE_ONTOUML + "relationEnd"))
+            for relation, ends_list in self.relation_ends.items():
+                for relation_end in ends_list:
+                    self.end_relations.setdefault(relation_end, []).append(relation)
+
+        # Generalizations and generalization sets
+        if "generalizations" in index_sections:
+            self.generals = get_objects_by_subject(graph, URIRef(NAMESPACE_ONTOUML + "general"))
+            self.specifics = get_objects_by_subject(graph, URIRef(NAMESPACE_ONTOUML + "specific"))
+            self.genset_generalizations = get_objects_by_subject(graph, URIRef(NAMESPACE_ONTOUML + "generalization"))
+            self.genset_is_complete = get_objects_by_subject(graph, URIRef(NAMESPACE_ONTOUML + "isComplete"))
+            self.genset_is_disjoint = get_objects_by_subject(graph, URIRef(NAMESPACE_ONTOUML + "isDisjoint"))
+            self.generalizations_in_sets = {generalization
+                                            for generalizations_list in self.genset_generalizations.values()
+                                            for generalization in generalizations_list}
+
+    def get_instances(self, type_uri: URIRef) -> list:
+        """ Returns the distinct instances of the received type, in the order of the graph's rdf:type triples. """
+
+        return list(dict.fromkeys(self.instances.get(type_uri, ())))
@@ -1,44 +1,102 @@
 """ Definition of classes for storing different types of problems identified in each data quality sub-feature. """
+from itertools import repeat
+from typing import Iterable, Iterator
 
 
 class DataQualityProblemClass(object):
-    """ Main class to identify problems for each feature. Used for type hinting. """
-    pass
+    """ Main class to identify problems for each feature. Used for type hinting.
+
+    Problem classes are not instantiated, as problems are stored in a ProblemTable. They only declare the names of the
+    corresponding output columns (without the dataset column) in columns, in the order of the values of each problem.
+    """
+
+    columns = ()
 
 
 class ProblemChar(DataQualityProblemClass):
     """ Class that contains information about problems found in evaluations for characters. """
 
-    def __init__(self, instance_name, type_name, description):
-        self.instance = instance_name
-        self.type = type_name
-        self.description = description
+    columns = ("instance", "type", "problem")
 
 
 class ProblemEnds(DataQualityProblemClass):
     """ Class that contains information about problems found in evaluations for association ends. """
 
-    def __init__(self, related_class, relation_name, end_name, description):
-        self.related_class = related_class
-        self.relation_name = relation_name
-        self.end_name = end_name
-        self.description = description
+    columns = ("related_class", "relation_name", "end_value", "problem")
 
 
 class ProblemGeneralizations(DataQualityProblemClass):
     """ Class that contains information about problems found in generalizations. """
 
-    def __init__(self, generalization_name, specific_name, general_name, description):
-        self.generalization_name = generalization_name
-        self.specific_name = specific_name
-        self.general_name = general_name
-        self.description = description
+    columns = ("generalization_name", "specific_name", "general_name", "problem")
 
 
 class ProblemOldStereotypes(DataQualityProblemClass):
     """ Class that contains information about problems found in generalizations. """
 
-    def __init__(self, class_name, old_stereotype, new_stereotype):
-        self.class_name = class_name
-        self.old_stereotype = old_stereotype
-        self.new_stereotype = new_stereotype
+    columns = ("class_name", "old_stereotype", "new_stereotype")
+
+
+class ProblemTable(object):
+    """ Columnar buffer of the problems of a single type, in which each of the problem class's columns is kept as a
+    list of values. Verifications add the values of their problems directly to the table, so no object is created per
+    problem, and outputs obtain the rows of all problems at once with get_rows.
+
+    Attributes:
+        problem_class: Problem class whose columns are stored in the table.
+        columns: List with the values of each column, in the order of the problem class's columns.
+    """
+
+    def __init__(self, problem_class: type[DataQualityProblemClass]):
+        self.problem_class = problem_class
+        self.columns = [[] for _ in problem_class.columns]
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    def __iter__(self) -> Iterator[tuple]:
+        """ Yields the values of each problem, as tuples in the order of the columns. """
+
+        return zip(*self.columns)
+
+    def add(self, *values) -> None:
+        """ Adds a problem, receiving one value per column. """
+
+        if len(values) != len(self.columns):
+            raise ValueError(f"{self.problem_class.__name__} problems have {len(self.columns)} values, "
+                             f"not {len(values)}.")
+
+        for column, value in zip(self.columns, values):
+            column.append(value)
+
+    def extend(self, problems_values: Iterable[tuple]) -> None:
+        """ Adds a batch of problems, received as another table of the same problem class or as tuples with one value
+        per column. The batch is checked before any problem is added, so an invalid batch does not leave the columns
+        with different lengths. """
+
+        if isinstance(problems_values, ProblemTable):
+            if problems_values.problem_class is not self.problem_class:
+                raise ValueError(f"Table of {problems_values.problem_class.__name__} problems cannot extend a table of "
+                                 f"{self.problem_class.__name__} problems.")
+            columns_values = problems_values.columns
+        else:
+            problems_values = list(problems_values)
+            for values in problems_values:
+                if len(values) != len(self.columns):
+                    raise ValueError(f"{self.problem_class.__name__} problems have {len(self.columns)} values, "
+                                     f"not {len(values)}.")
+            columns_values = zip(*problems_values)
+
+        for column, column_values in zip(self.columns, columns_values):
+            column.extend(column_values)
+
+    def get_rows(self, dataset_name: str) -> list[tuple]:
+        """ Returns the output rows of all problems in the table, which start with the dataset's name.
+
+        :param dataset_name: Dataset in which the problems were identified.
+        :type dataset_name: str
+        :return: List of rows in the order of the output columns.
+        :rtype: list[tuple]
+        """
+
+        return list(zip(repeat(dataset_name, len(self)), *self.columns))
@@ -0,0 +1,81 @@
+""" Manifest of previous data quality evaluations, used for re-evaluating only the datasets that changed. """
+import json
+import os
+
+from modules.logger_config import initialize_logger
+from modules.tools.data_quality.results_file import get_normalized_row
+from modules.tools.data_quality.verification_registry import get_verifications_hash
+from modules.utils.error_treatment import report_error_io_write
+
+LOGGER = initialize_logger()
+
+MANIFEST_FILE_PATH = "results/data_quality_manifest.json"
+
+
+def load_results_manifest(features_list: list[str]) -> dict:
+    """ Loads the manifest generated by the previous incremental execution.
+    An empty manifest is returned if there is no previous manifest, if it cannot be read, or if it was generated for
+    a different list of features or by other versions of the verifications.
+
+    :param features_list: Codes of the data quality sub-features being performed.
+    :type features_list: list[str]
+    :return: Dictionary mapping each dataset name to its ontology hash and its csv rows for each feature.
+    :rtype: dict
+    """
+
+    if not os.path.exists(MANIFEST_FILE_PATH):
+        LOGGER.info("No previous data quality manifest found. All datasets are going to be evaluated.")
+        return {}
+
+    try:
+        with open(MANIFEST_FILE_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as error:
+        LOGGER.warning(f"Could not read the data quality manifest {MANIFEST_FILE_PATH}. "
+                       f"All datasets are going to be evaluated. System error reported: {error}")
+        return {}
+
+    if manifest.get("features") != features_list:
+        LOGGER.info("Data quality manifest was generated for different features. "
+                    "All datasets are going to be evaluated.")
+        return {}
+
+    if manifest.get("verifications") != get_verifications_hash(features_list):
+        LOGGER.info("Data quality manifest was generated by other versions of the verifications. "
+                    "All datasets are going to be evaluated.")
+        return {}
+
+    return manifest["datasets"]
+
+
+def save_results_manifest(features_list: list[str], datasets_manifest: dict) -> None:
+    """ Saves the manifest to be used by the next incremental execution.
+
+    :param features_list: Codes of the data quality sub-features performed.
+    :type features_list: list[str]
+    :param datasets_manifest: Dictionary mapping each dataset name to its ontology hash and its csv rows.
+    :type datasets_manifest: dict
+    """
+
+    manifest = {"features": features_list, "verifications": get_verifications_hash(features_list),
+                "datasets": datasets_manifest}
+
+    try:
+        with open(MANIFEST_FILE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        LOGGER.debug(f"Data quality manifest {MANIFEST_FILE_PATH} successfully saved.")
+    except OSError as error:
+        report_error_io_write(MANIFEST_FILE_PATH, "data quality manifest", error)
+
+
+def get_manifest_rows(csv_rows: list) -> list[list[str]]:
+    """ Converts csv rows to the format stored in the manifest. The dataset column is removed and values are converted
+    to strings the same way the csv writer does, so that rebuilt csv files are identical to the original ones.
+
+    :param csv_rows: List of rows in the format returned by ProblemTable.get_rows.
+    :type csv_rows: list
+    :return: List of rows without the dataset column.
+    :rtype: list[list[str]]
+    """
+
+    return [get_normalized_row(csv_row)[1:] for csv_row in csv_rows]
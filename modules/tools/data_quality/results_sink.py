@@ -0,0 +1,205 @@
+""" Buffered sinks that write the data quality results in CSV, JSON Lines, or SQLite format. """
+import csv
+import inspect
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+from modules.logger_config import initialize_logger
+from modules.tools.data_quality.problem_classes import ProblemTable
+from modules.tools.data_quality.results_file import get_csv_header, get_normalized_row
+from modules.utils.error_treatment import report_error_io_write, report_error_end_of_switch
+
+LOGGER = initialize_logger()
+
+RESULTS_DIRECTORY = "results"
+OUTPUT_FORMATS = ["csv", "jsonl", "sqlite"]
+
+
+class ResultsSink(ABC):
+    """ Main class for results sinks. Outputs are kept open during the whole execution and rows are buffered, being
+    written only when the buffer of their feature is full or when the sink is flushed or closed.
+    All public methods are thread-safe. Rows produced by worker processes must be sent to the process that owns the
+    sink, which is the only one writing to the outputs.
+    """
+
+    def __init__(self, features_list: list[str], buffer_size: int = 1000):
+        self.features_list = features_list
+        self.buffer_size = buffer_size
+        self.buffers = {feature_code: [] for feature_code in features_list}
+        self.lock = threading.Lock()
+        self.open_outputs()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_problems(self, dataset_name: str, feature_code: str, problems_table: ProblemTable):
+        """ Adds the problems identified for the dataset in the selected feature. """
+
+        self.add_rows(feature_code, problems_table.get_rows(dataset_name))
+
+    def add_rows(self, feature_code: str, csv_rows: list):
+        """ Adds rows in the format returned by ProblemTable.get_rows to the selected feature's output. """
+
+        with self.lock:
+            feature_buffer = self.buffers[feature_code]
+            feature_buffer.extend(csv_rows)
+            if len(feature_buffer) >= self.buffer_size:
+                self.write_buffer(feature_code)
+
+    def flush(self):
+        """ Writes all buffered rows to the outputs. """
+
+        with self.lock:
+            for feature_code in self.features_list:
+                self.write_buffer(feature_code)
+
+    def close(self):
+        """ Writes all buffered rows and closes the outputs. """
+
+        self.flush()
+        with self.lock:
+            self.close_outputs()
+
+    def write_buffer(self, feature_code: str):
+        """ Writes and empties the buffer of the feature. Must be called with the lock acquired. """
+
+        feature_buffer = self.buffers[feature_code]
+        if feature_buffer:
+            try:
+                self.write_rows(feature_code, feature_buffer)
+            except (OSError, sqlite3.Error) as error:
+                report_error_io_write(self.get_output_path(feature_code), f"output for {feature_code} feature", error)
+            self.buffers[feature_code] = []
+
+    @abstractmethod
+    def get_output_path(self, feature_code: str) -> str:
+        """ Returns the path of the output file in which the feature's results are written. """
+
+    @abstractmethod
+    def open_outputs(self):
+        """ Creates the outputs, overwriting the ones of previous executions. """
+
+    @abstractmethod
+    def write_rows(self, feature_code: str, csv_rows: list):
+        """ Writes the rows to the feature's output. """
+
+    @abstractmethod
+    def close_outputs(self):
+        """ Closes all outputs. """
+
+
+class CsvResultsSink(ResultsSink):
+    """ Writes one results_<feature>.csv file per feature. """
+
+    def get_output_path(self, feature_code: str) -> str:
+        return os.path.join(RESULTS_DIRECTORY, f"results_{feature_code}.csv")
+
+    def open_outputs(self):
+        self.files = {}
+        self.writers = {}
+        for feature_code in self.features_list:
+            csv_file_path = self.get_output_path(feature_code)
+            try:
+                self.files[feature_code] = open(csv_file_path, 'w', encoding='utf-8', newline='')
+            except OSError as error:
+                report_error_io_write(csv_file_path, f"csv output file for {feature_code} feature", error)
+            self.writers[feature_code] = csv.writer(self.files[feature_code])
+            self.writers[feature_code].writerow(get_csv_header(feature_code))
+            LOGGER.debug(f"CSV output file {csv_file_path} successfully created.")
+
+    def write_rows(self, feature_code: str, csv_rows: list):
+        self.writers[feature_code].writerows(csv_rows)
+
+    def close_outputs(self):
+        for output_file in self.files.values():
+            output_file.close()
+
+
+class JsonlResultsSink(ResultsSink):
+    """ Writes one results_<feature>.jsonl file per feature, with one JSON object per problem. """
+
+    def get_output_path(self, feature_code: str) -> str:
+        return os.path.join(RESULTS_DIRECTORY, f"results_{feature_code}.jsonl")
+
+    def open_outputs(self):
+        self.files = {}
+        for feature_code in self.features_list:
+            jsonl_file_path = self.get_output_path(feature_code)
+            try:
+                self.files[feature_code] = open(jsonl_file_path, 'w', encoding='utf-8')
+            except OSError as error:
+                report_error_io_write(jsonl_file_path, f"jsonl output file for {feature_code} feature", error)
+            LOGGER.debug(f"JSON Lines output file {jsonl_file_path} successfully created.")
+
+    def write_rows(self, feature_code: str, csv_rows: list):
+        header = get_csv_header(feature_code)
+        self.files[feature_code].writelines(
+            json.dumps(dict(zip(header, get_normalized_row(csv_row))), ensure_ascii=False) + "\n"
+            for csv_row in csv_rows)
+
+    def close_outputs(self):
+        for output_file in self.files.values():
+            output_file.close()
+
+
+class SqliteResultsSink(ResultsSink):
+    """ Writes a single results.sqlite file, with one table per feature indexed by dataset. """
+
+    def get_output_path(self, feature_code: str) -> str:
+        return os.path.join(RESULTS_DIRECTORY, "results.sqlite")
+
+    def open_outputs(self):
+        sqlite_file_path = self.get_output_path("")
+        try:
+            if os.path.exists(sqlite_file_path):
+                os.remove(sqlite_file_path)
+            # The connection is used by any thread that flushes the buffers, always with the lock acquired
+            self.connection = sqlite3.connect(sqlite_file_path, check_same_thread=False)
+            for feature_code in self.features_list:
+                columns = ", ".join(f"{column} TEXT" for column in get_csv_header(feature_code))
+                self.connection.execute(f"CREATE TABLE results_{feature_code} ({columns})")
+                self.connection.execute(f"CREATE INDEX results_{feature_code}_dataset "
+                                        f"ON results_{feature_code} (dataset)")
+            self.connection.commit()
+        except (OSError, sqlite3.Error) as error:
+            report_error_io_write(sqlite_file_path, "sqlite output file", error)
+        LOGGER.debug(f"SQLite output file {sqlite_file_path} successfully created.")
+
+    def write_rows(self, feature_code: str, csv_rows: list):
+        placeholders = ", ".join("?" for _ in get_csv_header(feature_code))
+        self.connection.executemany(f"INSERT INTO results_{feature_code} VALUES ({placeholders})",
+                                    (get_normalized_row(csv_row) for csv_row in csv_rows))
+        self.connection.commit()
+
+    def close_outputs(self):
+        self.connection.close()
+
+
+def create_results_sink(output_format: str, features_list: list[str]) -> ResultsSink:
+    """ Returns a new results sink for the received output format.
+
+    :param output_format: Output format. One of the values in OUTPUT_FORMATS.
+    :type output_format: str
+    :param features_list: Codes of the data quality sub-features whose results are going to be written.
+    :type features_list: list[str]
+    :return: Results sink with all its outputs created.
+    :rtype: ResultsSink
+    """
+
+    if output_format == "csv":
+        results_sink = CsvResultsSink(features_list)
+    elif output_format == "jsonl":
+        results_sink = JsonlResultsSink(features_list)
+    elif output_format == "sqlite":
+        results_sink = SqliteResultsSink(features_list)
+    else:
+        current_function = inspect.stack()[0][3]
+        report_error_end_of_switch("output_format", current_function)
+
+    return results_sink
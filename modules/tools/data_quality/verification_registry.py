@@ -0,0 +1,122 @@
+""" Registry of the data quality verifications, declaring for each one its code, its output schema, and the sections of
+the model index it requires. """
+import hashlib
+import inspect
+from typing import Callable
+
+from modules.tools.data_quality.catalog_verifications import verify_unwanted_characters, verify_association_ends, \
+    verify_generalizations_properties, verify_old_stereotypes
+from modules.tools.data_quality.model_index import OntoUMLModelIndex
+from modules.tools.data_quality.problem_classes import DataQualityProblemClass, ProblemChar, ProblemEnds, \
+    ProblemGeneralizations, ProblemOldStereotypes, ProblemTable
+from modules.utils.error_treatment import report_error_end_of_switch
+
+
+class Verification(object):
+    """ Data quality verification (sub-feature) registered in VERIFICATIONS.
+
+    Attributes:
+        code: Code of the verification, used in the command line and in the output files' names.
+        function: Function that receives an OntoUMLModelIndex and returns the table of identified problems.
+        problem_class: Class of the identified problems, which declares the output columns.
+        index_sections: Sections of the model index (see INDEX_SECTIONS) read by the function.
+        description: Short description of the verification.
+    """
+
+    def __init__(self, code: str, function: Callable[[OntoUMLModelIndex], ProblemTable],
+                 problem_class: type[DataQualityProblemClass], index_sections: set[str], description: str):
+        self.code = code
+        self.function = function
+        self.problem_class = problem_class
+        self.index_sections = index_sections
+        self.description = description
+
+    def get_csv_header(self) -> list[str]:
+        """ Returns the header of the verification's output files, whose first column is the dataset. """
+
+        return ["dataset", *self.problem_class.columns]
+
+
+# Registered verifications, in the order in which they are executed
+VERIFICATIONS = {}
+
+
+def register_verification(verification: Verification) -> None:
+    """ Adds the verification to the registry, making it selectable in the command line. """
+
+    VERIFICATIONS[verification.code] = verification
+
+
+def get_verification(feature_code: str) -> Verification:
+    """ Returns the registered verification with the received code.
+
+    :param feature_code: Code of the data quality sub-feature.
+    :type feature_code: str
+    :return: Registered verification.
+    :rtype: Verification
+    """
+
+    if feature_code not in VERIFICATIONS:
+        current_function = inspect.stack()[0][3]
+        report_error_end_of_switch("feature_code", current_function)
+
+    return VERIFICATIONS[feature_code]
+
+
+def get_verification_codes() -> list[str]:
+    """ Returns the codes of all registered verifications, in execution order. """
+
+    return list(VERIFICATIONS)
+
+
+def get_verifications_hash(features_list: list[str]) -> str:
+    """ Returns a hash of the received verifications, which changes whenever their registered settings or the source
+    code of the data quality modules they use change, so that results obtained with other versions are not reused.
+
+    :param features_list: Codes of the data quality sub-features to be performed.
+    :type features_list: list[str]
+    :return: Hexadecimal digest identifying the verifications' implementation.
+    :rtype: str
+    """
+
+    verifications_hash = hashlib.sha256()
+    used_modules = {inspect.getmodule(get_verification), inspect.getmodule(OntoUMLModelIndex)}
+
+    for feature_code in features_list:
+        verification = get_verification(feature_code)
+        verifications_hash.update(f"{feature_code}\n{verification.problem_class.columns}\n"
+                                  f"{sorted(verification.index_sections)}\n".encode("utf-8"))
+        function_module = inspect.getmodule(verification.function)
+        used_modules.update({function_module, inspect.getmodule(verification.problem_class)})
+        # Modules of the data quality package from which the verification's module imports helpers
+        used_modules.update(inspect.getmodule(member) for member in vars(function_module).values()
+                            if (inspect.isfunction(member) or inspect.isclass(member))
+                            and member.__module__.startswith(__package__))
+
+    for used_module in sorted(used_modules, key=lambda module: module.__name__):
+        verifications_hash.update(inspect.getsource(used_module).encode("utf-8"))
+
+    return verifications_hash.hexdigest()
+
+
+def get_required_index_sections(features_list: list[str]) -> set[str]:
+    """ Returns the sections of the model index required by at least one of the received verifications.
+
+    :param features_list: Codes of the data quality sub-features to be performed.
+    :type features_list: list[str]
+    :return: Set with the names of the required index sections.
+    :rtype: set[str]
+    """
+
+    return {index_section for feature_code in features_list
+            for index_section in get_verification(feature_code).index_sections}
+
+
+register_verification(Verification("char", verify_unwanted_characters, ProblemChar, {"types", "names"},
+                                   "unwanted characters in names"))
+register_verification(Verification("ends", verify_association_ends, ProblemEnds, {"names", "relations"},
+                                   "possible multiplicities in association end names"))
+register_verification(Verification("gens", verify_generalizations_properties, ProblemGeneralizations,
+                                   {"types", "names", "generalizations"}, "generalization sets' meta-properties"))
+register_verification(Verification("ster", verify_old_stereotypes, ProblemOldStereotypes,
+                                   {"types", "names", "stereotypes"}, "outdated stereotypes"))
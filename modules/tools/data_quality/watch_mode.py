@@ -0,0 +1,500 @@
+""" Resident data quality mode. The parsed graphs and indexes of all datasets are kept in memory, the catalog is watched
+for changes, only the datasets whose ontologies changed are verified again, and the results are served through a local
+HTTP endpoint that can be queried by editor tooling. """
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from modules.logger_config import initialize_logger
+from modules.tools.data_quality.data_quality import execute_feature_verification
+from modules.tools.data_quality.model_index import OntoUMLModelIndex
+from modules.tools.data_quality.problem_classes import ProblemTable
+from modules.tools.data_quality.results_file import create_directory_if_not_exists, get_csv_header, \
+    get_normalized_row
+from modules.tools.data_quality.results_sink import create_results_sink
+from modules.tools.data_quality.verification_registry import get_verification, get_verification_codes
+from modules.utils.compact_graph import load_compact_table_safely
+from modules.utils.utils_general import get_list_unhidden_directories
+from modules.utils.utils_rdf import load_all_graph_safely
+
+# Optional dependency, only available on Linux. The catalog is polled when it is not installed.
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+LOGGER = initialize_logger()
+
+# Interval in seconds of the full rescans performed when changes are notified by inotify, in case events are lost
+INOTIFY_RESCAN_INTERVAL = 5
+
+# Time in seconds during which further inotify events are collected after the first one, coalescing multiple writes
+INOTIFY_DEBOUNCE_TIME = 0.05
+
+# Maximum time in seconds a request waits for a new generation of results
+MAX_WAIT_TIME = 30
+
+
+class DatasetState(object):
+    """ In-memory state of a dataset in the watch mode.
+
+    Attributes:
+        file_state: Size and modification time of the ontology.ttl file when it was verified.
+        graph: Parsed graph (or compact triple table) of the dataset's ontology, or None if it could not be parsed.
+        model_index: Index of the graph with all sections, so that any registered verification can be executed.
+        results: Maps the code of each executed verification to its table of identified problems.
+        error: Description of the error raised when loading the ontology, or None.
+        verification_time: Time in seconds spent loading, indexing, and verifying the dataset.
+    """
+
+    def __init__(self, file_state: tuple[int, int]):
+        self.file_state = file_state
+        self.graph = None
+        self.model_index = None
+        self.results = {}
+        self.error = None
+        self.verification_time = 0.0
+
+
+class PollingMonitor(object):
+    """ Waits for changes in the catalog by sleeping for the poll interval, after which the catalog is scanned. """
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+
+    def update_watches(self, directories_paths: list[str]) -> None:
+        """ Polling does not require registering the watched directories. """
+        pass
+
+    def wait(self) -> None:
+        """ Returns when the catalog must be scanned again. """
+
+        time.sleep(self.poll_interval)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyMonitor(object):
+    """ Waits for changes in the catalog using Linux's inotify, through the inotify_simple package. Events only wake up
+    the watcher, which then determines the changed datasets by scanning the catalog, so lost or coalesced events do not
+    cause changes to be missed. """
+
+    def __init__(self, models_path: str):
+        self.inotify = inotify_simple.INotify()
+        self.watch_flags = inotify_simple.flags.CLOSE_WRITE | inotify_simple.flags.MOVED_TO | \
+                           inotify_simple.flags.MOVED_FROM | inotify_simple.flags.CREATE | inotify_simple.flags.DELETE
+        self.watched_directories = {}
+        self.update_watches([models_path])
+
+    def update_watches(self, directories_paths: list[str]) -> None:
+        """ Starts watching the received directories, if not already watched. """
+
+        for directory_path in directories_paths:
+            if directory_path not in self.watched_directories:
+                try:
+                    self.watched_directories[directory_path] = self.inotify.add_watch(directory_path, self.watch_flags)
+                except OSError as error:
+                    LOGGER.debug(f"Could not watch directory {directory_path}. System error reported: {error}")
+
+    def wait(self) -> None:
+        """ Returns when a change is notified (after collecting the events of the following writes) or after the
+        rescan interval. """
+
+        events = self.inotify.read(timeout=INOTIFY_RESCAN_INTERVAL * 1000)
+        while events:
+            # Watches of removed directories are discarded by the kernel, so they can be watched again if recreated
+            removed_descriptors = {event.wd for event in events if event.mask & inotify_simple.flags.IGNORED}
+            if removed_descriptors:
+                self.watched_directories = {directory_path: descriptor
+                                            for directory_path, descriptor in self.watched_directories.items()
+                                            if descriptor not in removed_descriptors}
+            events = self.inotify.read(timeout=INOTIFY_DEBOUNCE_TIME * 1000)
+
+    def close(self) -> None:
+        self.inotify.close()
+
+
+class DataQualityWatcher(object):
+    """ Keeps the data quality state of all datasets of the catalog in memory, updating it when their ontology.ttl
+    files change. All public methods are thread-safe, so the state can be queried while it is updated.
+
+    Attributes:
+        models_path: Path of the catalog's models directory.
+        features_list: Codes of the verifications executed for every dataset and written to the output files.
+        output_format: Format of the output files (csv, jsonl, or sqlite).
+        compact: If True, ontologies are parsed into compact triple tables.
+        datasets: Maps each dataset name to its DatasetState.
+        generation: Number of refreshes that changed the results, used by clients to detect updates.
+        last_refresh: Time of the last refresh that changed the results.
+        catalog_error: Description of the error raised when scanning the models directory, or None.
+    """
+
+    def __init__(self, catalog_path: str, features_list: list[str], output_format: str = "csv",
+                 compact: bool = False):
+        self.models_path = os.path.normpath(os.path.join(catalog_path, "models"))
+        self.features_list = features_list
+        self.output_format = output_format
+        self.compact = compact
+        self.datasets = {}
+        self.generation = 0
+        self.last_refresh = None
+        self.catalog_error = None
+        self.condition = threading.Condition()
+
+    def get_ontology_path(self, dataset_name: str) -> str:
+        """ Returns the path of the dataset's ontology.ttl file. """
+
+        return os.path.join(self.models_path, dataset_name, "ontology.ttl")
+
+    def get_datasets_names(self) -> list[str] | None:
+        """ Returns the names of the catalog's datasets, or None if the models directory cannot be read (e.g., while the
+        catalog is being checked out). The error is recorded in the watcher's status instead of stopping the watcher.
+        """
+
+        try:
+            datasets_names = get_list_unhidden_directories(self.models_path)
+            catalog_error = None
+        except (OSError, SystemExit) as error:
+            datasets_names = None
+            catalog_error = f"Models directory {self.models_path} could not be read."
+            if isinstance(error, OSError):
+                catalog_error += f" System error reported: {error}"
+
+        with self.condition:
+            if catalog_error is not None and catalog_error != self.catalog_error:
+                LOGGER.warning(f"{catalog_error} Previous results are kept until it is available again.")
+            self.catalog_error = catalog_error
+
+        return datasets_names
+
+    def get_file_states(self) -> dict[str, tuple[int, int]] | None:
+        """ Returns the size and modification time of the ontology.ttl file of each dataset in the catalog, or None if
+        the models directory cannot be read. """
+
+        datasets_names = self.get_datasets_names()
+        if datasets_names is None:
+            return None
+
+        file_states = {}
+
+        for dataset_name in datasets_names:
+            try:
+                file_stat = os.stat(self.get_ontology_path(dataset_name))
+            except OSError:
+                continue
+            file_states[dataset_name] = (file_stat.st_size, file_stat.st_mtime_ns)
+
+        return file_states
+
+    def verify_dataset(self, dataset_name: str, file_state: tuple[int, int]) -> DatasetState:
+        """ Loads, indexes, and verifies the dataset's ontology. Errors raised when loading it (e.g., a file being
+        written by an editor) are recorded in the returned state instead of being raised.
+
+        :param dataset_name: Name of the dataset to be verified.
+        :type dataset_name: str
+        :param file_state: Size and modification time of the dataset's ontology.ttl file.
+        :type file_state: tuple[int, int]
+        :return: New state of the dataset.
+        :rtype: DatasetState
+        """
+
+        dataset_state = DatasetState(file_state)
+        ontology_location = self.get_ontology_path(dataset_name)
+        start_time = time.perf_counter()
+
+        try:
+            with open(ontology_location, "rb") as ontology_file:
+                ontology_content = ontology_file.read()
+            if self.compact:
+                dataset_state.graph = load_compact_table_safely(ontology_location, ontology_content)
+            else:
+                dataset_state.graph = load_all_graph_safely(ontology_location, ontology_content=ontology_content)
+        except Exception as error:
+            dataset_state.error = f"{type(error).__name__}: {error}"
+        except SystemExit:
+            # The loaders exit when a file cannot be read (reporting the system error), which must not stop the watcher
+            dataset_state.error = "Ontology could not be read. See the log for the reported error."
+
+        if dataset_state.error is not None:
+            LOGGER.warning(f"Could not load the ontology of dataset {dataset_name}. {dataset_state.error}")
+            return dataset_state
+
+        dataset_state.model_index = OntoUMLModelIndex(dataset_state.graph)
+        for feature_code in self.features_list:
+            dataset_state.results[feature_code] = execute_feature_verification(feature_code,
+                                                                               dataset_state.model_index)
+
+        dataset_state.verification_time = round(time.perf_counter() - start_time, 6)
+
+        return dataset_state
+
+    def refresh(self) -> list[str]:
+        """ Verifies the datasets that were added or changed since the previous refresh, discards the ones that were
+        removed, and rewrites the output files if anything changed.
+
+        :return: Sorted list with the names of the added, changed, and removed datasets.
+        :rtype: list[str]
+        """
+
+        file_states = self.get_file_states()
+        if file_states is None:
+            return []
+
+        with self.condition:
+            changed_datasets = sorted(dataset_name for dataset_name, file_state in file_states.items()
+                                      if dataset_name not in self.datasets
+                                      or self.datasets[dataset_name].file_state != file_state)
+            removed_datasets = sorted(dataset_name for dataset_name in self.datasets
+                                      if dataset_name not in file_states)
+
+        if not changed_datasets and not removed_datasets:
+            return []
+
+        start_time = time.perf_counter()
+
+        # Datasets are verified without holding the lock, so that the previous results can be queried meanwhile
+        new_states = {}
+        for dataset_name in changed_datasets:
+            new_states[dataset_name] = self.verify_dataset(dataset_name, file_states[dataset_name])
+
+        with self.condition:
+            for dataset_name in removed_datasets:
+                del self.datasets[dataset_name]
+            self.datasets.update(new_states)
+            self.generation += 1
+            self.last_refresh = datetime.now().isoformat(timespec="seconds")
+            self.write_outputs()
+            self.condition.notify_all()
+
+        LOGGER.info(f"Results updated in {time.perf_counter() - start_time:.3f} seconds: "
+                    f"{len(changed_datasets)} added or changed dataset(s) and {len(removed_datasets)} removed "
+                    f"dataset(s). {self.get_problems_summary(changed_datasets)}")
+
+        return sorted(changed_datasets + removed_datasets)
+
+    def get_problems_summary(self, datasets_names: list[str]) -> str:
+        """ Returns a description of the number of problems found in each feature for the received datasets. """
+
+        summary = []
+
+        for dataset_name in datasets_names:
+            dataset_state = self.datasets.get(dataset_name)
+            if dataset_state is None:
+                continue
+            if dataset_state.error is not None:
+                summary.append(f"{dataset_name}: not loaded")
+            else:
+                problems_counts = ", ".join(f"{len(problems_table)} {feature_code.upper()}"
+                                            for feature_code, problems_table in dataset_state.results.items())
+                summary.append(f"{dataset_name}: {problems_counts}")
+
+        return "; ".join(summary)
+
+    def write_outputs(self) -> None:
+        """ Rewrites the output files with the results of all datasets. Must be called with the lock acquired. """
+
+        with create_results_sink(self.output_format, self.features_list) as results_sink:
+            for dataset_name in sorted(self.datasets):
+                for feature_code, problems_table in self.datasets[dataset_name].results.items():
+                    if feature_code in self.features_list:
+                        results_sink.add_problems(dataset_name, feature_code, problems_table)
+
+    def wait_generation(self, generation: int, timeout: float) -> None:
+        """ Blocks until the results' generation is greater than the received one or until the timeout expires. """
+
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation > generation, timeout)
+
+    def get_status(self) -> dict:
+        """ Returns the watcher's status, including the datasets that could not be loaded. """
+
+        with self.condition:
+            return {"models_path": self.models_path, "generation": self.generation,
+                    "last_refresh": self.last_refresh, "features": self.features_list,
+                    "datasets": len(self.datasets), "catalog_error": self.catalog_error,
+                    "errors": {dataset_name: dataset_state.error
+                               for dataset_name, dataset_state in sorted(self.datasets.items())
+                               if dataset_state.error is not None}}
+
+    def get_results(self, datasets_names: list[str] | None, features_list: list[str]) -> dict:
+        """ Returns the problems of the received datasets (or of all datasets, if None) for the received features.
+        Verifications that were not executed for a dataset are executed over its index and their results are kept.
+
+        :param datasets_names: Names of the datasets whose results are returned, or None for all datasets.
+        :type datasets_names: list[str] | None
+        :param features_list: Codes of the registered verifications whose results are returned.
+        :type features_list: list[str]
+        :return: Dictionary with the results' generation and, for each feature, the list of problems as dictionaries
+                 mapping the output columns to their values.
+        :rtype: dict
+        """
+
+        with self.condition:
+            generation = self.generation
+            if datasets_names is None:
+                datasets_names = sorted(self.datasets)
+            datasets_states = [(dataset_name, self.datasets[dataset_name]) for dataset_name in datasets_names
+                               if dataset_name in self.datasets]
+
+        results = {}
+        for feature_code in features_list:
+            header = get_csv_header(feature_code)
+            feature_rows = []
+            for dataset_name, dataset_state in datasets_states:
+                problems_table = self.get_dataset_problems(dataset_state, feature_code)
+                feature_rows.extend(dict(zip(header, get_normalized_row(csv_row)))
+                                    for csv_row in problems_table.get_rows(dataset_name))
+            results[feature_code] = feature_rows
+
+        return {"generation": generation, "results": results}
+
+    def get_dataset_problems(self, dataset_state: DatasetState, feature_code: str) -> ProblemTable:
+        """ Returns the dataset's problems for the feature, executing its verification if needed. Datasets that could
+        not be loaded have no problems. """
+
+        with self.condition:
+            problems_table = dataset_state.results.get(feature_code)
+        if problems_table is not None:
+            return problems_table
+        if dataset_state.model_index is None:
+            return ProblemTable(get_verification(feature_code).problem_class)
+
+        problems_table = execute_feature_verification(feature_code, dataset_state.model_index)
+        with self.condition:
+            dataset_state.results.setdefault(feature_code, problems_table)
+
+        return problems_table
+
+
+class WatchRequestHandler(BaseHTTPRequestHandler):
+    """ Serves the watcher's state as JSON through the following GET endpoints:
+
+    - /status: generation, time of the last refresh, selected features, and datasets (or models directory) that could
+      not be loaded.
+    - /results: problems of all datasets for the selected features. The dataset and feature parameters (repeatable or
+      comma-separated) filter the datasets and choose the features (any registered one). The after parameter makes
+      the request wait until the results' generation is greater than the informed one, so clients can long-poll.
+    """
+
+    def do_GET(self):
+        watcher = self.server.watcher
+        request_url = urlparse(self.path)
+        parameters = {name: [value for values in values_list for value in values.split(",") if value]
+                      for name, values_list in parse_qs(request_url.query).items()}
+
+        if "after" in parameters:
+            try:
+                watcher.wait_generation(int(parameters["after"][0]), MAX_WAIT_TIME)
+            except ValueError:
+                self.send_json(400, {"error": "The after parameter must be an integer."})
+                return
+
+        if request_url.path == "/status":
+            self.send_json(200, watcher.get_status())
+        elif request_url.path == "/results":
+            features_list = parameters.get("feature", watcher.features_list)
+            invalid_features = [feature_code for feature_code in features_list
+                                if feature_code not in get_verification_codes()]
+            if invalid_features:
+                self.send_json(400, {"error": f"Invalid feature(s): {', '.join(invalid_features)}."})
+                return
+            self.send_json(200, watcher.get_results(parameters.get("dataset"), features_list))
+        else:
+            self.send_json(404, {"error": "Endpoint not found. Available endpoints: /status and /results."})
+
+    def send_json(self, status_code: int, content: dict) -> None:
+        """ Sends the content as the JSON body of the response. """
+
+        body = json.dumps(content, ensure_ascii=False).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        LOGGER.debug(f"HTTP request from {self.address_string()}: {format % args}")
+
+
+def start_results_server(watcher: DataQualityWatcher, port: int) -> ThreadingHTTPServer:
+    """ Starts serving the watcher's results on the local host, in a daemon thread.
+
+    :param watcher: Watcher whose state is served.
+    :type watcher: DataQualityWatcher
+    :param port: Port in which the HTTP server listens.
+    :type port: int
+    :return: Running HTTP server.
+    :rtype: ThreadingHTTPServer
+    """
+
+    results_server = ThreadingHTTPServer(("127.0.0.1", port), WatchRequestHandler)
+    results_server.daemon_threads = True
+    results_server.watcher = watcher
+    threading.Thread(target=results_server.serve_forever, daemon=True).start()
+
+    LOGGER.info(f"Data quality results served at http://127.0.0.1:{results_server.server_port}/results "
+                f"(status at /status).")
+
+    return results_server
+
+
+def run_watch_mode(catalog_path: str, features_list: list[str] = None, output_format: str = "csv",
+                   compact: bool = False, port: int = 8765, poll_interval: float = 0.5) -> None:
+    """ Verifies all datasets and keeps running, re-verifying only the datasets whose ontology.ttl files change and
+    serving the results through a local HTTP endpoint, until interrupted (e.g., with Ctrl+C). The output files are
+    rewritten after each change. Changes are detected with inotify, if the inotify_simple package is installed, or by
+    polling the catalog.
+
+    :param catalog_path: Path to the ontouml-models catalog directory provided by the user as argument.
+    :type catalog_path: str
+    :param features_list: Codes of the data quality sub-features to be performed. If None, all are performed.
+    :type features_list: list[str]
+    :param output_format: Format of the output files (csv, jsonl, or sqlite).
+    :type output_format: str
+    :param compact: If True, ontologies are parsed into compact triple tables, which use a fraction of the memory.
+    :type compact: bool
+    :param port: Port of the local HTTP endpoint. If 0, results are not served.
+    :type port: int
+    :param poll_interval: Interval in seconds between scans of the catalog when polling.
+    :type poll_interval: float
+    """
+
+    if features_list is None:
+        features_list = get_verification_codes()
+
+    create_directory_if_not_exists("results")
+
+    watcher = DataQualityWatcher(catalog_path, features_list, output_format, compact)
+    LOGGER.info(f"Verifying all datasets in {watcher.models_path}.")
+    watcher.refresh()
+
+    results_server = start_results_server(watcher, port) if port else None
+
+    if inotify_simple is not None:
+        change_monitor = InotifyMonitor(watcher.models_path)
+        LOGGER.info(f"Watching {watcher.models_path} for changes with inotify. Press Ctrl+C to stop.")
+    else:
+        change_monitor = PollingMonitor(poll_interval)
+        LOGGER.info(f"Watching {watcher.models_path} for changes every {poll_interval} seconds. "
+                    f"Press Ctrl+C to stop.")
+
+    try:
+        while True:
+            # The models directory is watched again in case it was recreated
+            change_monitor.update_watches([watcher.models_path] +
+                                          [os.path.join(watcher.models_path, dataset_name)
+                                           for dataset_name in watcher.get_datasets_names() or []])
+            change_monitor.wait()
+            watcher.refresh()
+    except KeyboardInterrupt:
+        LOGGER.info("Watch mode stopped.")
+    finally:
+        change_monitor.close()
+        if results_server is not None:
+            results_server.shutdown()
+            results_server.server_close()
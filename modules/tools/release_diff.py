@@ -0,0 +1,409 @@
+""" Comparison of two catalog release files, reporting the triples added and removed in each dataset. """
+import csv
+import hashlib
+import heapq
+import os
+import re
+import tempfile
+from typing import Iterator
+
+from rdflib import Graph, BNode, URIRef
+from rdflib.plugins.stores.memory import Memory
+from rdflib.util import guess_format
+
+from modules.logger_config import initialize_logger
+from modules.tools.data_quality.results_file import create_directory_if_not_exists
+from modules.utils.error_treatment import report_error_io_read, report_error_io_write
+from modules.utils.utils_rdf import get_nt_row
+
+LOGGER = initialize_logger()
+
+DIFF_FILE_PATH = "results/release_diff.csv"
+
+# Number of lines kept in memory by each external sorter before a sorted run is written to disk
+SORT_CHUNK_SIZE = 200000
+
+# IRIs of the elements of a dataset contain its name after these paths
+DATASET_IRI_PATTERN = re.compile(r"^<https://w3id\.org/ontouml-models/(?:model|dataset)/([^/#>]+)")
+
+CANONICAL_BNODE_PREFIX = "c"
+
+
+class ExternalSorter(object):
+    """ Sorts text lines in bounded memory. Lines are kept in memory until chunk_size lines are received, when they are
+    sorted and written to a temporary run file. The sorted lines are then obtained by merging all runs, with repeated
+    lines removed. Lines must not contain line breaks.
+    """
+
+    def __init__(self, temporary_directory: str, chunk_size: int = SORT_CHUNK_SIZE):
+        self.temporary_directory = temporary_directory
+        self.chunk_size = chunk_size
+        self.lines = []
+        self.runs_paths = []
+
+    def add(self, line: str) -> None:
+        """ Adds a line to be sorted. """
+
+        self.lines.append(line)
+        if len(self.lines) >= self.chunk_size:
+            self.write_run()
+
+    def write_run(self) -> None:
+        """ Sorts the lines in memory and writes them to a new run file. """
+
+        run_file_descriptor, run_path = tempfile.mkstemp(suffix=".run", dir=self.temporary_directory)
+        with open(run_file_descriptor, "w", encoding="utf-8", newline="\n") as run_file:
+            run_file.writelines(line + "\n" for line in sorted(set(self.lines)))
+        self.runs_paths.append(run_path)
+        self.lines = []
+
+    def get_sorted_lines(self) -> Iterator[str]:
+        """ Yields all distinct lines received, in sorted order. """
+
+        if not self.runs_paths:
+            yield from sorted(set(self.lines))
+            return
+
+        if self.lines:
+            self.write_run()
+
+        runs_files = [open(run_path, "r", encoding="utf-8", newline="\n") for run_path in self.runs_paths]
+        try:
+            previous_line = None
+            for line in heapq.merge(*runs_files):
+                if line != previous_line:
+                    yield line[:-1]
+                    previous_line = line
+        finally:
+            for run_file in runs_files:
+                run_file.close()
+
+
+class ReleaseTriplesSink(Memory):
+    """ Store used only as the destination of a parser. Triples without blank nodes are sent to the external sorter as
+    N-Triples lines, without being indexed or kept in memory. Triples with blank nodes are kept, as their canonical
+    labels can only be calculated after the whole file is parsed.
+    """
+
+    def __init__(self, triples_sorter: ExternalSorter):
+        super().__init__()
+        self.triples_sorter = triples_sorter
+        self.bnode_triples = []
+        self.number_triples = 0
+
+    def add(self, triple, context, quoted=False):
+        self.number_triples += 1
+        if isinstance(triple[0], BNode) or isinstance(triple[2], BNode):
+            self.bnode_triples.append(triple)
+        else:
+            self.triples_sorter.add(get_nt_row(triple)[:-1])
+
+    def __len__(self, context=None):
+        return self.number_triples
+
+
+def get_bnode_components(bnode_triples: list[tuple]) -> list[list[tuple]]:
+    """ Splits the blank node triples into connected components, i.e., groups of triples whose blank nodes are
+    connected through triples between blank nodes.
+
+    :param bnode_triples: Triples having a blank node as subject or object.
+    :type bnode_triples: list[tuple]
+    :return: List with the triples of each component.
+    :rtype: list[list[tuple]]
+    """
+
+    # Union-find over the blank nodes, in which each blank node points to another of its component
+    parents = {}
+
+    def find_root(bnode: BNode) -> BNode:
+        root = parents.setdefault(bnode, bnode)
+        while root != parents[root]:
+            root = parents[root]
+        while bnode != root:
+            next_bnode = parents[bnode]
+            parents[bnode] = root
+            bnode = next_bnode
+        return root
+
+    for subj, _, obj in bnode_triples:
+        if isinstance(subj, BNode) and isinstance(obj, BNode):
+            parents[find_root(subj)] = find_root(obj)
+
+    components = {}
+    for triple in bnode_triples:
+        components.setdefault(find_root(triple[0] if isinstance(triple[0], BNode) else triple[2]), []).append(triple)
+
+    return list(components.values())
+
+
+def get_bnode_edges(component_triples: list[tuple]) -> dict[BNode, list[tuple]]:
+    """ Returns the edges of each blank node of a component, as (direction and predicate, neighbour blank node or None,
+    N-Triples syntax of the neighbour term or None) tuples. """
+
+    bnode_edges = {}
+    for subj, pred, obj in component_triples:
+        if isinstance(subj, BNode):
+            bnode_edges.setdefault(subj, []).append((f"+{pred.n3()}", obj, None) if isinstance(obj, BNode) else
+                                                    (f"+{pred.n3()}", None, obj.n3()))
+        if isinstance(obj, BNode):
+            bnode_edges.setdefault(obj, []).append((f"-{pred.n3()}", subj, None) if isinstance(subj, BNode) else
+                                                   (f"-{pred.n3()}", None, subj.n3()))
+    return bnode_edges
+
+
+def refine_bnode_colors(colors: dict[BNode, str], bnode_edges: dict[BNode, list[tuple]]) -> dict[BNode, str]:
+    """ Refines the colors of the blank nodes of a component with the predicates and terms connected to them (the
+    colors of neighbour blank nodes, in case of blank nodes) until no new blank nodes are distinguished, returning the
+    colors of the stable partition. """
+
+    number_colors = len(set(colors.values()))
+
+    while True:
+        new_colors = {}
+        for bnode, edges in bnode_edges.items():
+            neighbourhood = sorted(f"{edge} {colors[neighbour] if neighbour is not None else term}"
+                                   for edge, neighbour, term in edges)
+            new_colors[bnode] = hashlib.sha256((colors[bnode] + "\n" + "\n".join(neighbourhood)).encode("utf-8")) \
+                .hexdigest()
+
+        # Colors only split the current classes, so the partition is stable when their number does not grow
+        new_number_colors = len(set(new_colors.values()))
+        if new_number_colors == number_colors:
+            return colors
+        colors, number_colors = new_colors, new_number_colors
+
+
+def get_component_canonical_form(component_triples: list[tuple]) -> tuple[dict[BNode, int], str]:
+    """ Returns the canonical rank of each blank node of a component and the component's canonical serialization, in
+    which blank nodes are replaced by their ranks. Neither depends on the labels used in the file nor on the order of
+    the triples.
+    Blank nodes are colored by refinement until the partition is stable. While blank nodes remain indistinguishable,
+    one of them is individualized and the colors are refined again. The individualized blank node is the one whose
+    refined partition has the smallest sorted colors, so the choice does not depend on the order of appearance (blank
+    nodes still tied are automorphic, e.g., repeated identical structures, so any of them produces the same result).
+
+    :param component_triples: Triples of a connected component of blank nodes.
+    :type component_triples: list[tuple]
+    :return: Dictionary mapping each blank node to its rank, and the sorted N-Triples lines of the component.
+    :rtype: tuple[dict[BNode, int], str]
+    """
+
+    bnode_edges = get_bnode_edges(component_triples)
+    colors = refine_bnode_colors({bnode: "" for bnode in bnode_edges}, bnode_edges)
+
+    while len(set(colors.values())) < len(colors):
+        color_classes = {}
+        for bnode, color in colors.items():
+            color_classes.setdefault(color, []).append(bnode)
+        tied_color = min(color for color, bnodes in color_classes.items() if len(bnodes) > 1)
+        individualized_color = hashlib.sha256(f"{tied_color}\n*".encode("utf-8")).hexdigest()
+
+        best_signature = None
+        for candidate in color_classes[tied_color]:
+            candidate_colors = refine_bnode_colors({**colors, candidate: individualized_color}, bnode_edges)
+            signature = sorted(candidate_colors.values())
+            if best_signature is None or signature < best_signature:
+                best_signature, best_colors = signature, candidate_colors
+        colors = best_colors
+
+    ranks = {bnode: rank for rank, bnode in enumerate(sorted(colors, key=colors.get))}
+    serialization = "".join(sorted(get_nt_row(tuple(BNode(f"r{ranks[term]}") if isinstance(term, BNode) else term
+                                                    for term in triple)) for triple in component_triples))
+
+    return ranks, serialization
+
+
+def get_canonical_bnode_labels(bnode_triples: list[tuple]) -> dict[BNode, str]:
+    """ Returns canonical labels for the blank nodes of the received triples, which do not depend on the labels used in
+    the file nor on the order of the triples. Each connected component of blank nodes is labeled independently, after
+    the hash of its canonical serialization and the ranks of its blank nodes, so the labels of a dataset's blank nodes
+    do not depend on other datasets. Identical components (which only differ in their labels) are numbered, which
+    produces the same labeled triples regardless of their order.
+
+    :param bnode_triples: Triples having a blank node as subject or object.
+    :type bnode_triples: list[tuple]
+    :return: Dictionary mapping each blank node to its canonical label.
+    :rtype: dict[BNode, str]
+    """
+
+    canonical_labels = {}
+    components_occurrences = {}
+
+    for component_triples in get_bnode_components(bnode_triples):
+        ranks, serialization = get_component_canonical_form(component_triples)
+        component_hash = hashlib.sha256(serialization.encode("utf-8")).hexdigest()[:32]
+        occurrence = components_occurrences.get(component_hash, 0)
+        components_occurrences[component_hash] = occurrence + 1
+        component_label = f"{CANONICAL_BNODE_PREFIX}{component_hash}{'n' + str(occurrence) if occurrence else ''}"
+        for bnode, rank in ranks.items():
+            canonical_labels[bnode] = f"{component_label}r{rank}"
+
+    return canonical_labels
+
+
+def get_iri_dataset(iri: URIRef) -> str | None:
+    """ Returns the name of the dataset whose elements are identified by IRIs like the received one, or None. """
+
+    match = DATASET_IRI_PATTERN.match(f"<{iri}>")
+    return match.group(1) if match else None
+
+
+def get_bnode_datasets(bnode_triples: list[tuple], canonical_labels: dict[BNode, str]) -> dict[str, str]:
+    """ Returns the dataset of each blank node, which is the dataset of the IRI referencing it (directly or through
+    other blank nodes) or, for blank nodes not referenced by IRIs, the dataset of the IRIs they reference.
+
+    :param bnode_triples: Triples having a blank node as subject or object.
+    :type bnode_triples: list[tuple]
+    :param canonical_labels: Dictionary mapping each blank node to its canonical label.
+    :type canonical_labels: dict[BNode, str]
+    :return: Dictionary mapping the canonical label of each blank node with an identified dataset to its name.
+    :rtype: dict[str, str]
+    """
+
+    referencing_datasets = {}
+    referenced_datasets = {}
+    bnode_neighbours = {}
+
+    for subj, _, obj in bnode_triples:
+        if isinstance(subj, BNode) and isinstance(obj, BNode):
+            bnode_neighbours.setdefault(subj, []).append(obj)
+            bnode_neighbours.setdefault(obj, []).append(subj)
+        elif isinstance(obj, BNode) and (dataset_name := get_iri_dataset(subj)):
+            referencing_datasets.setdefault(obj, dataset_name)
+        elif isinstance(subj, BNode) and isinstance(obj, URIRef) and (dataset_name := get_iri_dataset(obj)):
+            referenced_datasets.setdefault(subj, dataset_name)
+
+    # Propagating datasets through connected blank nodes, first from the referencing IRIs, then from the referenced ones
+    bnode_datasets = {}
+    for initial_datasets in (referencing_datasets, referenced_datasets):
+        pending_bnodes = []
+        for bnode, dataset_name in initial_datasets.items():
+            if bnode not in bnode_datasets:
+                bnode_datasets[bnode] = dataset_name
+                pending_bnodes.append(bnode)
+
+        while pending_bnodes:
+            bnode = pending_bnodes.pop()
+            for neighbour in bnode_neighbours.get(bnode, ()):
+                if neighbour not in bnode_datasets:
+                    bnode_datasets[neighbour] = bnode_datasets[bnode]
+                    pending_bnodes.append(neighbour)
+
+    return {canonical_labels[bnode]: dataset_name for bnode, dataset_name in bnode_datasets.items()}
+
+
+def read_release_triples(release_file_path: str, temporary_directory: str) -> tuple[ExternalSorter, dict[str, str]]:
+    """ Parses the release file, sending its triples, with canonical blank node labels, to an external sorter.
+
+    :param release_file_path: Path of the release file.
+    :type release_file_path: str
+    :param temporary_directory: Directory in which the sorter's run files are written.
+    :type temporary_directory: str
+    :return: Sorter with the file's triples as N-Triples lines, and dictionary mapping the canonical label of each
+             blank node to its dataset.
+    :rtype: tuple[ExternalSorter, dict[str, str]]
+    """
+
+    triples_sorter = ExternalSorter(temporary_directory)
+    triples_sink = ReleaseTriplesSink(triples_sorter)
+
+    LOGGER.info(f"Reading release file {release_file_path}.")
+    try:
+        Graph(store=triples_sink).parse(release_file_path, format=guess_format(release_file_path) or "turtle",
+                                        encoding="utf-8")
+    except OSError as error:
+        report_error_io_read(release_file_path, "release file", error)
+
+    canonical_labels = get_canonical_bnode_labels(triples_sink.bnode_triples)
+    for triple in triples_sink.bnode_triples:
+        triples_sorter.add(get_nt_row(tuple(BNode(canonical_labels[term]) if isinstance(term, BNode) else term
+                                            for term in triple))[:-1])
+
+    LOGGER.info(f"Release file {release_file_path} read: {triples_sink.number_triples} triples, "
+                f"{len(canonical_labels)} blank nodes.")
+
+    return triples_sorter, get_bnode_datasets(triples_sink.bnode_triples, canonical_labels)
+
+
+def get_triple_dataset(triple_line: str, bnode_datasets: dict[str, str]) -> str:
+    """ Returns the dataset of the triple, identified by its subject, or an empty string for triples that are not
+    attributed to any dataset (e.g., catalog triples). """
+
+    if triple_line.startswith("_:"):
+        return bnode_datasets.get(triple_line[2:triple_line.index(" ")], "")
+
+    match = DATASET_IRI_PATTERN.match(triple_line)
+    return match.group(1) if match else ""
+
+
+def get_sorted_differences(old_lines: Iterator[str], new_lines: Iterator[str]) -> Iterator[tuple[str, str]]:
+    """ Merges two sorted sequences of distinct lines, yielding ("removed", line) for lines only in the first one and
+    ("added", line) for lines only in the second one. """
+
+    old_line = next(old_lines, None)
+    new_line = next(new_lines, None)
+
+    while old_line is not None or new_line is not None:
+        if new_line is None or (old_line is not None and old_line < new_line):
+            yield "removed", old_line
+            old_line = next(old_lines, None)
+        elif old_line is None or new_line < old_line:
+            yield "added", new_line
+            new_line = next(new_lines, None)
+        else:
+            old_line = next(old_lines, None)
+            new_line = next(new_lines, None)
+
+
+def diff_release_files(old_release_path: str, new_release_path: str, diff_file_path: str = DIFF_FILE_PATH) -> dict:
+    """ Compares two release files, writing the added and removed triples, grouped by dataset, to a csv file.
+    Both releases are streamed into external sorters, so only their blank node triples are kept in memory. Blank nodes
+    are compared through canonical labels, so the labels used in each file do not generate differences.
+
+    :param old_release_path: Path of the previous release file.
+    :type old_release_path: str
+    :param new_release_path: Path of the new release file.
+    :type new_release_path: str
+    :param diff_file_path: Path of the csv file with columns dataset, change (added or removed), and triple (in
+                           N-Triples syntax, with canonical blank node labels).
+    :type diff_file_path: str
+    :return: Dictionary mapping the name of each dataset with differences (empty for triples not attributed to any
+             dataset) to its numbers of added and removed triples.
+    :rtype: dict
+    """
+
+    create_directory_if_not_exists(os.path.dirname(diff_file_path))
+    datasets_changes = {}
+
+    with tempfile.TemporaryDirectory(prefix="release_diff_") as temporary_directory:
+        old_sorter, old_bnode_datasets = read_release_triples(old_release_path, temporary_directory)
+        new_sorter, new_bnode_datasets = read_release_triples(new_release_path, temporary_directory)
+
+        # Differences are sorted again, by dataset and change, also in bounded memory
+        changes_sorter = ExternalSorter(temporary_directory)
+        for change, triple_line in get_sorted_differences(old_sorter.get_sorted_lines(),
+                                                          new_sorter.get_sorted_lines()):
+            bnode_datasets = old_bnode_datasets if change == "removed" else new_bnode_datasets
+            changes_sorter.add(f"{get_triple_dataset(triple_line, bnode_datasets)}\t{change}\t{triple_line}")
+
+        try:
+            with open(diff_file_path, "w", encoding="utf-8", newline="") as diff_file:
+                writer = csv.writer(diff_file)
+                writer.writerow(["dataset", "change", "triple"])
+                for change_line in changes_sorter.get_sorted_lines():
+                    dataset_name, change, triple_line = change_line.split("\t", 2)
+                    writer.writerow([dataset_name, change, triple_line])
+                    dataset_changes = datasets_changes.setdefault(dataset_name, {"added": 0, "removed": 0})
+                    dataset_changes[change] += 1
+        except OSError as error:
+            report_error_io_write(diff_file_path, "release diff file", error)
+
+    for dataset_name, dataset_changes in datasets_changes.items():
+        LOGGER.info(f"{dataset_name or 'Triples not in datasets'}: {dataset_changes['added']} added and "
+                    f"{dataset_changes['removed']} removed triple(s).")
+
+    LOGGER.info(f"Release comparison concluded: {sum(changes['added'] for changes in datasets_changes.values())} "
+                f"added and {sum(changes['removed'] for changes in datasets_changes.values())} removed triple(s) in "
+                f"{len(datasets_changes)} group(s). Differences saved in {diff_file_path}.")
+
+    return datasets_changes
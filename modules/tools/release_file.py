@@ -1,20 +1,241 @@
 """ Main module for the catalog release file generation. """
+import hashlib
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
 
-from rdflib import Graph
+from rdflib import Graph, BNode
 
 from modules.logger_config import initialize_logger
 from modules.tools.data_quality.results_file import create_directory_if_not_exists
+from modules.utils.catalog_store import CatalogStore, read_file_triples
+from modules.utils.error_treatment import report_error_io_write
+from modules.utils.fragment_cache import create_fragment_cache_directory, get_fragment_cache_key, \
+    is_fragment_cached, load_cached_fragment, store_cached_fragment, prune_fragment_cache
+from modules.utils.graph_cache import get_triples_in_parse_order
+from modules.utils.metrics import measure_time, get_memory_metrics, write_metrics_file, get_slowest_items, \
+    profile_execution
+from modules.utils.progress_reporter import ProgressReporter
 from modules.utils.utils_catalog import list_all_files_with_filetype
-from modules.utils.utils_rdf import load_all_graph_safely, save_ontology_file_safely
+from modules.utils.utils_rdf import load_all_graph_safely, save_ontology_file_safely, get_nt_row
+from modules.utils.worker_processes import initialize_worker_process, get_worker_settings, map_with_bounded_window, \
+    TASKS_PER_WORKER
 
 LOGGER = initialize_logger()
 
+METRICS_FILE_PATH = "results/metrics_release.csv"
 
-def generate_release_file(catalog_path: str):
-    """ Generates a single file with all content from all ttl files in the catalog to be used as a release version. """
+# Prefixes bound in the release file
+RELEASE_PREFIXES = {
+    "ontouml": "https://w3id.org/ontouml#",
+    "dcat": "http://www.w3.org/ns/dcat#",
+    "dct": "http://purl.org/dc/terms/",
+    "ocmv": "https://w3id.org/ontouml-models/vocabulary#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+    "mod": "https://w3id.org/mod#",
+    "vcard": "http://www.w3.org/2006/vcard/ns#",
+    "vann": "http://purl.org/vocab/vann/"
+}
+
+
+def get_fragment_label_seed(ttl_file: str, catalog_path: str) -> str:
+    """ Returns the seed of the blank node labels of the file's release fragment, derived from the file's path
+    relative to the catalog. Files with identical content (e.g., a copied dataset) thus never share blank node labels,
+    while labels do not depend on the catalog's location and are obtained without reading the file.
+
+    :param ttl_file: Path of the ttl file to be serialized.
+    :type ttl_file: str
+    :param catalog_path: Path to the catalog directory containing the file.
+    :type catalog_path: str
+    :return: Hexadecimal digest used as seed by serialize_release_fragment.
+    :rtype: str
+    """
+
+    relative_path = pathlib.PurePath(os.path.relpath(ttl_file, catalog_path)).as_posix()
+
+    return hashlib.sha256(relative_path.encode("utf-8")).hexdigest()
+
+
+def serialize_release_fragment(ttl_file: str, label_seed: str, item_graph: Graph = None) -> tuple[bytes, dict]:
+    """ Loads the ttl file and returns its triples serialized as N-Triples, ready to be written to the release file,
+    together with the file's metrics.
+    Triples are written in parse order and blank nodes are labeled after the label seed and their order of appearance,
+    so that fragments are identical in every execution and never share labels with other files' fragments.
+    Defined at module level so that it can be dispatched to worker processes.
+
+    :param ttl_file: Path of the ttl file to be serialized.
+    :type ttl_file: str
+    :param label_seed: Seed of the blank node labels, obtained with get_fragment_label_seed.
+    :type label_seed: str
+    :param item_graph: Already loaded graph of the file, created with create_parse_order_graph. If None, the file is
+                       loaded.
+    :type item_graph: Graph
+    :return: UTF-8 encoded N-Triples fragment and the file's metrics.
+    :rtype: tuple[bytes, dict]
+    """
+
+    file_metrics = {"file": ttl_file, "file_size": os.path.getsize(ttl_file)}
+
+    with measure_time(file_metrics, "parse_time"):
+        if item_graph is None:
+            item_graph = load_all_graph_safely(ttl_file, keep_parse_order=True)
+    file_metrics["triples"] = len(item_graph)
+
+    with measure_time(file_metrics, "serialization_time"):
+        bnode_prefix = "b" + label_seed[:16] + "x"
+        bnode_labels = {}
+
+        fragment_rows = []
+        for triple in get_triples_in_parse_order(item_graph):
+            if isinstance(triple[0], BNode) or isinstance(triple[2], BNode):
+                triple = tuple(bnode_labels.setdefault(term, BNode(bnode_prefix + str(len(bnode_labels))))
+                               if isinstance(term, BNode) else term for term in triple)
+            fragment_rows.append(get_nt_row(triple))
+
+        fragment = "".join(fragment_rows).encode("utf-8")
+
+    file_metrics["total_time"] = round(file_metrics["parse_time"] + file_metrics["serialization_time"], 6)
+    file_metrics.update(get_memory_metrics())
+
+    return fragment, file_metrics
+
+
+def read_release_item_triples(ttl_file: str) -> tuple[list[tuple], dict]:
+    """ Loads the ttl file and returns its triples in parse order, together with the file's metrics, so that its graph
+    can be rebuilt by the main process exactly as if it had loaded the file.
+    Defined at module level so that it can be dispatched to worker processes.
+
+    :param ttl_file: Path of the ttl file to be loaded.
+    :type ttl_file: str
+    :return: List of triples in parse order and the file's metrics.
+    :rtype: tuple[list[tuple], dict]
+    """
+
+    file_metrics = {"file": ttl_file, "file_size": os.path.getsize(ttl_file)}
+
+    with measure_time(file_metrics, "parse_time"):
+        _, triples = read_file_triples(ttl_file)
+    file_metrics["triples"] = len(triples)
+
+    return triples, file_metrics
+
+
+def write_streaming_release_file(list_ttl_files: list[str], release_file_name: str, catalog_path: str,
+                                 jobs: int = 1, catalog_store: CatalogStore = None,
+                                 fragment_cache: bool = False) -> list[dict]:
+    """ Writes the release file loading one ttl file at a time, so that memory usage does not grow with the catalog.
+    The release file starts with the release prefixes, followed by each file's triples serialized as N-Triples,
+    which are also valid Turtle statements. When jobs is greater than 1, files are parsed by worker processes and
+    their fragments are written in the same order as in a single process execution, producing an identical file.
+    When fragment_cache is True, the fragments of files whose content did not change since the previous release are
+    read from the fragment cache and only the other files are parsed and serialized.
+
+    :param list_ttl_files: List of paths of the ttl files to be included in the release.
+    :type list_ttl_files: list[str]
+    :param release_file_name: Path of the release file to be written.
+    :type release_file_name: str
+    :param catalog_path: Path to the catalog directory containing the ttl files.
+    :type catalog_path: str
+    :param jobs: Number of worker processes used for parsing the ttl files.
+    :type jobs: int
+    :param catalog_store: Store with the already loaded catalog graphs. When provided, files are serialized serially
+                          from its graphs.
+    :type catalog_store: CatalogStore
+    :param fragment_cache: If True, reuses and updates the fragments cached in FRAGMENT_CACHE_DIRECTORY.
+    :type fragment_cache: bool
+    :return: List with the metrics of each included file.
+    :rtype: list[dict]
+    """
+
+    len_list_tt_files = len(list_ttl_files)
+    metrics_list = []
+    labels_seeds = {ttl_file: get_fragment_label_seed(ttl_file, catalog_path) for ttl_file in list_ttl_files}
+
+    fragments_keys = {}
+    changed_files = list_ttl_files
+    if fragment_cache and create_fragment_cache_directory():
+        fragments_keys = {ttl_file: get_fragment_cache_key(ttl_file, labels_seeds[ttl_file])
+                          for ttl_file in list_ttl_files}
+        changed_files = [ttl_file for ttl_file in list_ttl_files if not is_fragment_cached(fragments_keys[ttl_file])]
+        LOGGER.info(f"Reusing {len_list_tt_files - len(changed_files)} cached release fragments and serializing "
+                    f"{len(changed_files)} new or changed files.")
+
+    # Fragments of the changed files, obtained in order as the release file is written. Workers only get a few files
+    # ahead of the writer, so that memory usage stays flat when an early file is slow.
+    executor = None
+    if jobs > 1 and catalog_store is None:
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker_process,
+                                       initargs=get_worker_settings())
+        new_fragments = map_with_bounded_window(executor, serialize_release_fragment, changed_files,
+                                                [labels_seeds[ttl_file] for ttl_file in changed_files],
+                                                window_size=TASKS_PER_WORKER * jobs)
+    else:
+        new_fragments = (serialize_release_fragment(ttl_file, labels_seeds[ttl_file],
+                                                    catalog_store.get_graph(ttl_file)
+                                                    if catalog_store is not None else None)
+                         for ttl_file in changed_files)
+    changed_files_set = set(changed_files)
+    progress_reporter = ProgressReporter("Including files in the release", len_list_tt_files)
+
+    try:
+        with open(release_file_name, "wb") as release_file:
+            for prefix, namespace in RELEASE_PREFIXES.items():
+                release_file.write(f"@prefix {prefix}: <{namespace}> .\n".encode("utf-8"))
+            release_file.write(b"\n")
+
+            for ttl_file in list_ttl_files:
+                fragment = None
+                if ttl_file not in changed_files_set:
+                    file_metrics = {"file": ttl_file, "file_size": os.path.getsize(ttl_file)}
+                    with measure_time(file_metrics, "total_time"):
+                        fragment = load_cached_fragment(fragments_keys[ttl_file])
+                    file_metrics["fragment_cached"] = fragment is not None
+                    if fragment is not None:
+                        file_metrics["triples"] = fragment.count(b"\n")
+
+                if fragment is None:
+                    if ttl_file in changed_files_set:
+                        fragment, file_metrics = next(new_fragments)
+                    else:
+                        # Cache entry removed after being found, e.g., by a concurrent execution
+                        item_graph = catalog_store.get_graph(ttl_file) if catalog_store is not None else None
+                        fragment, file_metrics = serialize_release_fragment(ttl_file, labels_seeds[ttl_file],
+                                                                            item_graph)
+                    file_metrics["fragment_cached"] = False
+                    if fragments_keys:
+                        store_cached_fragment(fragments_keys[ttl_file], fragment)
+
+                release_file.write(fragment)
+                metrics_list.append(file_metrics)
+                progress_reporter.update(ttl_file, file_metrics["triples"])
+    except OSError as error:
+        report_error_io_write(release_file_name, "release file", error)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    progress_reporter.finish()
+
+    if fragments_keys:
+        prune_fragment_cache(set(fragments_keys.values()))
+
+    return metrics_list
+
+
+def generate_release_file(catalog_path: str, streaming: bool = False, jobs: int = 1, profile: int = 0,
+                          catalog_store: CatalogStore = None, fragment_cache: bool = False):
+    """ Generates a single file with all content from all ttl files in the catalog to be used as a release version.
+    If streaming is True, files are written to the release one at a time instead of aggregated in a single graph.
+    If jobs is greater than 1, files are parsed in parallel by worker processes. Without streaming, the main process
+    rebuilds their graphs in parse order, so that the release file is identical to the one of a single process.
+    The metrics of each included file are saved in the results directory and, if profile is greater than 0, the
+    slowest files are processed again under cProfile and tracemalloc.
+    If a catalog store is provided, the graphs already loaded in it are used instead of parsing the files again.
+    If fragment_cache is True, only new or changed files are serialized, the cached fragments of the others being
+    reused, which also implies streaming.
+    """
 
-    aggregated_graph = Graph()
     today = date.today().strftime("%Y%m%d")
 
     # If directory 'results_directory' not exists, create it
@@ -33,28 +254,77 @@ def generate_release_file(catalog_path: str):
     list_ttl_files[:] = [i for i in list_ttl_files if "-shape.ttl" not in i]
 
     # Removing vocabulary.ttl
-    list_ttl_files[:] = [i for i in list_ttl_files if "\\vocabulary.ttl" not in i]
+    list_ttl_files[:] = [i for i in list_ttl_files if os.path.basename(i) != "vocabulary.ttl"]
 
     len_list_tt_files = len(list_ttl_files)
 
-    # Load all TTL files in a single graph
-    LOGGER.info(f"Generating single graph containing information from {len_list_tt_files} TTL files.")
-    for count, ttl_file in enumerate(list_ttl_files):
-        LOGGER.info(f"Including file {count + 1}/{len_list_tt_files}: {ttl_file}")
-        item_graph = load_all_graph_safely(ttl_file)
-        aggregated_graph += item_graph
-
-    # Fixing prefixes
-    aggregated_graph.bind("ontouml", "https://w3id.org/ontouml#")
-    aggregated_graph.bind("dcat", "http://www.w3.org/ns/dcat#")
-    aggregated_graph.bind("dct", "http://purl.org/dc/terms/")
-    aggregated_graph.bind("ocmv", "https://w3id.org/ontouml-models/vocabulary#")
-    aggregated_graph.bind("skos", "http://www.w3.org/2004/02/skos/core#")
-    aggregated_graph.bind("mod", "https://w3id.org/mod#")
-    aggregated_graph.bind("vcard", "http://www.w3.org/2006/vcard/ns#")
-    aggregated_graph.bind("vann", "http://purl.org/vocab/vann/")
-
-    # Saving graph as release file
-    LOGGER.info(f"Saving a single file with graph's content.")
-    save_ontology_file_safely(aggregated_graph, release_file_name)
-    LOGGER.info(f"Release file successfully saved as {release_file_name}.")
+    if streaming or fragment_cache:
+        LOGGER.info(f"Streaming the content of {len_list_tt_files} TTL files to the release file "
+                    f"using {jobs} process(es).")
+        metrics_list = write_streaming_release_file(list_ttl_files, release_file_name, catalog_path, jobs,
+                                                    catalog_store, fragment_cache)
+        LOGGER.info(f"Release file successfully saved as {release_file_name}.")
+    else:
+        metrics_list = []
+
+        # Load all TTL files in a single graph
+        aggregated_graph = Graph()
+        LOGGER.info(f"Generating single graph containing information from {len_list_tt_files} TTL files.")
+        progress_reporter = ProgressReporter("Including files in the release graph", len_list_tt_files)
+
+        # Triples of the files parsed by worker processes, obtained in order as the graph is aggregated. Workers only
+        # get a few files ahead, so that triples waiting to be aggregated do not pile up when an early file is slow.
+        executor = None
+        if jobs > 1 and catalog_store is None:
+            executor = ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker_process,
+                                           initargs=get_worker_settings())
+            items_triples = map_with_bounded_window(executor, read_release_item_triples, list_ttl_files,
+                                                    window_size=TASKS_PER_WORKER * jobs)
+
+        try:
+            for ttl_file in list_ttl_files:
+                if executor is not None:
+                    triples, file_metrics = next(items_triples)
+                    with measure_time(file_metrics, "aggregation_time"):
+                        # Adding the triples in parse order rebuilds the graph that would be obtained by parsing
+                        item_graph = Graph()
+                        item_graph.addN((*triple, item_graph) for triple in triples)
+                        aggregated_graph += item_graph
+                else:
+                    file_metrics = {"file": ttl_file, "file_size": os.path.getsize(ttl_file)}
+                    with measure_time(file_metrics, "parse_time"):
+                        item_graph = catalog_store.get_graph(ttl_file) if catalog_store is not None else None
+                        if item_graph is None:
+                            item_graph = load_all_graph_safely(ttl_file)
+                    file_metrics["triples"] = len(item_graph)
+                    with measure_time(file_metrics, "aggregation_time"):
+                        aggregated_graph += item_graph
+                file_metrics["total_time"] = round(file_metrics["parse_time"] + file_metrics["aggregation_time"], 6)
+                file_metrics.update(get_memory_metrics())
+                metrics_list.append(file_metrics)
+                progress_reporter.update(ttl_file, file_metrics["triples"])
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        progress_reporter.finish()
+
+        # Fixing prefixes
+        for prefix, namespace in RELEASE_PREFIXES.items():
+            aggregated_graph.bind(prefix, namespace)
+
+        # Saving graph as release file
+        LOGGER.info(f"Saving a single file with graph's content.")
+        serialization_metrics = {"file": release_file_name}
+        with measure_time(serialization_metrics, "total_time"):
+            save_ontology_file_safely(aggregated_graph, release_file_name)
+        LOGGER.info(f"Release file successfully saved as {release_file_name} "
+                    f"in {serialization_metrics['total_time']} seconds.")
+
+    if metrics_list:
+        write_metrics_file(metrics_list, METRICS_FILE_PATH)
+
+    for file_metrics in get_slowest_items(metrics_list, "total_time", profile):
+        ttl_file = file_metrics["file"]
+        LOGGER.info(f"Profiling file {ttl_file} ({file_metrics['total_time']} seconds).")
+        profile_execution(os.path.relpath(ttl_file, catalog_path), serialize_release_fragment, ttl_file,
+                          get_fragment_label_seed(ttl_file, catalog_path))
@@ -1,36 +1,171 @@
 """ Main module for the verification of the ttl syntax for all files in the catalog. """
-import subprocess
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from rdflib import Graph
+from rdflib.plugins.parsers.notation3 import BadSyntax
 
 from modules.logger_config import initialize_logger
+from modules.utils.progress_reporter import ProgressReporter
 from modules.utils.utils_catalog import list_all_files_with_filetype
+from modules.utils.worker_processes import initialize_worker_process, get_worker_settings
 
 LOGGER = initialize_logger()
 
 
-def validate_ttl_syntax(catalog_path: str):
-    """ Uses external ttl software to validate the syntax of all ttl files in the catalog. """
+class TtlSyntaxError(object):
+    """ Class that contains information about a syntax error found in a ttl file. """
 
-    list_ttl_files = list_all_files_with_filetype(catalog_path, "ttl")
-    len_list_ttl_files = len(list_ttl_files)
-    LOGGER.info(f"Starting ttl syntax validation of {len_list_ttl_files} files in {catalog_path[2:]}.")
+    def __init__(self, file_name, line, column, description):
+        self.file_name = file_name
+        self.line = line
+        self.column = column
+        self.description = description
 
-    problems_list = []
+    def __str__(self):
+        if self.line is None:
+            return f"{self.file_name}: {self.description}"
+        if self.column is None:
+            return f"{self.file_name}, line {self.line}: {self.description}"
+        return f"{self.file_name}, line {self.line}, column {self.column}: {self.description}"
+
+
+def get_syntax_error(ttl_file: str, error: Exception) -> TtlSyntaxError:
+    """ Returns the syntax error described by the exception raised when parsing the ttl file.
+
+    :param ttl_file: Path of the ttl file that could not be parsed.
+    :type ttl_file: str
+    :param error: Exception raised by the parser.
+    :type error: Exception
+    :return: Syntax error with its line and column, when provided by the parser.
+    :rtype: TtlSyntaxError
+    """
+
+    if isinstance(error, BadSyntax):
+        # BadSyntax's arguments are the document's URI, the 0-based line, the parsed document, the character index of
+        # the error in it, and the error's reason. If they are not available, only the line is reported.
+        if len(error.args) == 5 and isinstance(error.args[2], str) and isinstance(error.args[3], int):
+            _, _, document, character_index, reason = error.args
+            line_start = document.rfind("\n", 0, character_index) + 1
+            return TtlSyntaxError(ttl_file, error.lines + 1, character_index - line_start + 1, str(reason))
+        return TtlSyntaxError(ttl_file, error.lines + 1, None, " ".join(str(error).splitlines()))
 
-    for count, ttl_file in enumerate(list_ttl_files):
+    return TtlSyntaxError(ttl_file, None, None, f"{type(error).__name__}: {error}")
 
-        file_name = ttl_file.split("\\ontouml-models\\", 1)[1]
-        ttl_output = subprocess.run(f"ttl {catalog_path[2:]}\\{file_name}", shell=True, capture_output=True)
 
-        result = str(ttl_output.stdout)
-        result = result[2:-3].replace("\\n", " ")
+def validate_ttl_file(ttl_file: str) -> TtlSyntaxError | None:
+    """ Parses the ttl file, returning its syntax error or None if the file is valid.
+    Defined at module level so that it can be dispatched to worker processes.
+
+    :param ttl_file: Path of the ttl file to be validated.
+    :type ttl_file: str
+    :return: Syntax error found in the file, or None if the file is valid.
+    :rtype: TtlSyntaxError | None
+    """
+
+    try:
+        Graph().parse(ttl_file, format="turtle", encoding="utf-8")
+    except Exception as error:
+        return get_syntax_error(ttl_file, error)
+
+    return None
+
+
+def register_validation_result(catalog_path: str, ttl_file: str, syntax_error: TtlSyntaxError | None,
+                               num_validated: int, len_list_ttl_files: int, problems_list: list[TtlSyntaxError]):
+    """ Logs the result of the validation of a ttl file, adding its syntax error (if any) to the problems_list.
+
+    :param catalog_path: Path to the catalog directory, to which the reported file names are relative.
+    :type catalog_path: str
+    :param ttl_file: Path of the validated ttl file.
+    :type ttl_file: str
+    :param syntax_error: Syntax error found in the file, or None if the file is valid.
+    :type syntax_error: TtlSyntaxError | None
+    :param num_validated: Number of files validated so far, including this one.
+    :type num_validated: int
+    :param len_list_ttl_files: Total number of files to be validated.
+    :type len_list_ttl_files: int
+    :param problems_list: List of syntax errors found so far.
+    :type problems_list: list[TtlSyntaxError]
+    """
+
+    file_name = os.path.relpath(ttl_file, catalog_path)
+    if syntax_error is None:
+        LOGGER.debug(f"File {num_validated}/{len_list_ttl_files}: {file_name} is valid.")
+    else:
+        syntax_error.file_name = file_name
+        LOGGER.warning(f"File {num_validated}/{len_list_ttl_files} has invalid syntax. {syntax_error}")
+        problems_list.append(syntax_error)
 
-        if "Validator finished with 0 warnings and 0 errors" in result:
-            LOGGER.info(f"File {count + 1}/{len_list_ttl_files}: {file_name} is valid.")
-        else:
-            LOGGER.warning(f"File {count + 1}/{len_list_ttl_files}: {file_name} has invalid syntax. {result}")
-            problems_list.append(file_name)
+
+def report_validation_results(problems_list: list[TtlSyntaxError], num_validated: int,
+                              len_list_ttl_files: int) -> None:
+    """ Sorts the syntax errors found by file name and reports the validation's conclusion.
+
+    :param problems_list: List of syntax errors found.
+    :type problems_list: list[TtlSyntaxError]
+    :param num_validated: Number of files validated.
+    :type num_validated: int
+    :param len_list_ttl_files: Total number of files to be validated.
+    :type len_list_ttl_files: int
+    """
+
+    num_valid = num_validated - len(problems_list)
+    problems_list.sort(key=lambda problem: problem.file_name)
 
     if problems_list:
-        LOGGER.warning(f"VALIDATION FINISHED. The verification found {len(problems_list)} problem(s): {problems_list}")
+        LOGGER.warning(f"VALIDATION FINISHED. {num_validated} of {len_list_ttl_files} files validated: "
+                       f"{num_valid} valid and {len(problems_list)} invalid: "
+                       f"{[problem.file_name for problem in problems_list]}")
     else:
         LOGGER.info(f"VALIDATION FINISHED. No problems found in the verification of {len_list_ttl_files} files.")
+
+
+def validate_ttl_syntax(catalog_path: str, jobs: int = 1, fail_fast: bool = False) -> bool:
+    """ Validates the syntax of all ttl files in the catalog by parsing them, using a pool of worker processes if jobs
+    is greater than 1. If fail_fast is True, the validation stops at the first invalid file.
+
+    :param catalog_path: Path to the ontouml-models catalog directory provided by the user as argument.
+    :type catalog_path: str
+    :param jobs: Number of worker processes used for validating the files.
+    :type jobs: int
+    :param fail_fast: If True, stops the validation when the first invalid file is found.
+    :type fail_fast: bool
+    :return: True if all validated files are valid, False otherwise.
+    :rtype: bool
+    """
+
+    list_ttl_files = list_all_files_with_filetype(catalog_path, "ttl")
+    len_list_ttl_files = len(list_ttl_files)
+    LOGGER.info(f"Starting ttl syntax validation of {len_list_ttl_files} files in {catalog_path}.")
+
+    problems_list = []
+    num_validated = 0
+    progress_reporter = ProgressReporter("Validating files", len_list_ttl_files)
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker_process,
+                                 initargs=get_worker_settings()) as executor:
+            futures = {executor.submit(validate_ttl_file, ttl_file): ttl_file for ttl_file in list_ttl_files}
+            for future in as_completed(futures):
+                num_validated += 1
+                progress_reporter.update(futures[future])
+                register_validation_result(catalog_path, futures[future], future.result(), num_validated,
+                                           len_list_ttl_files, problems_list)
+                if fail_fast and problems_list:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    break
+    else:
+        for ttl_file in list_ttl_files:
+            num_validated += 1
+            syntax_error = validate_ttl_file(ttl_file)
+            progress_reporter.update(ttl_file)
+            register_validation_result(catalog_path, ttl_file, syntax_error, num_validated, len_list_ttl_files,
+                                       problems_list)
+            if fail_fast and problems_list:
+                break
+
+    progress_reporter.finish()
+    report_validation_results(problems_list, num_validated, len_list_ttl_files)
+
+    return not problems_list
@@ -0,0 +1,232 @@
+""" Catalog-wide store that keeps the graphs of all catalog files in memory, so that they are parsed only once and can
+be reused by all tools and by cross-dataset verifications. """
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from rdflib import Graph, URIRef, RDF
+
+from modules.logger_config import initialize_logger
+from modules.tools.data_quality.model_index import ONTOUML_CLASS, ONTOUML_GENERALIZATION, \
+    ONTOUML_GENERALIZATION_SET, NAMESPACE_ONTOUML
+from modules.utils.error_treatment import report_error_io_write
+from modules.utils.graph_cache import create_parse_order_graph, get_triples_in_parse_order, is_graph_cache_enabled, \
+    ParseOrderRecorder
+from modules.utils.progress_reporter import ProgressReporter
+from modules.utils.utils_catalog import list_all_files_with_filetype
+from modules.utils.utils_rdf import load_all_graph_safely
+from modules.utils.worker_processes import initialize_worker_process, get_worker_settings, map_with_bounded_window, \
+    TASKS_PER_WORKER
+
+LOGGER = initialize_logger()
+
+ONTOUML_RELATION = URIRef(NAMESPACE_ONTOUML + "Relation")
+
+STATISTICS_FILE_PATH = "results/catalog_statistics.csv"
+
+
+def read_file_triples(file_path: str) -> tuple[list[tuple], list[tuple]]:
+    """ Parses the file (or loads it from the graph cache, if enabled) and returns its namespaces and its triples in
+    parse order.
+    Defined at module level so that it can be dispatched to worker processes.
+
+    :param file_path: Path of the ttl file to be loaded.
+    :type file_path: str
+    :return: List of (prefix, namespace) pairs and list of triples.
+    :rtype: tuple[list[tuple], list[tuple]]
+    """
+
+    if is_graph_cache_enabled():
+        file_graph = load_all_graph_safely(file_path, keep_parse_order=True)
+    else:
+        # The triples are indexed only once, when added to the file's named graph
+        file_graph = Graph(store=ParseOrderRecorder())
+        file_graph.parse(file_path, encoding='utf-8')
+    namespaces = [(prefix, str(namespace)) for prefix, namespace in file_graph.namespaces()]
+
+    return namespaces, get_triples_in_parse_order(file_graph)
+
+
+class CatalogStore(object):
+    """ Store of named graphs, one per catalog file, whose terms are interned in a dictionary shared by all graphs, so
+    that a term used in many files is kept in memory only once.
+
+    Each named graph keeps its own indexes: rdflib's Memory store filters contexts by scanning the whole predicate
+    index, which would make every per-dataset lookup proportional to the whole catalog. Each graph also records the
+    parse order of its triples, so that it can be serialized deterministically (see get_triples_in_parse_order).
+
+    Attributes:
+        catalog_path: Normalized path of the catalog directory.
+        terms: Dictionary used for interning the terms of all graphs.
+        graphs: Maps the normalized path of each loaded file to its graph.
+        file_datasets: Maps the normalized path of each loaded file to the name of the dataset containing it, or to None
+            for files that are not inside a dataset's folder.
+    """
+
+    def __init__(self, catalog_path: str):
+        self.catalog_path = os.path.normpath(catalog_path)
+        self.terms = {}
+        self.graphs = {}
+        self.file_datasets = {}
+
+    def get_file_dataset(self, file_path: str) -> str | None:
+        """ Returns the name of the dataset whose folder (models/<dataset>) contains the file, or None. """
+
+        path_parts = os.path.relpath(file_path, self.catalog_path).split(os.sep)
+
+        if len(path_parts) > 2 and path_parts[0] == "models":
+            return path_parts[1]
+
+        return None
+
+    def add_file_triples(self, file_path: str, namespaces: list[tuple], triples: list[tuple]) -> Graph:
+        """ Creates the named graph of the file with the received namespaces and triples, interning its terms.
+
+        :param file_path: Path of the file from which the triples were read.
+        :type file_path: str
+        :param namespaces: List of (prefix, namespace) pairs bound in the file.
+        :type namespaces: list[tuple]
+        :param triples: Triples of the file, in parse order.
+        :type triples: list[tuple]
+        :return: Named graph of the file.
+        :rtype: Graph
+        """
+
+        file_path = os.path.normpath(file_path)
+        terms = self.terms
+
+        file_graph = create_parse_order_graph()
+        for prefix, namespace in namespaces:
+            file_graph.bind(prefix, namespace, override=True)
+        file_graph.addN((terms.setdefault(subj, subj), terms.setdefault(pred, pred), terms.setdefault(obj, obj),
+                         file_graph) for subj, pred, obj in triples)
+
+        self.graphs[file_path] = file_graph
+        self.file_datasets[file_path] = self.get_file_dataset(file_path)
+
+        return file_graph
+
+    def load_files(self, file_paths: list[str], jobs: int = 1) -> None:
+        """ Loads the received files into the store, in parallel if jobs is greater than 1.
+        Graphs are always added in the received order, so the store's content is the same for any number of jobs.
+
+        :param file_paths: List of paths of the ttl files to be loaded.
+        :type file_paths: list[str]
+        :param jobs: Number of worker processes used for parsing the files.
+        :type jobs: int
+        """
+
+        progress_reporter = ProgressReporter("Loading files into the catalog store", len(file_paths))
+
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker_process,
+                                     initargs=get_worker_settings()) as executor:
+                files_triples = map_with_bounded_window(executor, read_file_triples, file_paths,
+                                                        window_size=TASKS_PER_WORKER * jobs)
+                for file_path, (namespaces, triples) in zip(file_paths, files_triples):
+                    self.add_file_triples(file_path, namespaces, triples)
+                    progress_reporter.update(file_path, len(triples))
+        else:
+            for file_path in file_paths:
+                namespaces, triples = read_file_triples(file_path)
+                self.add_file_triples(file_path, namespaces, triples)
+                progress_reporter.update(file_path, len(triples))
+
+        progress_reporter.finish()
+
+    def load_catalog(self, jobs: int = 1) -> None:
+        """ Loads all ttl files of the catalog, except for the shape files. """
+
+        file_paths = [file_path for file_path in list_all_files_with_filetype(self.catalog_path, "ttl")
+                      if "-shape.ttl" not in file_path]
+
+        self.load_files(file_paths, jobs)
+        LOGGER.info(f"Catalog store loaded with {len(self.graphs)} files, "
+                    f"{sum(len(file_graph) for file_graph in self.graphs.values())} triples, "
+                    f"and {len(self.terms)} distinct terms.")
+
+    def get_graph(self, file_path: str) -> Graph | None:
+        """ Returns the named graph of the file, or None if the file was not loaded. """
+
+        return self.graphs.get(os.path.normpath(file_path))
+
+    def get_dataset_files(self, dataset_name: str) -> list[str]:
+        """ Returns the paths of all loaded files inside the dataset's folder. """
+
+        return [file_path for file_path, file_dataset in self.file_datasets.items() if file_dataset == dataset_name]
+
+    def quads(self, triple_pattern: tuple = (None, None, None)) -> Iterator[tuple]:
+        """ Yields (subject, predicate, object, file path) for all triples of all named graphs matching the pattern. """
+
+        for file_path, file_graph in self.graphs.items():
+            for subj, pred, obj in file_graph.triples(triple_pattern):
+                yield subj, pred, obj, file_path
+
+    def get_statistics(self) -> list[dict]:
+        """ Returns the statistics of each dataset and of the files outside datasets (reported with an empty dataset
+        name), calculated in a single pass over all named graphs. Besides the element counts, each dataset reports how
+        many of the IRIs it describes (i.e., used as subjects) are also described by other datasets.
+
+        :return: List of dictionaries with the statistics of each dataset, in dataset name order.
+        :rtype: list[dict]
+        """
+
+        counted_types = {"classes": ONTOUML_CLASS, "relations": ONTOUML_RELATION,
+                         "generalizations": ONTOUML_GENERALIZATION, "generalization_sets": ONTOUML_GENERALIZATION_SET}
+
+        statistics = {}
+        iri_datasets = {}
+
+        for file_path, file_graph in self.graphs.items():
+            dataset_name = self.file_datasets[file_path] or ""
+            dataset_statistics = statistics.setdefault(dataset_name, {"dataset": dataset_name, "files": 0,
+                                                                      "triples": 0, "subject_iris": set()})
+            dataset_statistics["files"] += 1
+            dataset_statistics["triples"] += len(file_graph)
+
+            for type_name, type_uri in counted_types.items():
+                dataset_statistics[type_name] = dataset_statistics.get(type_name, 0) + \
+                                                sum(1 for _ in file_graph.subjects(RDF.type, type_uri))
+
+            dataset_statistics["subject_iris"].update(subj for subj in file_graph.subjects(unique=True)
+                                                      if isinstance(subj, URIRef))
+
+        for dataset_statistics in statistics.values():
+            for iri in dataset_statistics["subject_iris"]:
+                iri_datasets[iri] = iri_datasets.get(iri, 0) + 1
+
+        statistics_list = []
+        for dataset_name in sorted(statistics):
+            dataset_statistics = statistics[dataset_name]
+            subject_iris = dataset_statistics.pop("subject_iris")
+            dataset_statistics["subject_iris"] = len(subject_iris)
+            dataset_statistics["shared_subject_iris"] = sum(1 for iri in subject_iris if iri_datasets[iri] > 1)
+            statistics_list.append(dataset_statistics)
+
+        return statistics_list
+
+
+def save_catalog_statistics(catalog_store: CatalogStore, statistics_file_path: str = STATISTICS_FILE_PATH) -> None:
+    """ Saves the statistics of all datasets in the catalog store as a csv file, one row per dataset.
+
+    :param catalog_store: Loaded catalog store.
+    :type catalog_store: CatalogStore
+    :param statistics_file_path: Path of the csv file to be written.
+    :type statistics_file_path: str
+    """
+
+    statistics_list = catalog_store.get_statistics()
+    if not statistics_list:
+        return
+
+    try:
+        os.makedirs(os.path.dirname(statistics_file_path), exist_ok=True)
+        with open(statistics_file_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(statistics_list[0]))
+            writer.writeheader()
+            writer.writerows(statistics_list)
+        LOGGER.info(f"Catalog statistics saved in {statistics_file_path}.")
+    except OSError as error:
+        report_error_io_write(statistics_file_path, "catalog statistics file", error)
@@ -0,0 +1,213 @@
+""" Compact read-only representation of a graph, in which terms are interned to integer ids and triples are kept in
+array-backed columns sorted by predicate. Used for verification work, requiring a fraction of the memory of rdflib's
+Memory store. """
+
+import pathlib
+from array import array
+from bisect import bisect_right
+from typing import Iterator
+
+from rdflib import Graph
+from rdflib.plugins.stores.memory import Memory
+from rdflib.util import guess_format
+
+from modules.logger_config import initialize_logger
+
+LOGGER = initialize_logger()
+
+
+class CompactTableSink(Memory):
+    """ Store used only as the destination of a parser. Triples are not indexed: their terms are interned to integer ids
+    and the triples are recorded in parse order (repeated ones are removed when the table is built). Namespace bindings
+    are kept by the Memory store as usual.
+    """
+
+    def __init__(self, configuration=None, identifier=None):
+        super().__init__(configuration, identifier)
+        self.terms = []
+        self.term_ids = {}
+        self.subject_ids = array("I")
+        self.predicate_ids = array("I")
+        self.object_ids = array("I")
+
+    def get_term_id(self, term) -> int:
+        """ Returns the id of the term, interning it if it was not seen before. """
+
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = self.term_ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def add(self, triple, context, quoted=False):
+        self.subject_ids.append(self.get_term_id(triple[0]))
+        self.predicate_ids.append(self.get_term_id(triple[1]))
+        self.object_ids.append(self.get_term_id(triple[2]))
+
+    def __len__(self, context=None):
+        return len(self.subject_ids)
+
+
+class CompactTripleTable(object):
+    """ Read-only table of a graph's distinct triples.
+
+    Terms are interned to integer ids and the triples' subjects and objects are kept in array('I') columns, grouped by
+    predicate. The predicate_offsets dictionary maps each predicate id to the range of its rows, so that the triples of
+    a predicate are a contiguous slice of the columns. Inside each predicate, rows are grouped by object (in order of
+    first appearance) and then ordered by parse order, which is the order in which rdflib's Memory store returns the
+    triples of a predicate. Verifications therefore obtain the same results, in the same order, from both.
+
+    Patterns with a bound subject use the subject index instead of scanning predicate ranges: subject_rows is a
+    permutation of the rows grouped by subject, and subject_offsets maps each subject id to the range of its rows in
+    it. As rows are kept in ascending order inside each subject, they are yielded in the same order as by the scan.
+
+    Implements the subset of the Graph interface used by the verifications: triples, subjects, objects, namespaces,
+    and len.
+    """
+
+    def __init__(self, table_sink: CompactTableSink, namespaces: list[tuple]):
+        self.terms = table_sink.terms
+        self.term_ids = table_sink.term_ids
+        self.namespace_bindings = namespaces
+
+        # Grouping rows by predicate and, inside each predicate, by object. Subjects are dictionary keys, so that
+        # repeated triples are removed keeping their first position.
+        predicate_groups = {}
+        for row in range(len(table_sink.subject_ids)):
+            predicate_groups.setdefault(table_sink.predicate_ids[row], {}) \
+                .setdefault(table_sink.object_ids[row], {})[table_sink.subject_ids[row]] = None
+
+        self.subject_ids = array("I")
+        self.object_ids = array("I")
+        self.predicate_offsets = {}
+
+        for predicate_id, object_groups in predicate_groups.items():
+            start = len(self.subject_ids)
+            for object_id, subject_ids in object_groups.items():
+                self.subject_ids.extend(subject_ids)
+                self.object_ids.extend([object_id] * len(subject_ids))
+            self.predicate_offsets[predicate_id] = (start, len(self.subject_ids))
+
+        # Predicate of each row, found by bisecting the starts of the predicate ranges
+        self.range_starts = array("I", (start for start, _ in self.predicate_offsets.values()))
+        self.range_predicate_ids = list(self.predicate_offsets)
+
+        # Subject index: rows grouped by subject, in ascending order inside each subject
+        subject_groups = {}
+        for row, subject_id in enumerate(self.subject_ids):
+            subject_groups.setdefault(subject_id, []).append(row)
+
+        self.subject_rows = array("I")
+        self.subject_offsets = {}
+        for subject_id, rows in subject_groups.items():
+            start = len(self.subject_rows)
+            self.subject_rows.extend(rows)
+            self.subject_offsets[subject_id] = (start, len(self.subject_rows))
+
+    def __len__(self) -> int:
+        return len(self.subject_ids)
+
+    def namespaces(self) -> Iterator[tuple]:
+        """ Yields the (prefix, namespace) pairs bound in the parsed file. """
+
+        yield from self.namespace_bindings
+
+    def triples(self, triple_pattern: tuple) -> Iterator[tuple]:
+        """ Yields the triples matching the (subject, predicate, object) pattern, in which None matches any term. """
+
+        terms = self.terms
+
+        # A term that is not in the table cannot match any triple
+        pattern_ids = []
+        for term in triple_pattern:
+            if term is None:
+                pattern_ids.append(None)
+            elif term in self.term_ids:
+                pattern_ids.append(self.term_ids[term])
+            else:
+                return
+        subject_id, predicate_id, object_id = pattern_ids
+
+        if subject_id is not None:
+            yield from self.get_subject_triples(subject_id, predicate_id, object_id)
+            return
+
+        if predicate_id is None:
+            predicate_ranges = self.predicate_offsets.items()
+        else:
+            predicate_ranges = [(predicate_id, self.predicate_offsets.get(predicate_id, (0, 0)))]
+
+        for current_predicate_id, (start, end) in predicate_ranges:
+            predicate = terms[current_predicate_id]
+            for row in range(start, end):
+                if (subject_id is None or self.subject_ids[row] == subject_id) and \
+                        (object_id is None or self.object_ids[row] == object_id):
+                    yield terms[self.subject_ids[row]], predicate, terms[self.object_ids[row]]
+
+    def get_subject_triples(self, subject_id: int, predicate_id: int | None, object_id: int | None) -> Iterator[tuple]:
+        """ Yields the triples of the subject matching the predicate and object ids, in which None matches any term,
+        using the subject index. """
+
+        terms = self.terms
+        subject = terms[subject_id]
+        start, end = self.subject_offsets.get(subject_id, (0, 0))
+
+        if predicate_id is not None:
+            predicate_start, predicate_end = self.predicate_offsets.get(predicate_id, (0, 0))
+
+        for index in range(start, end):
+            row = self.subject_rows[index]
+            if predicate_id is None:
+                row_predicate_id = self.range_predicate_ids[bisect_right(self.range_starts, row) - 1]
+            elif predicate_start <= row < predicate_end:
+                row_predicate_id = predicate_id
+            else:
+                continue
+            if object_id is None or self.object_ids[row] == object_id:
+                yield subject, terms[row_predicate_id], terms[self.object_ids[row]]
+
+    def subjects(self, predicate=None, object_node=None) -> Iterator:
+        """ Yields the subjects of the triples with the received predicate and object. """
+
+        for subj, _, _ in self.triples((None, predicate, object_node)):
+            yield subj
+
+    def objects(self, subject_node=None, predicate=None) -> Iterator:
+        """ Yields the objects of the triples with the received subject and predicate. """
+
+        for _, _, obj in self.triples((subject_node, predicate, None)):
+            yield obj
+
+
+def load_compact_table_safely(ontology_location: str, ontology_content: bytes = None) -> CompactTripleTable:
+    """ Parses the file directly into a compact triple table, without building rdflib's indexes.
+    The graph cache is not used, as cached graphs would have to be fully loaded before being converted.
+    When ontology_content is provided, it is parsed instead of reading the file again.
+
+    :param ontology_location: Path of the file to be loaded.
+    :type ontology_location: str
+    :param ontology_content: Already read content of the file, or None.
+    :type ontology_content: bytes
+    :return: Compact table with the file's triples.
+    :rtype: CompactTripleTable
+    """
+
+    table_sink = CompactTableSink()
+    sink_graph = Graph(store=table_sink)
+
+    try:
+        if ontology_content is None:
+            sink_graph.parse(ontology_location, encoding='utf-8')
+        else:
+            sink_graph.parse(data=ontology_content, format=guess_format(ontology_location) or "turtle",
+                             publicID=pathlib.Path(ontology_location).absolute().as_uri())
+    except OSError as error:
+        LOGGER.error(f"Could not load {ontology_location}. Exiting program.\n"
+                     f"System error reported: {error}")
+        exit(1)
+
+    namespaces = list(sink_graph.namespaces())
+
+    LOGGER.debug(f"Ontology {ontology_location} successfully loaded to a compact triple table.")
+
+    return CompactTripleTable(table_sink, namespaces)
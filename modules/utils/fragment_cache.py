@@ -0,0 +1,133 @@
+""" Persistent on-disk cache of release fragments, used for skipping the parsing and serialization of unchanged files
+when generating the release file. """
+
+import hashlib
+import os
+import pathlib
+import tempfile
+
+from modules.logger_config import initialize_logger
+from modules.utils.utils_general import get_file_hash
+
+LOGGER = initialize_logger()
+
+FRAGMENT_CACHE_DIRECTORY = ".cache/release_fragments/"
+FRAGMENT_CACHE_EXTENSION = ".nt"
+
+
+def create_fragment_cache_directory(directory_path: str = FRAGMENT_CACHE_DIRECTORY) -> bool:
+    """ Creates the fragment cache directory if it does not exist.
+
+    :param directory_path: Directory in which cached fragments are stored.
+    :type directory_path: str
+    :return: True if the directory is available, False if it could not be created (i.e., the cache cannot be used).
+    :rtype: bool
+    """
+
+    try:
+        os.makedirs(directory_path, exist_ok=True)
+    except OSError as error:
+        LOGGER.warning(f"Could not create release fragment cache directory {directory_path}. Cache disabled. "
+                       f"System error reported: {error}")
+        return False
+
+    return True
+
+
+def get_fragment_cache_key(file_path: str, label_seed: str) -> str:
+    """ Returns the cache key of the fragment of a file, composed by the file's URI, the seed of its blank node labels,
+    and its content hash.
+    A fragment does not depend only on its file's content: relative IRIs are resolved against the file's URI, used as
+    base by the parser, so the same content at another path may produce other triples.
+
+    :param file_path: Path of the ttl file.
+    :type file_path: str
+    :param label_seed: Seed of the fragment's blank node labels, obtained with get_fragment_label_seed.
+    :type label_seed: str
+    :return: Hexadecimal digest identifying the fragment.
+    :rtype: str
+    """
+
+    key_content = f"{pathlib.Path(file_path).absolute().as_uri()}\n{label_seed}\n{get_file_hash(file_path)}"
+
+    return hashlib.sha256(key_content.encode("utf-8")).hexdigest()
+
+
+def get_fragment_path(cache_key: str, directory_path: str = FRAGMENT_CACHE_DIRECTORY) -> str:
+    """ Returns the path of the cache entry of the fragment with the received key. """
+
+    return os.path.join(directory_path, cache_key + FRAGMENT_CACHE_EXTENSION)
+
+
+def is_fragment_cached(cache_key: str, directory_path: str = FRAGMENT_CACHE_DIRECTORY) -> bool:
+    """ Returns True if the fragment with the received key is cached. """
+
+    return os.path.isfile(get_fragment_path(cache_key, directory_path))
+
+
+def load_cached_fragment(cache_key: str, directory_path: str = FRAGMENT_CACHE_DIRECTORY) -> bytes | None:
+    """ Returns the cached fragment with the received key, or None if it is not available.
+
+    :param cache_key: Key obtained with get_fragment_cache_key.
+    :type cache_key: str
+    :param directory_path: Directory in which cached fragments are stored.
+    :type directory_path: str
+    :return: UTF-8 encoded N-Triples fragment, or None in case of cache miss.
+    :rtype: bytes | None
+    """
+
+    entry_path = get_fragment_path(cache_key, directory_path)
+
+    try:
+        with open(entry_path, "rb") as entry_file:
+            return entry_file.read()
+    except FileNotFoundError:
+        return None
+    except OSError as error:
+        LOGGER.debug(f"Discarding unreadable release fragment cache entry {entry_path}. "
+                     f"System error reported: {error}")
+        return None
+
+
+def store_cached_fragment(cache_key: str, fragment: bytes, directory_path: str = FRAGMENT_CACHE_DIRECTORY) -> None:
+    """ Stores the fragment with the received key in the cache.
+
+    :param cache_key: Key obtained with get_fragment_cache_key.
+    :type cache_key: str
+    :param fragment: UTF-8 encoded N-Triples fragment returned by serialize_release_fragment.
+    :type fragment: bytes
+    :param directory_path: Directory in which cached fragments are stored.
+    :type directory_path: str
+    """
+
+    entry_path = get_fragment_path(cache_key, directory_path)
+
+    try:
+        # Writing to a temporary file first, so that an interrupted execution never leaves partial entries
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory_path)
+        with os.fdopen(file_descriptor, "wb") as entry_file:
+            entry_file.write(fragment)
+        os.replace(temporary_path, entry_path)
+    except OSError as error:
+        LOGGER.warning(f"Could not write release fragment cache entry {entry_path}. System error reported: {error}")
+
+
+def prune_fragment_cache(used_keys: set[str], directory_path: str = FRAGMENT_CACHE_DIRECTORY) -> None:
+    """ Removes the cached fragments that were not used in the last release, i.e., of files that were changed or
+    removed from the catalog, so that the cache size follows the size of the release file.
+
+    :param used_keys: Keys of the fragments included in the last release.
+    :type used_keys: set[str]
+    :param directory_path: Directory in which cached fragments are stored.
+    :type directory_path: str
+    """
+
+    with os.scandir(directory_path) as directory_entries:
+        for entry in directory_entries:
+            if entry.is_file() and entry.name.endswith(FRAGMENT_CACHE_EXTENSION) and \
+                    entry.name[:-len(FRAGMENT_CACHE_EXTENSION)] not in used_keys:
+                try:
+                    os.remove(entry.path)
+                    LOGGER.debug(f"Release fragment cache entry {entry.path} removed.")
+                except FileNotFoundError:
+                    pass
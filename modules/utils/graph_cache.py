@@ -0,0 +1,241 @@
+""" Persistent on-disk cache of parsed graphs, used for skipping the Turtle parsing of unchanged files. """
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+from rdflib import Graph
+from rdflib.plugins.stores.memory import Memory
+
+from modules.logger_config import initialize_logger
+
+LOGGER = initialize_logger()
+
+GRAPH_CACHE_DIRECTORY = ".cache/graphs/"
+GRAPH_CACHE_EXTENSION = ".pickle"
+
+# Cache settings. The cache is disabled while the directory is None.
+cache_directory = None
+cache_max_size = 0
+
+# Size of the cache directory known by this process, obtained by scanning it once and then adding the size of each
+# stored entry, so that it is only scanned again when the size limit seems to be exceeded. None until the first store.
+known_cache_size = None
+
+
+class InsertionOrderMemory(Memory):
+    """ Memory store that records the order in which triples are added.
+    Replaying the recorded order when loading a cached graph rebuilds the same internal indexes obtained by parsing,
+    so that iterating over the cached graph yields triples in the same order as iterating over the parsed one.
+    """
+
+    def __init__(self, configuration=None, identifier=None):
+        super().__init__(configuration, identifier)
+        self.added_triples = []
+
+    def add(self, triple, context, quoted=False):
+        self.added_triples.append(triple)
+        super().add(triple, context, quoted)
+
+
+class ParseOrderRecorder(Memory):
+    """ Store used only as the destination of a parser, when the parsed triples are going to be copied to another
+    graph. Triples are recorded in parse order, the same way as by InsertionOrderMemory, but are not indexed, so the
+    graph cannot be queried. Namespace bindings are kept by the Memory store as usual.
+    """
+
+    def __init__(self, configuration=None, identifier=None):
+        super().__init__(configuration, identifier)
+        self.added_triples = []
+
+    def add(self, triple, context, quoted=False):
+        self.added_triples.append(triple)
+
+    def __len__(self, context=None):
+        return len(self.added_triples)
+
+
+def configure_graph_cache(directory_path: str | None, max_size_mb: int = 1024) -> None:
+    """ Enables the graph cache using the received directory, or disables it if directory_path is None.
+    Also used as initializer of worker processes, as their settings are not inherited on every platform.
+
+    :param directory_path: Directory in which cached graphs are stored.
+    :type directory_path: str | None
+    :param max_size_mb: Maximum size in megabytes of all cached graphs. Least recently used ones are evicted first.
+    :type max_size_mb: int
+    """
+
+    global cache_directory, cache_max_size, known_cache_size
+
+    cache_directory = directory_path
+    cache_max_size = max_size_mb * 1024 * 1024
+    known_cache_size = None
+
+    if cache_directory is not None:
+        try:
+            os.makedirs(cache_directory, exist_ok=True)
+        except OSError as error:
+            LOGGER.warning(f"Could not create graph cache directory {cache_directory}. Cache disabled. "
+                           f"System error reported: {error}")
+            cache_directory = None
+
+
+def get_graph_cache_settings() -> tuple:
+    """ Returns the current cache settings in the format expected by configure_graph_cache. """
+
+    return cache_directory, cache_max_size // (1024 * 1024)
+
+
+def is_graph_cache_enabled() -> bool:
+    """ Returns True if the graph cache is enabled. """
+
+    return cache_directory is not None
+
+
+def get_graph_cache_key(file_path: str) -> str:
+    """ Returns the cache key of a file, composed by its path, size and modification time.
+    The file's content is not read, so that a cache hit does not cost a full read of the file besides the entry's.
+
+    :param file_path: Path to the file to have its key calculated.
+    :type file_path: str
+    :return: Hexadecimal digest identifying the file's current version.
+    :rtype: str
+    """
+
+    file_stat = os.stat(file_path)
+    key_content = f"{os.path.abspath(file_path)}\n{file_stat.st_size}\n{file_stat.st_mtime_ns}"
+
+    return hashlib.sha256(key_content.encode("utf-8")).hexdigest()
+
+
+def load_cached_graph(cache_key: str, keep_parse_order: bool = False) -> Graph | None:
+    """ Returns the graph cached with the received key, or None if it is not available in the cache.
+
+    :param cache_key: Key obtained with get_graph_cache_key.
+    :type cache_key: str
+    :param keep_parse_order: If True, the returned graph's store records the original parse order of its triples.
+    :type keep_parse_order: bool
+    :return: Cached graph, or None in case of cache miss.
+    :rtype: Graph | None
+    """
+
+    entry_path = os.path.join(cache_directory, cache_key + GRAPH_CACHE_EXTENSION)
+
+    try:
+        with open(entry_path, "rb") as entry_file:
+            namespaces, triples = pickle.load(entry_file)
+        # Updating modification time, used as last access time by the LRU eviction
+        os.utime(entry_path)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError) as error:
+        LOGGER.debug(f"Discarding unreadable graph cache entry {entry_path}. System error reported: {error}")
+        return None
+
+    cached_graph = create_parse_order_graph() if keep_parse_order else Graph()
+    for prefix, namespace in namespaces:
+        cached_graph.bind(prefix, namespace, override=True)
+    cached_graph.addN((subj, pred, obj, cached_graph) for subj, pred, obj in triples)
+
+    return cached_graph
+
+
+def create_parse_order_graph() -> Graph:
+    """ Returns an empty graph whose store records the order of the triples that are parsed into it. """
+
+    return Graph(store=InsertionOrderMemory())
+
+
+def get_triples_in_parse_order(graph: Graph) -> list[tuple]:
+    """ Returns the distinct triples of a graph created with create_parse_order_graph (or whose store is a
+    ParseOrderRecorder), in the order they were parsed.
+    Differently from iterating over the graph, this order is the same in every execution.
+    """
+
+    return list(dict.fromkeys(graph.store.added_triples))
+
+
+def store_cached_graph(cache_key: str, graph: Graph) -> None:
+    """ Stores the graph in the cache and evicts the least recently used entries if the size limit is exceeded.
+    Terms are interned before pickling, so that each repeated term is stored and loaded only once.
+
+    :param cache_key: Key obtained with get_graph_cache_key.
+    :type cache_key: str
+    :param graph: Parsed graph to be cached, created with create_parse_order_graph.
+    :type graph: Graph
+    """
+
+    global known_cache_size
+
+    interned_terms = {}
+    triples = [tuple(interned_terms.setdefault(term, term) for term in triple)
+               for triple in graph.store.added_triples]
+    namespaces = [(prefix, str(namespace)) for prefix, namespace in graph.namespaces()]
+
+    entry_path = os.path.join(cache_directory, cache_key + GRAPH_CACHE_EXTENSION)
+
+    try:
+        # Writing to a temporary file first, so that concurrent processes never read partial entries
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=cache_directory)
+    except OSError as error:
+        LOGGER.warning(f"Could not write graph cache entry {entry_path}. System error reported: {error}")
+        return
+
+    try:
+        with os.fdopen(file_descriptor, "wb") as entry_file:
+            pickle.dump((namespaces, triples), entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+            entry_size = entry_file.tell()
+        os.replace(temporary_path, entry_path)
+    except OSError as error:
+        LOGGER.warning(f"Could not write graph cache entry {entry_path}. System error reported: {error}")
+        return
+    finally:
+        # The temporary file is only left behind by failed writes, including errors raised while pickling the graph
+        if os.path.exists(temporary_path):
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+
+    # Entries stored by other processes are only counted when the directory is scanned, which happens at least once
+    # per process and whenever the limit seems to be exceeded
+    if known_cache_size is None or known_cache_size + entry_size > cache_max_size:
+        known_cache_size = evict_graph_cache_entries()
+    else:
+        known_cache_size += entry_size
+
+
+def evict_graph_cache_entries() -> int:
+    """ Removes the least recently used cache entries until the cache size is within its limit.
+
+    :return: Size in bytes of the remaining cache entries.
+    :rtype: int
+    """
+
+    entries = []
+    total_size = 0
+
+    with os.scandir(cache_directory) as directory_entries:
+        for entry in directory_entries:
+            if entry.is_file() and entry.name.endswith(GRAPH_CACHE_EXTENSION):
+                try:
+                    entry_stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry.path))
+                total_size += entry_stat.st_size
+
+    entries.sort()
+
+    for _, entry_size, entry_path in entries:
+        if total_size <= cache_max_size:
+            break
+        try:
+            os.remove(entry_path)
+            LOGGER.debug(f"Graph cache entry {entry_path} evicted.")
+        except FileNotFoundError:
+            pass
+        total_size -= entry_size
+
+    return total_size
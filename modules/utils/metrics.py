@@ -0,0 +1,143 @@
+""" Instrumentation of executions: timing and memory metrics of each processed item and profiling of the slowest
+ones. """
+
+import cProfile
+import csv
+import io
+import os
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import psutil
+
+from modules.logger_config import initialize_logger
+from modules.utils.error_treatment import report_error_io_write
+from modules.utils.graph_cache import configure_graph_cache, get_graph_cache_settings
+
+LOGGER = initialize_logger()
+
+PROFILES_DIRECTORY = "results/profiles/"
+
+# Number of entries reported in the profile summaries
+PROFILE_STATS_LINES = 40
+PROFILE_MEMORY_LINES = 25
+
+
+@contextmanager
+def measure_time(metrics: dict, metric_name: str):
+    """ Context manager that stores in metrics[metric_name] the time in seconds spent inside it.
+
+    :param metrics: Dictionary in which the measured time is stored.
+    :type metrics: dict
+    :param metric_name: Name of the measured metric.
+    :type metric_name: str
+    """
+
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics[metric_name] = round(time.perf_counter() - start_time, 6)
+
+
+def get_memory_metrics() -> dict[str, float]:
+    """ Returns the current and the peak resident set size (RSS), in megabytes, of the current process.
+    The peak is the highest value reached by the process so far, so in worker processes it may have been reached while
+    evaluating a previous item.
+
+    :return: Dictionary with the rss_mb and peak_rss_mb metrics.
+    :rtype: dict[str, float]
+    """
+
+    memory_info = psutil.Process().memory_info()
+
+    # psutil only reports the peak on Windows. On other platforms it is obtained from the resource module.
+    if hasattr(memory_info, "peak_wset"):
+        peak_rss = memory_info.peak_wset
+    else:
+        import resource
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+        if sys.platform != "darwin":
+            peak_rss *= 1024
+
+    return {"rss_mb": round(memory_info.rss / (1024 * 1024), 2),
+            "peak_rss_mb": round(max(peak_rss, memory_info.rss) / (1024 * 1024), 2)}
+
+
+def write_metrics_file(metrics_list: list[dict], metrics_file_path: str) -> None:
+    """ Writes the metrics of all processed items to a csv file, one row per item. The header contains all metrics
+    found, in order of first appearance.
+
+    :param metrics_list: List of dictionaries with the metrics of each item.
+    :type metrics_list: list[dict]
+    :param metrics_file_path: Path of the csv file to be written.
+    :type metrics_file_path: str
+    """
+
+    header = list(dict.fromkeys(metric_name for metrics in metrics_list for metric_name in metrics))
+
+    try:
+        with open(metrics_file_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=header)
+            writer.writeheader()
+            writer.writerows(metrics_list)
+        LOGGER.info(f"Execution metrics saved in {metrics_file_path}.")
+    except OSError as error:
+        report_error_io_write(metrics_file_path, "metrics file", error)
+
+
+def get_slowest_items(metrics_list: list[dict], time_metric: str, number_items: int) -> list[dict]:
+    """ Returns the metrics of the number_items items with the highest value for the time_metric. """
+
+    return sorted(metrics_list, key=lambda metrics: metrics[time_metric], reverse=True)[:number_items]
+
+
+def profile_execution(profile_name: str, function, *arguments) -> None:
+    """ Executes the function with the received arguments under cProfile and tracemalloc, saving in the profiles
+    directory a binary cProfile file (readable with pstats or snakeviz), a summary of the functions with the highest
+    cumulative time, and a summary of the source lines that allocated most memory.
+    The graph cache is disabled during the execution, so that the parsing is also profiled.
+
+    :param profile_name: Name used for the generated files. Characters not allowed in file names are replaced.
+    :type profile_name: str
+    :param function: Function to be profiled.
+    :type function: Callable
+    :param arguments: Arguments passed to the function.
+    """
+
+    file_prefix = os.path.join(PROFILES_DIRECTORY, re.sub(r"[^\w.-]", "_", profile_name))
+    cache_settings = get_graph_cache_settings()
+    configure_graph_cache(None)
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        profiler.runcall(function, *arguments)
+        memory_snapshot = tracemalloc.take_snapshot()
+        memory_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        configure_graph_cache(*cache_settings)
+
+    stats_output = io.StringIO()
+    pstats.Stats(profiler, stream=stats_output).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_STATS_LINES)
+
+    memory_lines = [f"Peak traced memory: {memory_peak / (1024 * 1024):.2f} MB", ""]
+    memory_lines += [str(statistic) for statistic in
+                     memory_snapshot.statistics("lineno")[:PROFILE_MEMORY_LINES]]
+
+    try:
+        os.makedirs(PROFILES_DIRECTORY, exist_ok=True)
+        profiler.dump_stats(file_prefix + ".prof")
+        with open(file_prefix + "_time.txt", 'w', encoding='utf-8') as f:
+            f.write(stats_output.getvalue())
+        with open(file_prefix + "_memory.txt", 'w', encoding='utf-8') as f:
+            f.write("\n".join(memory_lines) + "\n")
+        LOGGER.info(f"Profile of {profile_name} saved in {file_prefix}.prof, _time.txt and _memory.txt.")
+    except OSError as error:
+        report_error_io_write(file_prefix, "profile files", error)
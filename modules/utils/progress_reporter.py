@@ -0,0 +1,72 @@
+""" Rate-limited reporting of the progress of the tools' loops over files and datasets. """
+import time
+
+from modules.logger_config import initialize_logger
+
+LOGGER = initialize_logger()
+
+# Minimum interval in seconds between two progress reports of the same loop
+PROGRESS_REPORT_INTERVAL = 2.0
+
+
+class ProgressReporter(object):
+    """ Reports the progress of a loop over a known number of items (e.g., files or datasets) at most once every
+    report_interval seconds, with its throughput in items and triples per second. Each processed item is logged only at
+    DEBUG level, so that long loops do not produce one console line per item.
+
+    Attributes:
+        description: Description of the loop, starting each report.
+        total_items: Number of items to be processed.
+        items_name: Name of the items in the reports (e.g., files).
+        report_interval: Minimum interval in seconds between two reports.
+        processed_items: Number of items processed so far.
+        processed_triples: Number of triples of the items processed so far.
+    """
+
+    def __init__(self, description: str, total_items: int, items_name: str = "files",
+                 report_interval: float = PROGRESS_REPORT_INTERVAL):
+        self.description = description
+        self.total_items = total_items
+        self.items_name = items_name
+        self.report_interval = report_interval
+        self.processed_items = 0
+        self.processed_triples = 0
+        self.start_time = time.perf_counter()
+        self.last_report_time = self.start_time
+
+    def update(self, item_name: str, triples: int = 0) -> None:
+        """ Registers a processed item, reporting the progress if the report interval has passed since the last report.
+
+        :param item_name: Name of the processed item (e.g., file path or dataset name), logged at DEBUG level.
+        :type item_name: str
+        :param triples: Number of triples of the processed item, or 0 if not counted.
+        :type triples: int
+        """
+
+        self.processed_items += 1
+        self.processed_triples += triples
+        LOGGER.debug(f"{self.description} {self.processed_items}/{self.total_items}: {item_name}")
+
+        current_time = time.perf_counter()
+        if current_time - self.last_report_time >= self.report_interval:
+            self.last_report_time = current_time
+            LOGGER.info(self.get_progress_message(current_time))
+
+    def finish(self) -> None:
+        """ Reports the number of processed items and the throughput of the whole loop. """
+
+        LOGGER.info(self.get_progress_message(time.perf_counter()))
+
+    def get_progress_message(self, current_time: float) -> str:
+        """ Returns the message reporting the progress until the received time, obtained with time.perf_counter. """
+
+        elapsed_time = max(current_time - self.start_time, 1e-6)
+        percentage = self.processed_items / self.total_items if self.total_items else 1
+
+        message = f"{self.description}: {self.processed_items}/{self.total_items} {self.items_name} " \
+                  f"({percentage:.0%}) in {elapsed_time:.1f} seconds, " \
+                  f"{self.processed_items / elapsed_time:.1f} {self.items_name}/s"
+        if self.processed_triples:
+            message += f", {self.processed_triples / elapsed_time:.0f} triples/s"
+
+        return message + "."
@@ -0,0 +1,247 @@
+""" Lightweight closure engine that computes only the transitive rdfs:subClassOf hierarchy and the rdf:type
+inheritance, used as a faster alternative to the full RDFS reasoning when only the taxonomy is needed. """
+
+from rdflib import RDF, RDFS, Graph, Literal
+
+from modules.logger_config import initialize_logger
+
+LOGGER = initialize_logger()
+
+
+class TaxonomyClosure(object):
+    """ Adjacency index of a graph's taxonomy and its closure.
+
+    The closure is calculated with the strongly connected components of the subclass hierarchy, which are obtained
+    (with Tarjan's algorithm) in reverse topological order, so that the superclasses of each component are known when
+    it is processed. Cycles in the hierarchy are therefore treated as equivalent classes, as in RDFS.
+
+    Triples added after the creation are treated incrementally with add_triples, which updates only the pairs of
+    classes affected by each new subclass edge instead of recalculating the whole closure.
+
+    Attributes:
+        direct_superclasses: Maps each class to its asserted superclasses.
+        superclasses: Maps each class to all classes it is a (direct or inferred) subclass of.
+        subclasses: Maps each class to all classes that are (direct or inferred) subclasses of it.
+        direct_types: Maps each instance to its asserted types.
+        direct_instances: Maps each class to its instances with asserted types.
+    """
+
+    def __init__(self, ontology_graph: Graph):
+        self.direct_superclasses = {}
+        self.direct_types = {}
+        self.direct_instances = {}
+
+        for subclass, superclass in ontology_graph.subject_objects(RDFS.subClassOf):
+            if not isinstance(superclass, Literal):
+                self.direct_superclasses.setdefault(subclass, set()).add(superclass)
+                self.direct_superclasses.setdefault(superclass, set())
+
+        for instance, class_node in ontology_graph.subject_objects(RDF.type):
+            if not isinstance(class_node, Literal):
+                self.direct_types.setdefault(instance, set()).add(class_node)
+                self.direct_instances.setdefault(class_node, set()).add(instance)
+
+        self.superclasses = self.calculate_superclasses()
+        self.subclasses = {class_node: set() for class_node in self.superclasses}
+        for class_node, class_superclasses in self.superclasses.items():
+            for superclass in class_superclasses:
+                self.subclasses[superclass].add(class_node)
+
+    def get_strongly_connected_components(self) -> list[list]:
+        """ Returns the strongly connected components of the subclass hierarchy in reverse topological order, i.e.,
+        each component is returned after all components containing its superclasses. Iterative version of Tarjan's
+        algorithm, so that deep hierarchies do not exceed the recursion limit.
+
+        :return: List of components, each one a list of classes.
+        :rtype: list[list]
+        """
+
+        indexes = {}
+        low_links = {}
+        stack = []
+        on_stack = set()
+        components = []
+
+        for root in self.direct_superclasses:
+            if root in indexes:
+                continue
+
+            indexes[root] = low_links[root] = len(indexes)
+            stack.append(root)
+            on_stack.add(root)
+            work_stack = [(root, iter(self.direct_superclasses[root]))]
+
+            while work_stack:
+                node, successors = work_stack[-1]
+                for successor in successors:
+                    if successor not in indexes:
+                        indexes[successor] = low_links[successor] = len(indexes)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work_stack.append((successor, iter(self.direct_superclasses[successor])))
+                        break
+                    if successor in on_stack:
+                        low_links[node] = min(low_links[node], indexes[successor])
+                else:
+                    work_stack.pop()
+                    if work_stack:
+                        parent = work_stack[-1][0]
+                        low_links[parent] = min(low_links[parent], low_links[node])
+                    if low_links[node] == indexes[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+
+        return components
+
+    def calculate_superclasses(self) -> dict:
+        """ Returns a dictionary mapping each class to the set of all its superclasses, calculated component by
+        component in reverse topological order. Members of cyclic components are superclasses of each other and of
+        themselves.
+
+        :return: Dictionary mapping each class to the set of its superclasses.
+        :rtype: dict
+        """
+
+        superclasses = {}
+
+        for component in self.get_strongly_connected_components():
+            component_members = set(component)
+            component_superclasses = set()
+
+            is_cyclic = len(component) > 1 or component[0] in self.direct_superclasses[component[0]]
+            if is_cyclic:
+                component_superclasses |= component_members
+
+            for member in component:
+                for superclass in self.direct_superclasses[member]:
+                    if superclass not in component_members:
+                        component_superclasses.add(superclass)
+                        component_superclasses |= superclasses[superclass]
+
+            for member in component:
+                superclasses[member] = component_superclasses
+
+        # Members of the same component share the set while it is built, but are updated independently afterwards
+        return {class_node: set(class_superclasses) for class_node, class_superclasses in superclasses.items()}
+
+    def get_types(self, instance) -> set:
+        """ Returns all (asserted and inferred) types of the instance. """
+
+        instance_types = set()
+
+        for class_node in self.direct_types.get(instance, ()):
+            instance_types.add(class_node)
+            instance_types |= self.superclasses.get(class_node, set())
+
+        return instance_types
+
+    def get_inferred_triples(self) -> set[tuple]:
+        """ Returns all rdfs:subClassOf and rdf:type triples of the closure, including the asserted ones. """
+
+        closure_triples = set()
+
+        for class_node, class_superclasses in self.superclasses.items():
+            for superclass in class_superclasses:
+                closure_triples.add((class_node, RDFS.subClassOf, superclass))
+
+        for instance in self.direct_types:
+            for class_node in self.get_types(instance):
+                closure_triples.add((instance, RDF.type, class_node))
+
+        return closure_triples
+
+    def add_subclass(self, subclass, superclass) -> set[tuple]:
+        """ Adds an rdfs:subClassOf edge to the index, updating the closure incrementally.
+        Every class that reaches the subclass (including itself) becomes a subclass of every class reached by the
+        superclass (including itself), and the instances of the former receive the latter as types.
+
+        :return: Set of triples entailed by the new edge that were not previously in the closure.
+        :rtype: set[tuple]
+        """
+
+        for class_node in (subclass, superclass):
+            if class_node not in self.direct_superclasses:
+                self.direct_superclasses[class_node] = set()
+                self.superclasses[class_node] = set()
+                self.subclasses[class_node] = set()
+
+        if superclass in self.direct_superclasses[subclass]:
+            return set()
+        self.direct_superclasses[subclass].add(superclass)
+
+        lower_classes = self.subclasses[subclass] | {subclass}
+        upper_classes = self.superclasses[superclass] | {superclass}
+
+        new_triples = set()
+
+        for lower_class in lower_classes:
+            new_superclasses = upper_classes - self.superclasses[lower_class]
+            if not new_superclasses:
+                continue
+            self.superclasses[lower_class] |= new_superclasses
+            for new_superclass in new_superclasses:
+                self.subclasses[new_superclass].add(lower_class)
+                new_triples.add((lower_class, RDFS.subClassOf, new_superclass))
+            for instance in self.direct_instances.get(lower_class, ()):
+                for new_superclass in new_superclasses:
+                    new_triples.add((instance, RDF.type, new_superclass))
+
+        return new_triples
+
+    def add_type(self, instance, class_node) -> set[tuple]:
+        """ Adds an rdf:type assertion to the index.
+
+        :return: Set of triples entailed by the new assertion that were not previously in the closure.
+        :rtype: set[tuple]
+        """
+
+        previous_types = self.get_types(instance)
+
+        self.direct_types.setdefault(instance, set()).add(class_node)
+        self.direct_instances.setdefault(class_node, set()).add(instance)
+
+        return {(instance, RDF.type, new_type) for new_type in self.get_types(instance) - previous_types}
+
+    def add_triples(self, triples) -> set[tuple]:
+        """ Adds the rdfs:subClassOf and rdf:type triples received to the index, ignoring all others.
+
+        :return: Set of triples entailed by the received triples that were not previously in the closure.
+        :rtype: set[tuple]
+        """
+
+        new_triples = set()
+
+        for subject_node, predicate, object_node in triples:
+            if isinstance(object_node, Literal):
+                continue
+            if predicate == RDFS.subClassOf:
+                new_triples |= self.add_subclass(subject_node, object_node)
+            elif predicate == RDF.type:
+                new_triples |= self.add_type(subject_node, object_node)
+
+        return new_triples
+
+
+def expand_taxonomy_closure(ontology_graph: Graph) -> TaxonomyClosure:
+    """ Adds to the graph all rdfs:subClassOf and rdf:type triples entailed by its taxonomy.
+    The returned closure can be used for incrementally expanding the graph when new triples are added to it.
+
+    :param ontology_graph: Graph to be expanded.
+    :type ontology_graph: Graph
+    :return: Taxonomy closure of the expanded graph.
+    :rtype: TaxonomyClosure
+    """
+
+    taxonomy_closure = TaxonomyClosure(ontology_graph)
+
+    initial_length = len(ontology_graph)
+    ontology_graph.addN((*triple, ontology_graph) for triple in taxonomy_closure.get_inferred_triples())
+    LOGGER.debug(f"Taxonomy closure added {len(ontology_graph) - initial_length} triples to the graph.")
+
+    return taxonomy_closure
@@ -1,17 +1,128 @@
 """ Functions related to the catalog used in multiple features. """
-import pathlib
+import json
+import os
+from typing import Iterator
 
+from modules.logger_config import initialize_logger
+from modules.utils.error_treatment import report_error_io_write
 
-def list_all_files_with_filetype(catalog_path: str, filetype: str) -> list:
+LOGGER = initialize_logger()
+
+FILE_INDEX_DIRECTORY = ".cache/file_index/"
+
+
+def scan_files_with_filetype(directory_path: str, filetype: str,
+                             excluded_directories: list[str] = None) -> Iterator[os.DirEntry]:
+    """ Receives a directory path and an intended filetype.
+        Yields the entries of all files inside the directory and its subdirectories that have the informed filetype.
+        Hidden files and directories (starting with '.') and directories whose names are in excluded_directories are
+        skipped without being walked into. Each directory's files are yielded in name order, before the content of
+        its subdirectories, which are also visited in name order.
+    """
+
+    excluded_directories = set(excluded_directories or [])
+    extension = f".{filetype}"
+
+    try:
+        with os.scandir(directory_path) as directory_entries:
+            entries = sorted(directory_entries, key=lambda entry: entry.name)
+    except OSError as error:
+        LOGGER.warning(f"Could not list directory {directory_path}. System error reported: {error}")
+        return
+
+    subdirectories = []
+
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        if entry.is_dir():
+            if entry.name not in excluded_directories:
+                subdirectories.append(entry.path)
+        elif entry.name.endswith(extension):
+            yield entry
+
+    for subdirectory in subdirectories:
+        yield from scan_files_with_filetype(subdirectory, filetype, excluded_directories)
+
+
+def list_all_files_with_filetype(catalog_path: str, filetype: str, excluded_directories: list[str] = None) -> list:
     """ Receives as argument the catalog path and an intended filetype.
         Return a list of all files (complete path) inside the catalog folder that have the informed filetype.
+        Files inside hidden directories or inside directories in excluded_directories are not included.
     """
 
-    list_files = []
+    catalog_path = os.path.normpath(catalog_path)
+
+    return [entry.path for entry in scan_files_with_filetype(catalog_path, filetype, excluded_directories)]
+
+
+def get_file_index_path(index_name: str) -> str:
+    """ Returns the path of the persisted file index with the received name. """
+
+    return os.path.join(FILE_INDEX_DIRECTORY, f"{index_name}.json")
+
+
+def list_changed_files_with_filetype(catalog_path: str, filetype: str, index_name: str,
+                                     excluded_directories: list[str] = None) -> tuple[list[str], list[str], dict]:
+    """ Lists the files with the informed filetype that were added or changed, and the ones that were removed, since
+        the file index with the received name was saved. Files are compared by their size and modification time.
+        The updated index is returned and must be saved with save_file_index only after the changed files are treated,
+        so that an interrupted execution does not mark them as unchanged.
+
+    :param catalog_path: Path of the directory to be walked.
+    :type catalog_path: str
+    :param filetype: Extension of the files to be listed, without the dot.
+    :type filetype: str
+    :param index_name: Name of the persisted index, distinguishing the indexes of different features.
+    :type index_name: str
+    :param excluded_directories: Names of directories that are not walked into.
+    :type excluded_directories: list[str]
+    :return: List of added or changed files, list of removed files, and updated index.
+    :rtype: tuple[list[str], list[str], dict]
+    """
+
+    previous_index = load_file_index(index_name)
+
+    current_index = {}
+    for entry in scan_files_with_filetype(os.path.normpath(catalog_path), filetype, excluded_directories):
+        entry_stat = entry.stat()
+        current_index[entry.path] = [entry_stat.st_size, entry_stat.st_mtime_ns]
+
+    changed_files = [file_path for file_path, file_state in current_index.items()
+                     if previous_index.get(file_path) != file_state]
+    removed_files = [file_path for file_path in previous_index if file_path not in current_index]
+
+    return changed_files, removed_files, current_index
+
+
+def load_file_index(index_name: str) -> dict:
+    """ Loads the persisted file index with the received name, mapping each file path to its size and modification
+        time. An empty index is returned if it does not exist or cannot be read.
+    """
+
+    index_path = get_file_index_path(index_name)
+
+    if not os.path.exists(index_path):
+        return {}
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as error:
+        LOGGER.warning(f"Could not read the file index {index_path}. All files are considered changed. "
+                       f"System error reported: {error}")
+        return {}
+
+
+def save_file_index(index_name: str, file_index: dict) -> None:
+    """ Saves the file index returned by list_changed_files_with_filetype. """
 
-    catalog_pathlib = pathlib.Path(catalog_path)
-    for filetype_item in list(catalog_pathlib.rglob(f'*.{filetype}')):
-        if "\\." not in str(filetype_item):
-            list_files.append(str(filetype_item))
+    index_path = get_file_index_path(index_name)
 
-    return list_files
+    try:
+        os.makedirs(FILE_INDEX_DIRECTORY, exist_ok=True)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(file_index, f)
+        LOGGER.debug(f"File index {index_path} successfully saved.")
+    except OSError as error:
+        report_error_io_write(index_path, "file index", error)
@@ -1,5 +1,6 @@
 """ General auxiliary functions. """
 
+import hashlib
 import os
 import platform
 from datetime import datetime
@@ -77,10 +78,12 @@ def get_list_unhidden_directories(directory_path):
               f"Program aborted.")
         exit(1)
     else:
-        for path in os.listdir(directory_path):
-            # check if current path is a non-hidden directory
-            if os.path.isdir(os.path.join(directory_path, path)) and path[0] != ".":
-                list_directories.append(path)
+        # scandir entries already know their types in most platforms, so no additional stat call is needed
+        with os.scandir(directory_path) as directory_entries:
+            for entry in directory_entries:
+                # check if current entry is a non-hidden directory
+                if entry.is_dir() and entry.name[0] != ".":
+                    list_directories.append(entry.name)
 
     return list_directories
 
@@ -88,3 +91,15 @@ def get_list_unhidden_directories(directory_path):
 def contains_number(string):
     """ Returns True if the received string contains a number, returns Else otherwise. """
     return any(char.isdigit() for char in string)
+
+
+def get_file_hash(file_path):
+    """ Returns the SHA-256 hexadecimal digest of the content of the file in the received path. """
+
+    file_hash = hashlib.sha256()
+
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
@@ -1,12 +1,43 @@
 """ Auxiliary functions for extending and complementing RDFLib's RDF treatment functions """
-import copy
+import inspect
 import os
+import pathlib
 import time
+import weakref
+from bisect import bisect_right
 
 from owlrl import DeductiveClosure, RDFS_Semantics
-from rdflib import RDF, OWL, Graph
+from rdflib import RDF, OWL, Graph, BNode, Literal
+from rdflib.plugins.stores.memory import Memory
+from rdflib.store import TripleAddedEvent, TripleRemovedEvent
+from rdflib.util import guess_format
 
 from modules.logger_config import initialize_logger
+from modules.utils.error_treatment import report_error_end_of_switch
+from modules.utils.graph_cache import is_graph_cache_enabled, get_graph_cache_key, load_cached_graph, \
+    store_cached_graph, create_parse_order_graph
+from modules.utils.taxonomy_closure import expand_taxonomy_closure
+
+LOGGER = initialize_logger()
+
+# Classes of each graph, keyed by the graph's id, used by get_list_of_all_classes when use_cache is True.
+# Each value is a tuple with the graph's length when the classes were obtained and the list of classes.
+classes_cache = {}
+
+
+class PredicateFilterMemory(Memory):
+    """ Memory store that only keeps triples whose predicates are in the allowed predicates.
+    Disallowed triples are dropped as the parser emits them, before being indexed, so the memory used by a restricted
+    graph is proportional to the kept triples and not to the whole parsed file.
+    """
+
+    def __init__(self, allowed_predicates, configuration=None, identifier=None):
+        super().__init__(configuration, identifier)
+        self.allowed_predicates = frozenset(allowed_predicates)
+
+    def add(self, triple, context, quoted=False):
+        if triple[1] in self.allowed_predicates:
+            super().add(triple, context, quoted)
 
 
 def load_graph_safely_considering_restrictions(ontology_file, graph_restriction=None):
@@ -22,46 +53,84 @@ def load_graph_safely_considering_restrictions(ontology_file, graph_restriction=
     return ontology_graph
 
 
-def load_all_graph_safely(ontology_location):
-    """ Safely load graph from file to working memory. """
-
-    logger = initialize_logger()
+def load_all_graph_safely(ontology_location, keep_parse_order=False, ontology_content=None):
+    """ Safely load graph from file to working memory.
+        When the graph cache is enabled, unchanged files are loaded from the cache instead of being parsed.
+        When keep_parse_order is True, the parse order of the triples is kept (see get_triples_in_parse_order).
+        When ontology_content is provided, it is parsed instead of reading the file again. It must be the file's
+        content, as relative IRIs are still resolved against the file's location.
+    """
 
-    ontology_graph = Graph()
+    cache_key = None
 
     try:
-        ontology_graph.parse(ontology_location, encoding='utf-8')
+        if is_graph_cache_enabled():
+            cache_key = get_graph_cache_key(ontology_location)
+            ontology_graph = load_cached_graph(cache_key, keep_parse_order)
+            if ontology_graph is not None:
+                LOGGER.debug(f"Ontology {ontology_location} successfully loaded from the graph cache.")
+                return ontology_graph
+
+        if cache_key is not None or keep_parse_order:
+            ontology_graph = create_parse_order_graph()
+        else:
+            ontology_graph = Graph()
+
+        if ontology_content is None:
+            ontology_graph.parse(ontology_location, encoding='utf-8')
+        else:
+            ontology_graph.parse(data=ontology_content, format=guess_format(ontology_location) or "turtle",
+                                 publicID=pathlib.Path(ontology_location).absolute().as_uri())
     except OSError as error:
-        logger.error(f"Could not load {ontology_location}. Exiting program.\n"
+        LOGGER.error(f"Could not load {ontology_location}. Exiting program.\n"
                      f"System error reported: {error}")
         exit(1)
 
-    logger.debug(f"Ontology {ontology_location} successfully loaded to working memory.")
+    if cache_key is not None:
+        store_cached_graph(cache_key, ontology_graph)
+        # Recorded parse order is no longer needed after being cached
+        if not keep_parse_order:
+            ontology_graph.store.added_triples = []
+
+    LOGGER.debug(f"Ontology {ontology_location} successfully loaded to working memory.")
 
     return ontology_graph
 
 
 def reduce_graph_considering_restrictions(original_graph, restrictions_list):
-    """ Reduce the already loaded ontology model to only allowed statements (contained in the restrictions_list). """
+    """ Reduce the already loaded ontology model to only allowed statements (contained in the restrictions_list).
+        The original graph is not modified and only the allowed statements are copied to the returned graph.
+    """
 
-    # Copying original graph to a new graph
-    working_graph = copy.deepcopy(original_graph)
+    working_graph = Graph()
 
-    for subj, pred, obj in working_graph:
-        if pred not in restrictions_list:
-            working_graph.remove((subj, pred, obj))
+    for prefix, namespace in original_graph.namespaces():
+        working_graph.bind(prefix, namespace, override=True, replace=True)
+
+    for predicate in dict.fromkeys(restrictions_list):
+        working_graph.addN((subj, pred, obj, working_graph) for subj, pred, obj in
+                           original_graph.triples((None, predicate, None)))
 
     return working_graph
 
 
 def load_restrictions_only_graph_safely(owl_file_path, restrictions_list):
-    """ Extract the dataset model's taxonomy into a new graph. """
+    """ Extract the dataset model's taxonomy into a new graph.
+        Triples with predicates not contained in the restrictions_list are discarded while parsing. The graph cache is
+        not used, as cached graphs would have to be fully loaded before being reduced.
+    """
 
-    working_graph = load_all_graph_safely(owl_file_path)
+    working_graph = Graph(store=PredicateFilterMemory(restrictions_list))
+
+    try:
+        working_graph.parse(owl_file_path, encoding='utf-8')
+    except OSError as error:
+        LOGGER.error(f"Could not load {owl_file_path}. Exiting program.\n"
+                     f"System error reported: {error}")
+        exit(1)
 
-    for subj, pred, obj in working_graph:
-        if pred not in restrictions_list:
-            working_graph.remove((subj, pred, obj))
+    LOGGER.debug(f"Restricted ontology {owl_file_path} successfully loaded to working memory "
+                 f"({len(working_graph)} triples kept).")
 
     return working_graph
 
@@ -118,67 +187,155 @@ def get_ontology_uri(ontology_graph):
     return ontology_uri
 
 
-def get_list_of_all_classes(ontology_graph, exceptions_list=None):
-    """ Returns a list of all classes as URI strings without repetitions available in a Graph.
-    Classes that have namespaces included in the exception_list parameter are not included in the returned list. """
+def get_sorted_minimal_prefixes(prefixes_list):
+    """ Returns the sorted list of prefixes without the ones that are extensions of another prefix in the list.
+        In this list, the only candidate prefix of any string is the greatest prefix that is not greater than it.
+    """
 
-    if exceptions_list == None:
-        exceptions_list = []
+    minimal_prefixes = []
 
-    classes_list = []
+    for prefix in sorted(set(prefixes_list)):
+        if not minimal_prefixes or not prefix.startswith(minimal_prefixes[-1]):
+            minimal_prefixes.append(prefix)
 
-    for sub, pred, obj in ontology_graph:
-        if (sub, RDF.type, OWL.Class) in ontology_graph:
-            # Eliminating BNodes
-            if type(sub).__name__ != "BNode":
-                # N3 necessary for returning string and [1:-1] necessary for removing <>
-                classes_list.append(sub.n3()[1:-1])
-        if (obj, RDF.type, OWL.Class) in ontology_graph:
-            # Eliminating BNodes
-            if type(obj).__name__ != "BNode":
-                # N3 necessary for returning string and [1:-1] necessary for removing <>
-                classes_list.append(obj.n3()[1:-1])
+    return minimal_prefixes
 
-    # Removing repetitions
-    no_rep_classes_list = [*set(classes_list)]
 
-    # Removing classes that have namespace in the exceptions_list
-    classes_list = no_rep_classes_list.copy()
-    for class_uri in no_rep_classes_list:
-        for exception_item in exceptions_list:
-            if class_uri.startswith(exception_item):
-                classes_list.remove(class_uri)
-                break
+def has_any_prefix(string, sorted_minimal_prefixes):
+    """ Return boolean indicating if the string starts with any prefix in the list returned by
+        get_sorted_minimal_prefixes. Uses binary search, so its cost is logarithmic in the number of prefixes.
+    """
+
+    position = bisect_right(sorted_minimal_prefixes, string)
+
+    return position > 0 and string.startswith(sorted_minimal_prefixes[position - 1])
+
+
+def get_classes_from_graph(ontology_graph):
+    """ Returns a list of all classes as URI strings without repetitions available in a Graph, in the order they are
+        found in the graph's (RDF.type, OWL.Class) index. BNodes are not included.
+    """
+
+    return [str(class_node) for class_node in dict.fromkeys(ontology_graph.subjects(RDF.type, OWL.Class))
+            if not isinstance(class_node, BNode)]
+
+
+def invalidate_cached_classes(graph_key):
+    """ Marks the cached classes of the graph as outdated. Called by the store's dispatcher when triples change. """
+
+    if graph_key in classes_cache:
+        classes_cache[graph_key] = (None, None)
+
+
+def get_cached_classes(ontology_graph):
+    """ Returns the classes of the graph from the classes cache, which is keyed by graph identity.
+        Additions (and removals, for stores that dispatch them) are reported by the store's dispatcher. As the Memory
+        store does not dispatch removals, the graph's length is also checked, as removing triples always changes it.
+    """
+
+    graph_key = id(ontology_graph)
+    graph_length = len(ontology_graph)
+
+    if graph_key not in classes_cache:
+        dispatcher = ontology_graph.store.dispatcher
+        dispatcher.subscribe(TripleAddedEvent, lambda event: invalidate_cached_classes(graph_key))
+        dispatcher.subscribe(TripleRemovedEvent, lambda event: invalidate_cached_classes(graph_key))
+        # Discarding the entry when the graph is garbage collected, as its id may be reused by another graph
+        weakref.finalize(ontology_graph, classes_cache.pop, graph_key, None)
+    else:
+        cached_length, cached_classes = classes_cache[graph_key]
+        if cached_length == graph_length:
+            return cached_classes
+
+    classes_list = get_classes_from_graph(ontology_graph)
+    classes_cache[graph_key] = (graph_length, classes_list)
 
     return classes_list
 
 
-def perform_reasoning(ontology_graph):
-    """Perform reasoner and consequently expands the ontology graph. """
+def get_list_of_all_classes(ontology_graph, exceptions_list=None, use_cache=False):
+    """ Returns a list of all classes as URI strings without repetitions available in a Graph.
+    Classes that have namespaces included in the exception_list parameter are not included in the returned list.
+    If use_cache is True, the classes found are cached and reused while the graph is not changed. """
+
+    if exceptions_list == None:
+        exceptions_list = []
+
+    if use_cache:
+        classes_list = get_cached_classes(ontology_graph)
+    else:
+        classes_list = get_classes_from_graph(ontology_graph)
+
+    # Removing classes that have namespace in the exceptions_list
+    exception_prefixes = get_sorted_minimal_prefixes(exceptions_list)
+    classes_list = [class_uri for class_uri in classes_list if not has_any_prefix(class_uri, exception_prefixes)]
+
+    return classes_list
 
-    logger = initialize_logger()
 
-    logger.info("Initializing RDFS reasoning. This may take a while...")
+def perform_reasoning(ontology_graph, semantics="rdfs"):
+    """Perform reasoner and consequently expands the ontology graph.
+        semantics "rdfs" applies the full RDFS semantics using owlrl, while "taxonomy" only adds the transitive
+        rdfs:subClassOf hierarchy and the inherited rdf:type assertions, which is considerably faster.
+        Returns the TaxonomyClosure of the "taxonomy" semantics, which can incrementally expand the graph when new
+        triples are added to it, or None for the "rdfs" semantics.
+    """
 
     st = time.perf_counter()
-    DeductiveClosure(RDFS_Semantics).expand(ontology_graph)
+    taxonomy_closure = None
+
+    if semantics == "rdfs":
+        LOGGER.info("Initializing RDFS reasoning. This may take a while...")
+        DeductiveClosure(RDFS_Semantics).expand(ontology_graph)
+    elif semantics == "taxonomy":
+        LOGGER.info("Initializing taxonomy closure reasoning.")
+        taxonomy_closure = expand_taxonomy_closure(ontology_graph)
+    else:
+        current_function = inspect.stack()[0][3]
+        report_error_end_of_switch("semantics", current_function)
+
     et = time.perf_counter()
     elapsed_time = round((et - st), 4)
 
-    logger.info(f"Reasoning process completed in {elapsed_time} seconds.")
+    LOGGER.info(f"Reasoning process completed in {elapsed_time} seconds.")
+
+    return taxonomy_closure
 
 
 def save_ontology_file_safely(ontology_graph, output_file_path):
     """  Saves the ontology graph into a TTL file. """
 
-    logger = initialize_logger()
-
-    logger.debug("Saving the output ontology file...")
+    LOGGER.debug("Saving the output ontology file...")
 
     try:
         ontology_graph.serialize(destination=output_file_path)
-        logger.info(f"Output ontology file saved. Access it in {os.path.abspath(output_file_path)}.")
+        LOGGER.info(f"Output ontology file saved. Access it in {os.path.abspath(output_file_path)}.")
     except OSError as error:
-        logger.error(f"Could not save the output ontology file ({output_file_path}). Exiting program."
+        LOGGER.error(f"Could not save the output ontology file ({output_file_path}). Exiting program."
                      f"System error reported: {error}")
         exit(1)
+
+
+def get_nt_row(triple) -> str:
+    """ Returns the N-Triples line of a triple, ended by a line break.
+    Literals are not written with Literal.n3(), as it produces Turtle (e.g., multi-line literals in triple quotes).
+
+    :param triple: Triple whose terms are URIRef, BNode, or Literal objects.
+    :type triple: tuple
+    :return: N-Triples line of the triple.
+    :rtype: str
+    """
+
+    subject, predicate, triple_object = triple
+
+    if isinstance(triple_object, Literal):
+        object_n3 = '"' + str(triple_object).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') \
+            .replace("\r", "\\r") + '"'
+        if triple_object.language:
+            object_n3 += "@" + triple_object.language
+        elif triple_object.datatype:
+            object_n3 += f"^^<{triple_object.datatype}>"
+    else:
+        object_n3 = triple_object.n3()
+
+    return f"{subject.n3()} {predicate.n3()} {object_n3} .\n"
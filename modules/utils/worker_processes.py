@@ -0,0 +1,72 @@
+""" Initialization of the worker processes used by the tools, which receive the logging and graph cache settings of the
+main process. """
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Iterable, Iterator
+
+from modules.logger_config import configure_worker_logging, get_workers_logging_queue
+from modules.utils.graph_cache import configure_graph_cache, get_graph_cache_settings
+
+# Maximum number of tasks submitted and not yet consumed per worker process in map_with_bounded_window
+TASKS_PER_WORKER = 2
+
+
+def get_worker_settings() -> tuple:
+    """ Returns the current settings in the format expected by initialize_worker_process, to be used as the initargs
+    of process pools. """
+
+    return get_workers_logging_queue(), *get_graph_cache_settings()
+
+
+def initialize_worker_process(logging_queue: multiprocessing.Queue, cache_directory: str | None,
+                              cache_max_size_mb: int) -> None:
+    """ Initializer of worker processes, which makes their records be written by the main process's log handlers and
+    applies the main process's graph cache settings, as settings are not inherited on every platform.
+
+    :param logging_queue: Queue obtained in the main process with get_workers_logging_queue.
+    :type logging_queue: multiprocessing.Queue
+    :param cache_directory: Directory of the graph cache, or None if it is disabled.
+    :type cache_directory: str | None
+    :param cache_max_size_mb: Maximum size in megabytes of the graph cache.
+    :type cache_max_size_mb: int
+    """
+
+    configure_worker_logging(logging_queue)
+    configure_graph_cache(cache_directory, cache_max_size_mb)
+
+
+def map_with_bounded_window(executor: Executor, function: Callable, *iterables: Iterable,
+                            window_size: int) -> Iterator:
+    """ Yields the results of the function applied to the items of the iterables, in order, as executor.map does.
+    Differently from executor.map, which submits all tasks at once, a task is only submitted when fewer than
+    window_size tasks are submitted and not yet consumed, so results of later tasks do not pile up in memory while
+    the consumer waits for a slow earlier task.
+
+    :param executor: Executor (e.g., a process pool) in which the tasks are executed.
+    :type executor: Executor
+    :param function: Function applied to the items. Must be defined at module level to be dispatched to processes.
+    :type function: Callable
+    :param iterables: Iterables whose items are the function's arguments.
+    :type iterables: Iterable
+    :param window_size: Maximum number of submitted tasks whose results were not yet consumed, usually
+                        TASKS_PER_WORKER times the number of workers.
+    :type window_size: int
+    :return: Iterator of the function's results, in the order of the items.
+    :rtype: Iterator
+    """
+
+    pending_futures = deque()
+
+    try:
+        for arguments in zip(*iterables):
+            if len(pending_futures) >= window_size:
+                yield pending_futures.popleft().result()
+            pending_futures.append(executor.submit(function, *arguments))
+
+        while pending_futures:
+            yield pending_futures.popleft().result()
+    finally:
+        # Tasks not yet started are cancelled if the consumer stops early
+        for future in pending_futures:
+            future.cancel()
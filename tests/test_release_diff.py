@@ -0,0 +1,56 @@
+""" Tests of the comparison of release files. """
+import os
+import tempfile
+import unittest
+
+from modules.tools.release_diff import diff_release_files
+
+RELEASE_PREFIX = "@prefix ontouml: <https://w3id.org/ontouml#> .\n"
+
+DATASET_A = "<https://w3id.org/ontouml-models/model/a/m> ontouml:shape [ ontouml:x 1 ; ontouml:y 2 ] .\n"
+
+DATASET_B = "<https://w3id.org/ontouml-models/model/b/m> ontouml:name \"b\" .\n"
+
+DATASET_B_CHAIN = "<https://w3id.org/ontouml-models/model/b/m> ontouml:part [ ontouml:part [ ontouml:part " \
+                  "[ ontouml:part [ ontouml:x 3 ] ] ] ] .\n"
+
+
+class ReleaseDiffTest(unittest.TestCase):
+    """ Compares release files written to a temporary directory. """
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temporary_directory.cleanup)
+
+    def diff_contents(self, old_content: str, new_content: str) -> dict:
+        """ Writes both release contents to files and returns the differences reported for each dataset. """
+
+        release_paths = []
+        for file_name, content in (("old.ttl", old_content), ("new.ttl", new_content)):
+            release_paths.append(os.path.join(self.temporary_directory.name, file_name))
+            with open(release_paths[-1], "w", encoding="utf-8") as release_file:
+                release_file.write(content)
+
+        return diff_release_files(*release_paths, os.path.join(self.temporary_directory.name, "diff.csv"))
+
+    def test_bnode_chain_in_other_dataset(self):
+        """ A deeper blank node chain added to a dataset does not change the labels of other datasets. """
+
+        datasets_changes = self.diff_contents(RELEASE_PREFIX + DATASET_A + DATASET_B,
+                                              RELEASE_PREFIX + DATASET_A + DATASET_B + DATASET_B_CHAIN)
+
+        self.assertEqual(datasets_changes, {"b": {"added": 5, "removed": 0}})
+
+    def test_triples_order(self):
+        """ Identical blank node structures written in another order and with other labels have no differences. """
+
+        old_content = RELEASE_PREFIX + "<https://w3id.org/ontouml-models/model/a/m> ontouml:shape _:s1, _:s2 .\n" \
+                                       "_:s1 ontouml:x 1 .\n_:s2 ontouml:x 1 .\n_:s1 ontouml:next _:s2 .\n"
+        new_content = RELEASE_PREFIX + "_:q ontouml:x 1 .\n_:q ontouml:next _:p .\n_:p ontouml:x 1 .\n" \
+                                       "<https://w3id.org/ontouml-models/model/a/m> ontouml:shape _:p, _:q .\n"
+
+        self.assertEqual(self.diff_contents(old_content, new_content), {})
+
+
+if __name__ == "__main__":
+    unittest.main()